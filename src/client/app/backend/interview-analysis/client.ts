@@ -30,6 +30,20 @@ export async function getTaskStatus(taskId: string) {
   return await api.get<TaskStatusResponse>(`/api/v1/interview/task/${taskId}`);
 }
 
+/**
+ * Long-poll the status of a task: resolves once it differs from `revision`,
+ * the last one seen, or after at most 25 seconds with the current status.
+ */
+export async function waitForTaskStatus(taskId: string, revision?: string) {
+  return await api.get<TaskStatusResponse>(
+    `/api/v1/interview/task/${taskId}/events`,
+    {
+      params: { revision, timeout: 25 },
+      headers: { Accept: "application/json" },
+    }
+  );
+}
+
 export async function getLabelTips(label: string) {
   return await api.get<LabelTipsResponse>(`/api/v1/interview/tips/${label}`);
 }
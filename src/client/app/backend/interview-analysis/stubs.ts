@@ -8,6 +8,7 @@ export enum TaskStatus {
   PROCESSING = "processing",
   COMPLETED = "completed",
   FAILED = "failed",
+  CANCELLED = "cancelled",
 }
 
 export type AnalyzeInterviewResponse =
@@ -43,6 +44,7 @@ export type TaskStatusResponse =
       status: TaskStatus;
       results: InterviewAnalysisResult;
       processing_time: number;
+      revision: string;
     }
   | {
       success: false;
@@ -50,6 +52,7 @@ export type TaskStatusResponse =
       status: TaskStatus;
       error: string;
       processing_time: number;
+      revision: string;
     };
 
 // Label Tips Endpoint
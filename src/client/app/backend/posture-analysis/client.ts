@@ -31,6 +31,20 @@ export async function getTaskStatus(taskId: string) {
   );
 }
 
+/**
+ * Long-poll the status of a task: resolves once it differs from `revision`,
+ * the last one seen, or after at most 25 seconds with the current status.
+ */
+export async function waitForTaskStatus(taskId: string, revision?: string) {
+  return await api.get<PostureTaskStatusResponse>(
+    `/api/posture/task/${taskId}/events`,
+    {
+      params: { revision, timeout: 25 },
+      headers: { Accept: "application/json" },
+    }
+  );
+}
+
 export async function healthCheck() {
   return await api.get<PostureHealthCheckResponse>(`/api/posture/health`);
 }
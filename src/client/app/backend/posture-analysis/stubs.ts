@@ -8,6 +8,7 @@ export enum TaskStatus {
   PROCESSING = "processing",
   COMPLETED = "completed",
   FAILED = "failed",
+  CANCELLED = "cancelled",
 }
 
 export type AnalyzePostureResponse =
@@ -59,6 +60,7 @@ export type PostureTaskStatusResponse =
       message?: string;
       result: PostureAnalysisResult;
       processing_time?: number;
+      revision: string;
     }
   | {
       status: "error";
@@ -67,6 +69,7 @@ export type PostureTaskStatusResponse =
       message?: string;
       error: string;
       processing_time: number;
+      revision: string;
     };
 
 // Health Check Endpoint
@@ -1,7 +1,8 @@
 import { useState } from "react";
+import { retryAfterDelay, sleep } from "~/utils";
 import {
   analyzeInterview,
-  getTaskStatus as getInterviewAnalysisTaskStatus,
+  waitForTaskStatus as waitForInterviewAnalysisTaskStatus,
 } from "~/backend/interview-analysis/client";
 import {
   TaskStatus,
@@ -37,34 +38,49 @@ export default function useInterviewAnalysisTask() {
         return;
       }
 
-      // poll for analysis results
-      const pollInterval = setInterval(async () => {
+      // wait for analysis results, each request returning on a status change
+      let revision: string | undefined;
+      while (true) {
+        let taskDetails;
+        let retryAfter: string | undefined;
         try {
-          const { data: taskDetails } = await getInterviewAnalysisTaskStatus(
-            taskCreationRes.task_id
+          const response = await waitForInterviewAnalysisTaskStatus(
+            taskCreationRes.task_id,
+            revision
           );
-
-          if (
-            taskDetails.success &&
-            taskDetails.status === TaskStatus.COMPLETED
-          ) {
-            setResult(taskDetails.results);
-            setState("complete");
-            clearInterval(pollInterval);
-          } else if (
-            !taskDetails.success ||
-            taskDetails.status === TaskStatus.FAILED
-          ) {
-            setError("Analysis failed");
-            setState("error");
-            clearInterval(pollInterval);
-          }
+          taskDetails = response.data;
+          retryAfter = response.headers["retry-after"];
         } catch (err) {
           setError("Failed to fetch analysis status");
           setState("error");
-          clearInterval(pollInterval);
+          return;
+        }
+
+        if (
+          taskDetails.success &&
+          taskDetails.status === TaskStatus.COMPLETED
+        ) {
+          setResult(taskDetails.results);
+          setState("complete");
+          return;
+        } else if (
+          !taskDetails.success ||
+          taskDetails.status === TaskStatus.FAILED ||
+          taskDetails.status === TaskStatus.CANCELLED
+        ) {
+          setError("Analysis failed");
+          setState("error");
+          return;
         }
-      }, 2000);
+
+        // Wait only if the server answered without waiting and asked us
+        // to; after a long poll timed out, ask again at once
+        const delay = retryAfterDelay(retryAfter);
+        if (delay > 0) {
+          await sleep(delay);
+        }
+        revision = taskDetails.revision;
+      }
     } catch (err) {
       setError("Failed to upload video");
       setState("error");
@@ -1,8 +1,9 @@
 import { useState } from "react";
+import { retryAfterDelay, sleep } from "~/utils";
 import { TaskStatus } from "~/backend/interview-analysis/stubs";
 import {
   analyzePosture,
-  getTaskStatus as getPostureAnalysisTaskStatus,
+  waitForTaskStatus as waitForPostureAnalysisTaskStatus,
 } from "~/backend/posture-analysis/client";
 import type { PostureAnalysisResult } from "~/backend/posture-analysis/stubs";
 
@@ -35,34 +36,49 @@ export default function usePostureAnalysisTask() {
         return;
       }
 
-      // poll for analysis results
-      const pollInterval = setInterval(async () => {
+      // wait for analysis results, each request returning on a status change
+      let revision: string | undefined;
+      while (true) {
+        let taskDetails;
+        let retryAfter: string | undefined;
         try {
-          const { data: taskDetails } = await getPostureAnalysisTaskStatus(
-            taskCreationRes.task_id
+          const response = await waitForPostureAnalysisTaskStatus(
+            taskCreationRes.task_id,
+            revision
           );
-
-          if (
-            taskDetails.status === "success" &&
-            taskDetails.task_status === TaskStatus.COMPLETED
-          ) {
-            setResult(taskDetails.result);
-            setState("complete");
-            clearInterval(pollInterval);
-          } else if (
-            taskDetails.status === "error" ||
-            taskDetails.task_status === TaskStatus.FAILED
-          ) {
-            setError("Analysis failed");
-            setState("error");
-            clearInterval(pollInterval);
-          }
+          taskDetails = response.data;
+          retryAfter = response.headers["retry-after"];
         } catch (err) {
           setError("Failed to fetch analysis status");
           setState("error");
-          clearInterval(pollInterval);
+          return;
+        }
+
+        if (
+          taskDetails.status === "success" &&
+          taskDetails.task_status === TaskStatus.COMPLETED
+        ) {
+          setResult(taskDetails.result);
+          setState("complete");
+          return;
+        } else if (
+          taskDetails.status === "error" ||
+          taskDetails.task_status === TaskStatus.FAILED ||
+          taskDetails.task_status === TaskStatus.CANCELLED
+        ) {
+          setError("Analysis failed");
+          setState("error");
+          return;
         }
-      }, 2000);
+
+        // Wait only if the server answered without waiting and asked us
+        // to; after a long poll timed out, ask again at once
+        const delay = retryAfterDelay(retryAfter);
+        if (delay > 0) {
+          await sleep(delay);
+        }
+        revision = taskDetails.revision;
+      }
     } catch (err) {
       setError("Failed to upload video");
       setState("error");
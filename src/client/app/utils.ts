@@ -17,3 +17,24 @@ export function generateRandomId(length: number = 16): string {
 
   return result;
 }
+
+/**
+ * Milliseconds to wait before asking again for a task status, as the
+ * server asked with `Retry-After` when it answered without waiting (e.g.
+ * while too many clients are watching). Without the header the server
+ * did wait, so the next request can go out at once.
+ * @param retryAfter The `Retry-After` response header, if any
+ * @returns The delay in milliseconds, 0 if none was asked for
+ */
+export function retryAfterDelay(retryAfter: string | undefined): number {
+  const seconds = Number(retryAfter);
+  return seconds > 0 ? seconds * 1000 : 0;
+}
+
+/**
+ * Resolves after the given number of milliseconds
+ * @param ms Milliseconds to wait
+ */
+export function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
@@ -1,11 +1,24 @@
 import logging
 import os
+import threading
 
 from config import Config
-from flask import Blueprint, jsonify, request, url_for
+from flask import Blueprint, Response, jsonify, request, url_for
+from services.model_scorer import ModelScorer
 from services.prediction_service import PredictionService
 from task_queue import TaskQueue
-from werkzeug.utils import secure_filename
+from task_store import FINISHED_STATUSES, create_task_store
+from utils.admission import AdmissionRejected, check_admission
+from utils.demux import probe_media
+from utils.metrics import metrics
+from utils.status_cache import GZIP_MIN_BYTES, StatusBody, StatusBodyCache
+from utils.status_stream import BUSY_RECONNECT_MILLISECONDS, stream_task_status
+from utils.uploads import (
+    client_id,
+    create_workspace,
+    remove_workspace,
+    spool_upload,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,13 +26,45 @@ logger = logging.getLogger(__name__)
 # Create Blueprint for interview analysis API
 interview_api = Blueprint("interview_api", __name__)
 
+# Load the model once; it is shared by the API and all task queue workers
+model_scorer = ModelScorer()
+
 # Initialize prediction service
-prediction_service = PredictionService()
+prediction_service = PredictionService(model_scorer)
 
 # Initialize task queue
+task_results_dir = os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, "task_results")
 task_queue = TaskQueue(
-    results_dir=os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, "task_results"),
+    results_dir=task_results_dir,
     num_workers=Config.TASK_QUEUE_WORKERS,
+    scorer=model_scorer,
+    results_ttl=Config.TASK_QUEUE_RESULTS_TTL,
+    hot_seconds=Config.TASK_QUEUE_HOT_SECONDS,
+    max_hot_tasks=Config.TASK_QUEUE_MAX_HOT_TASKS,
+    max_results=Config.TASK_QUEUE_MAX_RESULTS,
+    max_result_bytes=Config.TASK_QUEUE_MAX_RESULT_BYTES,
+    janitor_interval=Config.TASK_QUEUE_JANITOR_INTERVAL,
+    max_attempts=Config.TASK_QUEUE_MAX_ATTEMPTS,
+    aging=Config.TASK_QUEUE_AGING,
+    fair_share=Config.TASK_QUEUE_FAIR_SHARE,
+    probe=probe_media,
+    backend=Config.TASK_QUEUE_BACKEND,
+    store=create_task_store(
+        Config.TASK_STORE,
+        task_results_dir,
+        db_path=Config.TASK_STORE_PATH,
+        commit_delay=Config.TASK_STORE_COMMIT_DELAY,
+        fsync=Config.TASK_STORE_FSYNC,
+    ),
+    autostart=not Config.PRELOAD_APP,
+)
+
+# Status requests waiting for a change each hold a server thread
+status_watchers = threading.BoundedSemaphore(Config.STATUS_MAX_WATCHERS)
+
+# Serialized status bodies of finished tasks
+status_bodies = StatusBodyCache(
+    Config.STATUS_CACHE_MAX_BYTES, Config.STATUS_CACHE_SECONDS
 )
 
 
@@ -29,23 +74,45 @@ def analyze_interview():
     Endpoint to analyze an interview video.
     Accepts a video file and returns a task ID for status tracking.
     """
-    if "video" not in request.files:
-        logger.error("No video file in request")
-        return jsonify({"success": False, "error": "No video file provided"}), 400
+    # Turn the upload away before its body is read if the queue is too
+    # far behind or the spool disk too full to take it
+    try:
+        check_admission(
+            task_queue,
+            request.content_length or Config.MAX_CONTENT_LENGTH,
+            Config.UPLOAD_FOLDER,
+            Config.ADMISSION_MAX_WAIT,
+            Config.SPOOL_MIN_FREE_BYTES,
+        )
+    except AdmissionRejected as e:
+        response = jsonify(
+            {"success": False, "error": str(e), "retry_after": e.retry_after}
+        )
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, e.status_code
 
-    video_file = request.files["video"]
+    # Stream the upload into its own workspace, hashing it on the way
+    workspace = create_workspace(Config.UPLOAD_FOLDER)
+    try:
+        upload = spool_upload(request, "video", workspace)
+    except Exception:
+        remove_workspace(workspace)
+        raise
 
-    if video_file.filename == "":
-        logger.error("Empty filename provided")
-        return jsonify({"success": False, "error": "No file selected"}), 400
+    if upload is None:
+        logger.error("No video file in request")
+        remove_workspace(workspace)
+        return jsonify({"success": False, "error": "No video file provided"}), 400
 
-    # Check if the file is allowed
+    # Check if the file is allowed, by its name and its contents
     allowed_extensions = {"mp4", "avi"}
     if (
-        not "." in video_file.filename
-        or video_file.filename.rsplit(".", 1)[1].lower() not in allowed_extensions
+        not "." in upload.filename
+        or upload.filename.rsplit(".", 1)[1].lower() not in allowed_extensions
+        or upload.container not in allowed_extensions
     ):
-        logger.error(f"Invalid file format: {video_file.filename}")
+        logger.error(f"Invalid file format: {upload.filename} ({upload.container})")
+        remove_workspace(workspace)
         return (
             jsonify(
                 {
@@ -56,18 +123,15 @@ def analyze_interview():
             400,
         )
 
-    # Secure the filename
-    filename = secure_filename(video_file.filename)
-    filepath = os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, filename)
     try:
-        # Ensure directory exists
-        os.makedirs(Config.TEMPORARY_ARTIFACTS_PATH, exist_ok=True)
-
-        # Save the file temporarily
-        video_file.save(filepath)
-
-        # Enqueue the task instead of processing immediately
-        task_id = task_queue.enqueue(filepath)
+        # Enqueue the task instead of processing immediately; a re-upload
+        # of a file that is queued or analysed returns the existing task
+        task_id = task_queue.enqueue(
+            upload.path,
+            upload.content_hash,
+            client=client_id(request),
+            workspace=workspace,
+        )
 
         # Return task ID and status URL
         status_url = url_for(
@@ -86,8 +150,7 @@ def analyze_interview():
     except Exception as e:
         logger.exception(f"Error queueing video analysis task: {str(e)}")
         # Clean up if error occurs
-        if "filepath" in locals() and os.path.exists(filepath):
-            os.remove(filepath)
+        remove_workspace(workspace)
         return (
             jsonify(
                 {"success": False, "error": f"Failed to queue analysis task: {str(e)}"}
@@ -101,12 +164,115 @@ def get_task_status(task_id):
     """
     Get the status of a task by ID.
     """
-    task_info = task_queue.get_task_status(task_id)
+    body = status_bodies.get(task_id)
+    if body is None:
+        task_info = task_queue.get_task_status(task_id)
+
+        if not task_info:
+            return jsonify({"success": False, "error": "Task not found"}), 404
+
+        body = _status_body(task_id, task_info)
+
+    return _status_response(body)
+
+
+@interview_api.route("/task/<task_id>/events", methods=["GET"])
+def get_task_events(task_id):
+    """
+    Follow the status of a task as it changes.
+    With ``Accept: text/event-stream``, streams Server-Sent Events, one per
+    state or progress change, until the task finishes. Otherwise long-polls:
+    waits up to ``timeout`` seconds for the status to differ from
+    ``revision`` and returns it like GET /task/<task_id>, with a
+    ``Retry-After`` header if too many requests are waiting already.
+    """
+    accepted = request.accept_mimetypes.best_match(
+        ["application/json", "text/event-stream"]
+    )
+
+    # A finished task does not change again; answer at once from the cache
+    body = status_bodies.get(task_id)
+    if body is not None and accepted != "text/event-stream":
+        return _status_response(body)
+
+    # Beyond the watcher limit, answer at once rather than hold a thread
+    watching = status_watchers.acquire(blocking=False)
+    release = status_watchers.release if watching else None
+
+    if accepted == "text/event-stream":
+        events = stream_task_status(
+            task_queue,
+            task_id,
+            request.headers.get("Last-Event-ID"),
+            _task_status_body,
+            {"success": False, "error": "Task not found"},
+            Config.STATUS_STREAM_SECONDS if watching else 0,
+            on_close=release,
+        )
+        return Response(
+            events,
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    try:
+        timeout = min(
+            request.args.get("timeout", Config.STATUS_WAIT_MAX_SECONDS, type=float),
+            Config.STATUS_WAIT_MAX_SECONDS,
+        )
+        task_info = task_queue.wait_for_change(
+            task_id, request.args.get("revision"), timeout if watching else 0
+        )
+    finally:
+        if watching:
+            release()
 
     if not task_info:
         return jsonify({"success": False, "error": "Task not found"}), 404
 
-    response = {"success": True, "task_id": task_id, "status": task_info["status"]}
+    response = _status_response(_status_body(task_id, task_info))
+    if not watching:
+        # Answered without waiting; ask the client not to come back at once
+        response.headers["Retry-After"] = str(BUSY_RECONNECT_MILLISECONDS // 1000)
+    return response
+
+
+def _status_body(task_id, task_info):
+    """Serialize the status body of a task, caching it once finished"""
+    body = StatusBody(_task_status_body(task_id, task_info), task_info["revision"])
+    if task_info["status"] in FINISHED_STATUSES:
+        status_bodies.put(task_id, body)
+    return body
+
+
+def _status_response(body):
+    """
+    Respond with a status body: 304 Not Modified if the client has it
+    already (``If-None-Match``), and gzipped when large and accepted.
+    """
+    if request.if_none_match.contains_weak(body.etag):
+        response = Response(status=304)
+    elif len(body.data) >= GZIP_MIN_BYTES and request.accept_encodings["gzip"]:
+        response = Response(body.gzipped(), mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(body.data, mimetype="application/json")
+
+    # Weak, as the gzipped and plain bodies share it
+    response.set_etag(body.etag, weak=True)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _task_status_body(task_id, task_info):
+    """Response body of the task status endpoints"""
+    response = {
+        "success": True,
+        "task_id": task_id,
+        "status": task_info["status"],
+        "revision": task_info["revision"],
+    }
 
     # Add additional information based on task status
     if task_info["status"] == "completed":
@@ -116,8 +282,38 @@ def get_task_status(task_id):
         )
     elif task_info["status"] == "failed":
         response["error"] = task_info["error"]
+    elif task_info.get("progress"):
+        # Stage, frames processed and estimated seconds remaining
+        response["progress"] = task_info["progress"]
+
+    return response
+
 
-    return jsonify(response)
+@interview_api.route("/task/<task_id>", methods=["DELETE"])
+def cancel_task(task_id):
+    """
+    Cancel a task by ID.
+    A pending task is cancelled at once (200); a running task is signalled
+    and stops at its next checkpoint (202). Finished tasks are kept (409).
+    """
+    task_info = task_queue.cancel(task_id)
+
+    if not task_info:
+        return jsonify({"success": False, "error": "Task not found"}), 404
+
+    status = task_info["status"]
+    response = {"success": True, "task_id": task_id, "status": status}
+
+    if status == "cancelled":
+        return jsonify(response)
+    if status in ("pending", "processing"):
+        response["message"] = "Cancellation has been requested"
+        return jsonify(response), 202
+
+    return (
+        jsonify({"success": False, "error": f"Task has already {status}"}),
+        409,
+    )
 
 
 @interview_api.route("/tips/<label>", methods=["GET"])
@@ -153,5 +349,21 @@ def health_check():
             "status": "ok",
             "service": "interview-analysis",
             "queue_size": task_queue.queue.qsize(),
+            "backlog_seconds": round(task_queue.backlog_seconds(), 1),
+            "estimated_wait_seconds": round(task_queue.estimated_wait(), 1),
+        }
+    )
+
+
+@interview_api.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Endpoint exposing service metrics such as transcript cache hit rate.
+    """
+    return jsonify(
+        {
+            "status": "ok",
+            "service": "interview-analysis",
+            "metrics": metrics.snapshot(),
         }
     )
@@ -31,6 +31,7 @@ def create_app(config_class=Config):
 
     # Ensure temporary upload directory exists
     os.makedirs(Config.TEMPORARY_ARTIFACTS_PATH, exist_ok=True)
+    os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
 
     return app
 
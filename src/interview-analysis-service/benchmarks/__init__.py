@@ -0,0 +1,6 @@
+"""
+Offline benchmarks and stand-in servers for the interview analysis microservice.
+
+Run modules from the service root, e.g.
+``python -m benchmarks.assemblyai_stub_server``.
+"""
@@ -0,0 +1,196 @@
+"""
+Local stand-in for the AssemblyAI upload and transcript endpoints.
+
+Point the service at it with ``ASSEMBLYAI_BASE_URL=http://127.0.0.1:8765/v2``
+to measure transcription latency and upload volume without the network.
+Transcripts complete ``--latency`` seconds after submission (plus
+``--realtime-factor`` times the uploaded audio duration when that can be
+derived from a WAV header). ``GET /stats`` reports bytes received and
+request counts; ``POST /stats/reset`` clears them.
+
+Usage:
+    python -m benchmarks.assemblyai_stub_server --port 8765 --latency 2
+"""
+
+import argparse
+import json
+import logging
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+class StubState:
+    """Thread-safe bookkeeping shared by all request handlers."""
+
+    def __init__(self, latency, realtime_factor, text):
+        self.latency = latency
+        self.realtime_factor = realtime_factor
+        self.text = text
+        self.lock = threading.Lock()
+        self.uploads = {}
+        self.transcripts = {}
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.bytes_received = 0
+            self.upload_count = 0
+            self.transcript_count = 0
+            self.poll_count = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "bytes_received": self.bytes_received,
+                "uploads": self.upload_count,
+                "transcripts": self.transcript_count,
+                "polls": self.poll_count,
+            }
+
+
+def _wav_duration(data):
+    """Duration of a PCM WAV payload in seconds, or 0 if it is not a WAV."""
+    if len(data) < 44 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return 0.0
+    channels, sample_rate = struct.unpack("<HI", data[22:28])
+    bits_per_sample = struct.unpack("<H", data[34:36])[0]
+    bytes_per_second = sample_rate * channels * bits_per_sample // 8
+    return (len(data) - 44) / bytes_per_second if bytes_per_second else 0.0
+
+
+def make_handler(state):
+    """Build a request handler class bound to ``state``."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def do_POST(self):
+            body = self._read_body()
+
+            if self.path == "/v2/upload":
+                upload_id = uuid.uuid4().hex
+                with state.lock:
+                    state.bytes_received += len(body)
+                    state.upload_count += 1
+                    state.uploads[upload_id] = {
+                        "size": len(body),
+                        "duration": _wav_duration(body),
+                    }
+                self._send_json({"upload_url": f"stub://uploads/{upload_id}"})
+
+            elif self.path == "/v2/transcript":
+                audio_url = json.loads(body or b"{}").get("audio_url", "")
+                upload = state.uploads.get(audio_url.rsplit("/", 1)[-1], {})
+                transcript_id = uuid.uuid4().hex
+                ready_at = (
+                    time.time()
+                    + state.latency
+                    + state.realtime_factor * upload.get("duration", 0.0)
+                )
+                with state.lock:
+                    state.transcript_count += 1
+                    state.transcripts[transcript_id] = {
+                        "ready_at": ready_at,
+                        "size": upload.get("size", 0),
+                    }
+                self._send_json({"id": transcript_id, "status": "queued"})
+
+            elif self.path == "/stats/reset":
+                state.reset()
+                self._send_json(state.stats())
+
+            else:
+                self._send_json({"error": "Not found"}, status=404)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(state.stats())
+                return
+
+            prefix = "/v2/transcript/"
+            if not self.path.startswith(prefix):
+                self._send_json({"error": "Not found"}, status=404)
+                return
+
+            transcript_id = self.path[len(prefix) :]
+            with state.lock:
+                state.poll_count += 1
+                transcript = state.transcripts.get(transcript_id)
+
+            if transcript is None:
+                self._send_json({"error": "Transcript not found"}, status=404)
+            elif time.time() < transcript["ready_at"]:
+                self._send_json({"id": transcript_id, "status": "processing"})
+            else:
+                self._send_json(
+                    {
+                        "id": transcript_id,
+                        "status": "completed",
+                        "text": state.text,
+                    }
+                )
+
+    return StubHandler
+
+
+def start_server(host="127.0.0.1", port=0, latency=1.0, realtime_factor=0.0, text=""):
+    """
+    Start the stub server on a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, 0 for an ephemeral port
+        latency (float): Fixed seconds before a transcript completes
+        realtime_factor (float): Extra seconds per second of uploaded WAV audio
+        text (str): Transcript text returned for every job
+
+    Returns:
+        ThreadingHTTPServer: Running server; ``server.server_address`` has the port
+    """
+    state = StubState(latency, realtime_factor, text)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--realtime-factor", type=float, default=0.0)
+    parser.add_argument(
+        "--text", default="Hi um I think I would be a good fit for this job."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    state = StubState(args.latency, args.realtime_factor, args.text)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    logger.info(f"AssemblyAI stub listening on http://{args.host}:{args.port}/v2")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
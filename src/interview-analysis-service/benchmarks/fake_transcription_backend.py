@@ -0,0 +1,73 @@
+"""
+In-process stand-in for a transcription backend.
+
+Unlike ``assemblyai_stub_server`` it needs no HTTP round trips, so
+benchmarks see only the scheduling of the jobs.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+
+
+class FakeTranscriptionBackend:
+    """
+    Offline transcription backend for benchmarks.
+
+    Jobs complete ``latency`` seconds (plus ``seconds_per_mb`` per uploaded
+    megabyte) after submission. The returned text identifies the uploaded
+    audio by digest, so stitching order can be checked, and the backend
+    records how many jobs were in flight at once.
+    """
+
+    def __init__(self, latency=0.5, seconds_per_mb=0.0):
+        """
+        Initialize the fake backend.
+
+        Args:
+            latency (float): Fixed seconds before a job completes
+            seconds_per_mb (float): Extra seconds per uploaded megabyte
+        """
+        self.latency = latency
+        self.seconds_per_mb = seconds_per_mb
+        self.lock = threading.Lock()
+        self.uploads = {}
+        self.jobs = {}
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def upload(self, audio_path):
+        with open(audio_path, "rb") as f:
+            data = f.read()
+        upload_id = uuid.uuid4().hex
+        with self.lock:
+            self.bytes_received += len(data)
+            self.uploads[upload_id] = (len(data), hashlib.sha256(data).hexdigest())
+        return f"fake://{upload_id}"
+
+    def submit(self, audio_url):
+        size, digest = self.uploads[audio_url.rsplit("/", 1)[-1]]
+        transcript_id = uuid.uuid4().hex
+        with self.lock:
+            self.jobs[transcript_id] = {
+                "ready_at": time.time()
+                + self.latency
+                + self.seconds_per_mb * size / (1024 * 1024),
+                "text": f"[{digest[:12]}]",
+                "done": False,
+            }
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return transcript_id
+
+    def get(self, transcript_id):
+        with self.lock:
+            job = self.jobs[transcript_id]
+            if time.time() < job["ready_at"]:
+                return {"id": transcript_id, "status": "processing"}
+            if not job["done"]:
+                job["done"] = True
+                self.in_flight -= 1
+            return {"id": transcript_id, "status": "completed", "text": job["text"]}
@@ -0,0 +1,83 @@
+"""
+Compare lexical tokenizer modes and stem memoization on sample transcripts.
+
+Tokenizes a corpus of transcripts (blank-line separated paragraphs) with
+NLTK's ``word_tokenize`` and the fast regex tokenizer, reporting tokens/sec
+for each, how many transcripts tokenize identically, and whether the
+lexical feature counts agree. Stemming throughput is reported with and
+without the shared stem cache.
+
+Usage:
+    python -m benchmarks.lexical_tokenizer_benchmark --repeat 50
+"""
+
+import argparse
+import os
+import time
+
+from nltk.tokenize import word_tokenize
+from utils.lexical_extraction import LexicalFeatureExtractor, _stemmer, stem
+from utils.tokenizer import fast_word_tokenize
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(__file__), "data", "sample_transcripts.txt"
+)
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [block.strip() for block in f.read().split("\n\n") if block.strip()]
+
+
+def throughput(func, items, repeat):
+    """Run ``func`` over ``items`` ``repeat`` times; return (outputs, seconds)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = [func(item) for item in items]
+    return outputs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    transcripts = load_corpus(args.corpus)
+
+    nltk_tokens, nltk_seconds = throughput(word_tokenize, transcripts, args.repeat)
+    fast_tokens, fast_seconds = throughput(
+        fast_word_tokenize, transcripts, args.repeat
+    )
+    total_tokens = sum(len(tokens) for tokens in nltk_tokens) * args.repeat
+
+    print(f"Corpus: {len(transcripts)} transcripts, {total_tokens} tokens")
+    print(f"nltk: {total_tokens / nltk_seconds:>12,.0f} tokens/s")
+    print(f"fast: {total_tokens / fast_seconds:>12,.0f} tokens/s")
+
+    identical = sum(a == b for a, b in zip(nltk_tokens, fast_tokens))
+    print(f"Identical tokenization: {identical}/{len(transcripts)}")
+    for a, b in zip(nltk_tokens, fast_tokens):
+        if a != b:
+            print(f"  nltk only: {sorted(set(a) - set(b))}")
+            print(f"  fast only: {sorted(set(b) - set(a))}")
+
+    nltk_features = LexicalFeatureExtractor(tokenizer="nltk").extract_many(
+        transcripts
+    )
+    fast_features = LexicalFeatureExtractor(tokenizer="fast").extract_many(
+        transcripts
+    )
+    print(f"Identical lexical features: {nltk_features == fast_features}")
+
+    words = [token.lower() for tokens in nltk_tokens for token in tokens]
+    _, uncached_seconds = throughput(_stemmer.stem, words, args.repeat)
+    stem.cache_clear()
+    _, cached_seconds = throughput(stem, words, args.repeat)
+    total_words = len(words) * args.repeat
+    print(f"stem (uncached): {total_words / uncached_seconds:>12,.0f} words/s")
+    print(f"stem (cached):   {total_words / cached_seconds:>12,.0f} words/s")
+
+
+if __name__ == "__main__":
+    main()
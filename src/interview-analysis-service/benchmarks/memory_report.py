@@ -0,0 +1,194 @@
+"""
+Report per-process unique vs shared memory of loaded model artifacts.
+
+Starts several worker processes that hold the model artifacts, touch
+every array, and then read ``/proc/self/smaps_rollup`` while all of them
+are alive. Artifacts are loaded with plain ``pickle.load`` or memory-mapped
+from joblib sidecars, either once in a parent that then forks the workers
+(gunicorn with ``preload_app``) or by every worker itself (spawned task
+worker processes, or servers without preloading). Private (unique) memory
+is what each extra worker costs; shared memory is paid once per host. A
+worker that loads nothing is measured the same way as the baseline.
+
+``--synthetic-mb`` adds a pickled artifact of that many MiB of arrays, for
+hosts where the deployed model is not at hand.
+
+Usage:
+    python -m benchmarks.memory_report --workers 4
+    python -m benchmarks.memory_report --workers 4 --synthetic-mb 200
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import tempfile
+
+import joblib
+import numpy as np
+from config import MODEL_PATH
+from utils.model_artifacts import ensure_sidecar
+
+DEFAULT_ARTIFACTS = [
+    os.path.join(MODEL_PATH, "model_custom.pkl"),
+    os.path.join(MODEL_PATH, "pca_model.pkl"),
+]
+
+ROLLUP_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def read_smaps_rollup():
+    """Memory totals of this process in kB, keyed by smaps field name."""
+    values = {}
+    with open("/proc/self/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0].rstrip(":") in ROLLUP_FIELDS:
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return values
+
+
+def touch_arrays(obj, seen=None):
+    """Read every NumPy array reachable from ``obj`` so its pages are resident."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        if obj.dtype != object:
+            if obj.size:
+                obj.sum()
+            return obj.nbytes
+        return sum(touch_arrays(item, seen) for item in obj.ravel())
+    if isinstance(obj, dict):
+        return sum(touch_arrays(value, seen) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(touch_arrays(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        return touch_arrays(vars(obj), seen)
+    return 0
+
+
+def load_artifacts(loader, paths):
+    """Load every artifact with ``pickle`` or memory-mapped from its sidecar."""
+    artifacts = []
+    for path in paths:
+        if loader == "mmap":
+            artifacts.append(joblib.load(ensure_sidecar(path), mmap_mode="r"))
+        elif loader == "pickle":
+            with open(path, "rb") as f:
+                artifacts.append(pickle.load(f))
+    return artifacts
+
+
+def worker(loader, paths, artifacts, barrier, results):
+    if artifacts is None:
+        artifacts = load_artifacts(loader, paths)
+    array_bytes = touch_arrays(artifacts)
+
+    # Measure while every worker holds its artifacts
+    barrier.wait()
+    results.put((os.getpid(), array_bytes, read_smaps_rollup()))
+    barrier.wait()
+
+
+def master(loader, paths, workers, preload, reports):
+    """
+    Start the workers the way the server would and collect their reports.
+
+    Runs in a fresh process of its own, so memory left behind by earlier
+    runs is not inherited by the forked workers.
+    """
+    context = multiprocessing.get_context("fork" if preload else "spawn")
+    artifacts = load_artifacts(loader, paths) if preload else None
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker, args=(loader, paths, artifacts, barrier, results)
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports.put([results.get() for _ in processes])
+    for process in processes:
+        process.join()
+
+
+def run(loader, paths, workers, preload):
+    context = multiprocessing.get_context("spawn")
+    reports = context.Queue()
+    process = context.Process(
+        target=master, args=(loader, paths, workers, preload, reports)
+    )
+    process.start()
+    result = reports.get()
+    process.join()
+    return result
+
+
+def write_synthetic_artifact(directory, megabytes):
+    """Pickle a dict of float64 arrays totalling ``megabytes`` MiB."""
+    rng = np.random.default_rng(0)
+    count = max(1, megabytes // 8)
+    artifact = {
+        f"array_{i}": rng.random((megabytes * 2**20 // 8) // count)
+        for i in range(count)
+    }
+    path = os.path.join(directory, "synthetic_model.pkl")
+    with open(path, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def print_reports(title, reports):
+    print(f"\n{title}, MiB")
+    print(
+        f"{'pid':>8}{'arrays':>10}{'rss':>10}{'pss':>10}{'unique':>10}{'shared':>10}"
+    )
+    for pid, array_bytes, rollup in reports:
+        unique = rollup["Private_Clean"] + rollup["Private_Dirty"]
+        shared = rollup["Shared_Clean"] + rollup["Shared_Dirty"]
+        print(
+            f"{pid:>8}{array_bytes / 2**20:>10.1f}{rollup['Rss'] / 1024:>10.1f}"
+            f"{rollup['Pss'] / 1024:>10.1f}{unique / 1024:>10.1f}"
+            f"{shared / 1024:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("artifacts", nargs="*", default=DEFAULT_ARTIFACTS)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--synthetic-mb", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [path for path in args.artifacts if os.path.exists(path)]
+        if args.synthetic_mb > 0:
+            paths.append(write_synthetic_artifact(tmp_dir, args.synthetic_mb))
+        print(f"Artifacts: {paths}")
+
+        for path in paths:
+            ensure_sidecar(path)
+
+        for preload in (True, False):
+            start = "preloaded, forked" if preload else "spawned"
+            for loader in ("none", "pickle", "mmap"):
+                reports = run(loader, paths, args.workers, preload)
+                print_reports(
+                    f"{loader}, {start} ({args.workers} workers)", reports
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Simulate task queue wait times under FIFO and cost-based scheduling.
+
+Generates a stream of uploads with a realistic mix of video lengths (mostly
+short answers, some full mock interviews), Poisson arrivals sized for the
+requested worker utilization, and processing times proportional to video
+length with noise the estimate does not know about. The same stream is
+run through a FIFO queue and through ``CostScheduler`` with and without
+aging, reporting mean, p50, p95 and maximum wait before processing starts.
+
+Usage:
+    python -m benchmarks.scheduling_simulation --tasks 20000 --workers 4
+"""
+
+import argparse
+import heapq
+import random
+from queue import Queue
+
+from task_scheduler import CostScheduler
+
+# (share of uploads, shortest and longest video in seconds)
+VIDEO_MIX = [
+    (0.60, 60, 300),
+    (0.30, 300, 900),
+    (0.10, 1800, 2700),
+]
+
+
+def generate_tasks(num_tasks, workers, utilization, rate, seed):
+    """Arrival time, estimated and actual processing seconds per task."""
+    rng = random.Random(seed)
+    mean_duration = sum(share * (low + high) / 2 for share, low, high in VIDEO_MIX)
+    arrival_rate = utilization * workers / (mean_duration * rate)
+
+    tasks, now = [], 0.0
+    for _ in range(num_tasks):
+        now += rng.expovariate(arrival_rate)
+        pick = rng.random()
+        for share, low, high in VIDEO_MIX:
+            if pick < share:
+                break
+            pick -= share
+        duration = rng.uniform(low, high)
+        estimate = duration * rate
+        actual = estimate * rng.lognormvariate(0, 0.25)
+        tasks.append((now, estimate, actual))
+    return tasks
+
+
+class FifoQueue(Queue):
+    """FIFO queue taking the same items as ``CostScheduler``."""
+
+    def _get(self):
+        return self.queue.popleft()[0]
+
+
+def simulate(tasks, workers, make_queue):
+    """Run the tasks through a queue; return each task's wait in seconds."""
+    clock = [0.0]
+    queue = make_queue(lambda: clock[0])
+    events = [(arrival, 0, i) for i, (arrival, _, _) in enumerate(tasks)]
+    heapq.heapify(events)
+    idle = workers
+    waits = [0.0] * len(tasks)
+
+    while events:
+        clock[0], kind, i = heapq.heappop(events)
+        if kind == 0:
+            queue.put((i, tasks[i][1], None))
+        else:
+            idle += 1
+
+        while idle and queue.qsize():
+            task = queue.get_nowait()
+            waits[task] = clock[0] - tasks[task][0]
+            heapq.heappush(events, (clock[0] + tasks[task][2], 1, task))
+            idle -= 1
+
+    return waits
+
+
+def summarize(waits):
+    waits = sorted(waits)
+    return (
+        sum(waits) / len(waits),
+        waits[len(waits) // 2],
+        waits[int(0.95 * (len(waits) - 1))],
+        waits[-1],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--utilization", type=float, default=0.85)
+    parser.add_argument("--rate", type=float, default=1.0, help="seconds/video s")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tasks = generate_tasks(
+        args.tasks, args.workers, args.utilization, args.rate, args.seed
+    )
+    policies = [
+        ("fifo", lambda clock: FifoQueue()),
+        ("sjf", lambda clock: CostScheduler(aging=0.0, clock=clock)),
+        ("sjf+aging 0.5", lambda clock: CostScheduler(aging=0.5, clock=clock)),
+        ("sjf+aging 1", lambda clock: CostScheduler(aging=1.0, clock=clock)),
+    ]
+
+    print(f"{'policy':>14}{'mean s':>10}{'p50 s':>10}{'p95 s':>10}{'max s':>10}")
+    for name, make_queue in policies:
+        mean, p50, p95, worst = summarize(simulate(tasks, args.workers, make_queue))
+        print(f"{name:>14}{mean:>10.0f}{p50:>10.0f}{p95:>10.0f}{worst:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare task throughput of the thread and process task queue backends.
+
+For every backend and worker count, enqueues copies of the given videos
+into a fresh task queue, waits until all tasks have finished and reports
+tasks/hour. The feature store is disabled so that every task really runs
+the extractors, and transcripts come from a local AssemblyAI stand-in
+unless ``ASSEMBLYAI_BASE_URL`` is set.
+
+Usage:
+    python -m benchmarks.task_backend_benchmark video1.mp4 video2.mp4 \\
+        --workers 1 2 4 --tasks 16
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.assemblyai_stub_server import start_server
+
+# Set before the service modules read their configuration; spawned worker
+# processes inherit the environment, and so skip starting another stub
+os.environ["FEATURE_STORE_ENABLED"] = "False"
+if "ASSEMBLYAI_BASE_URL" not in os.environ:
+    stub_host, stub_port = start_server(latency=0.5).server_address
+    os.environ["ASSEMBLYAI_BASE_URL"] = f"http://{stub_host}:{stub_port}/v2"
+
+from services.model_scorer import ModelScorer  # noqa: E402
+from task_queue import TaskQueue, TaskStatus  # noqa: E402
+
+
+def run(backend, num_workers, videos, num_tasks, scorer):
+    """
+    Process ``num_tasks`` videos with one backend.
+
+    Returns:
+        tuple[float, int]: Seconds taken and number of failed tasks
+    """
+    work_dir = tempfile.mkdtemp(prefix=f"task_backend_{backend}_")
+    try:
+        queue = TaskQueue(
+            results_dir=os.path.join(work_dir, "results"),
+            num_workers=num_workers,
+            scorer=scorer,
+            backend=backend,
+        )
+
+        # Tasks delete their file when done, so each gets its own copy
+        paths = []
+        for i in range(num_workers + num_tasks):
+            video = videos[i % len(videos)]
+            path = os.path.join(work_dir, f"{i}_{os.path.basename(video)}")
+            shutil.copyfile(video, path)
+            paths.append(path)
+
+        # Untimed warm-up round, so worker processes have loaded their models
+        for path in paths[:num_workers]:
+            queue.enqueue(path)
+        queue.queue.join()
+
+        start = time.perf_counter()
+        task_ids = [queue.enqueue(path) for path in paths[num_workers:]]
+        queue.queue.join()
+        elapsed = time.perf_counter() - start
+
+        failed = sum(
+            queue.tasks[task_id].status == TaskStatus.FAILED for task_id in task_ids
+        )
+        if queue.executor is not None:
+            queue.executor.shutdown()
+        return elapsed, failed
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--backends", nargs="+", default=["thread", "process"])
+    args = parser.parse_args()
+
+    scorer = ModelScorer()
+
+    print(f"{'backend':>10}{'workers':>10}{'seconds':>10}{'tasks/hour':>12}{'failed':>8}")
+    for backend in args.backends:
+        for num_workers in args.workers:
+            elapsed, failed = run(backend, num_workers, args.videos, args.tasks, scorer)
+            print(
+                f"{backend:>10}{num_workers:>10}{elapsed:>10.1f}"
+                f"{args.tasks / elapsed * 3600:>12.0f}{failed:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare status-poll latency of the task store backends.
+
+Fills each store with completed tasks carrying a result of the given size,
+then has several threads look up random task IDs for a fixed time, as
+concurrent status polls landing on a process that does not hold the tasks
+in memory would. Reports polls/sec and p50/p95/p99 lookup latency.
+
+Usage:
+    python -m benchmarks.task_status_benchmark --tasks 5000 --threads 16
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from task_store import create_task_store
+
+
+def make_task(result_bytes):
+    now = time.time()
+    return {
+        "id": str(uuid.uuid4()),
+        "filepath": "/tmp/upload.mp4",
+        "status": "completed",
+        "created_at": now,
+        "started_at": now,
+        "completed_at": now,
+        "result": {"feedback": "x" * result_bytes},
+        "error": None,
+        "content_hash": uuid.uuid4().hex,
+        "options": None,
+    }
+
+
+def poll(store, task_ids, deadline, latencies):
+    local = []
+    while time.monotonic() < deadline:
+        task_id = random.choice(task_ids)
+        start = time.perf_counter()
+        store.get(task_id)
+        local.append(time.perf_counter() - start)
+    latencies.extend(local)
+
+
+def run(backend, num_tasks, result_bytes, threads, duration):
+    work_dir = tempfile.mkdtemp(prefix=f"task_status_{backend}_")
+    try:
+        store = create_task_store(backend, work_dir)
+        task_ids = []
+        for _ in range(num_tasks):
+            task = make_task(result_bytes)
+            store.save(task)
+            task_ids.append(task["id"])
+
+        latencies = []
+        deadline = time.monotonic() + duration
+        pollers = [
+            threading.Thread(target=poll, args=(store, task_ids, deadline, latencies))
+            for _ in range(threads)
+        ]
+        for poller in pollers:
+            poller.start()
+        for poller in pollers:
+            poller.join()
+        store.close()
+
+        latencies.sort()
+        return len(latencies) / duration, [
+            latencies[int(q * (len(latencies) - 1))] * 1000 for q in (0.5, 0.95, 0.99)
+        ]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--result-bytes", type=int, default=4096)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'store':>8}{'polls/sec':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for backend in ("json", "journal", "sqlite"):
+        rate, (p50, p95, p99) = run(
+            backend, args.tasks, args.result_bytes, args.threads, args.duration
+        )
+        print(f"{backend:>8}{rate:>12.0f}{p50:>10.3f}{p95:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
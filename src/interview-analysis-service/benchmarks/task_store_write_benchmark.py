@@ -0,0 +1,167 @@
+"""
+Compare disk writes and read consistency of the task store backends.
+
+Several worker threads run tasks through the usual three state changes
+(pending, processing, completed with a result) while reader threads poll
+random task IDs. Reports, per store, the write syscalls and bytes written
+per task (from ``/proc/self/io``), commits per task, and how often a
+reader got an error or saw a task's status go backwards. ``--fsync``
+flushes every journal commit to disk; SQLite and the JSON files never do.
+
+Usage:
+    python -m benchmarks.task_store_write_benchmark --tasks 2000 --workers 8
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from task_store import create_task_store
+from utils.metrics import metrics
+
+STATUS_ORDER = {"pending": 0, "processing": 1, "completed": 2}
+
+
+def read_io():
+    """Write syscalls and bytes written by this process so far."""
+    values = {}
+    with open("/proc/self/io", "r") as f:
+        for line in f:
+            name, value = line.split(":")
+            values[name] = int(value)
+    return values["syscw"], values["wchar"]
+
+
+def worker(store, num_tasks, result_bytes, task_ids):
+    for _ in range(num_tasks):
+        now = time.time()
+        task = {
+            "id": str(uuid.uuid4()),
+            "filepath": "/tmp/upload.mp4",
+            "status": "pending",
+            "created_at": now,
+            "started_at": None,
+            "completed_at": None,
+            "result": None,
+            "error": None,
+            "content_hash": None,
+            "options": None,
+        }
+        store.save(dict(task))
+        task_ids.append(task["id"])
+
+        task.update(status="processing", started_at=time.time())
+        store.save(dict(task))
+
+        task.update(
+            status="completed",
+            completed_at=time.time(),
+            result={"feedback": "x" * result_bytes},
+        )
+        store.save(dict(task))
+
+
+def reader(store, task_ids, stop, anomalies):
+    seen = {}
+    while not stop.is_set():
+        if not task_ids:
+            continue
+        task_id = random.choice(task_ids)
+        try:
+            task = store.get(task_id)
+        except Exception:
+            anomalies["errors"] += 1
+            continue
+        if task is None:
+            anomalies["missing"] += 1
+            continue
+        order = STATUS_ORDER[task["status"]]
+        if order < seen.get(task_id, 0):
+            anomalies["regressions"] += 1
+        seen[task_id] = order
+
+
+def run(backend, num_tasks, workers, readers, result_bytes, fsync):
+    work_dir = tempfile.mkdtemp(prefix=f"task_store_{backend}_")
+    try:
+        store = create_task_store(backend, work_dir, fsync=fsync)
+        task_ids = []
+        anomalies = {"errors": 0, "missing": 0, "regressions": 0}
+        stop = threading.Event()
+        commits_before = metrics.counter("task_store.commits")
+        syscw_before, wchar_before = read_io()
+
+        reader_threads = [
+            threading.Thread(target=reader, args=(store, task_ids, stop, anomalies))
+            for _ in range(readers)
+        ]
+        worker_threads = [
+            threading.Thread(
+                target=worker,
+                args=(store, num_tasks // workers, result_bytes, task_ids),
+            )
+            for _ in range(workers)
+        ]
+        start = time.perf_counter()
+        for thread in reader_threads + worker_threads:
+            thread.start()
+        for thread in worker_threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in reader_threads:
+            thread.join()
+
+        syscw_after, wchar_after = read_io()
+        commits = metrics.counter("task_store.commits") - commits_before
+        tasks = len(task_ids)
+        store.close()
+
+        return {
+            "seconds": elapsed,
+            "writes": (syscw_after - syscw_before) / tasks,
+            "bytes": (wchar_after - wchar_before) / tasks,
+            "commits": commits / tasks if commits else 3.0,
+            **anomalies,
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--result-bytes", type=int, default=4096)
+    parser.add_argument(
+        "--fsync", action="store_true", help="flush every journal commit to disk"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'store':>8}{'seconds':>9}{'writes/task':>13}{'bytes/task':>12}"
+        f"{'commits/task':>14}{'errors':>8}{'missing':>9}{'regressed':>11}"
+    )
+    for backend in ("json", "journal", "sqlite"):
+        r = run(
+            backend,
+            args.tasks,
+            args.workers,
+            args.readers,
+            args.result_bytes,
+            args.fsync,
+        )
+        print(
+            f"{backend:>8}{r['seconds']:>9.2f}{r['writes']:>13.2f}{r['bytes']:>12.0f}"
+            f"{r['commits']:>14.2f}{r['errors']:>8}{r['missing']:>9}"
+            f"{r['regressions']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
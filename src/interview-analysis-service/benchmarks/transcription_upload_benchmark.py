@@ -0,0 +1,60 @@
+"""
+Compare upload size and transcription latency per upload codec, offline.
+
+Extracts the audio of a video once, then submits it through
+``TranscriptionService`` to the local AssemblyAI stand-in for each codec,
+reporting bytes sent, encode time and end-to-end latency.
+
+Usage:
+    python -m benchmarks.transcription_upload_benchmark path/to/interview.mp4
+"""
+
+import argparse
+import time
+
+from utils.speech_to_text import TranscriptionService
+from utils.transcription_backends import AssemblyAIBackend
+
+from benchmarks.assemblyai_stub_server import start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("video", help="Video file to extract audio from")
+    parser.add_argument("--codecs", nargs="+", default=["wav", "flac", "opus"])
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency)
+    host, port = server.server_address
+    backend = AssemblyAIBackend("stub-key", f"http://{host}:{port}/v2")
+    service = TranscriptionService("stub-key", backend=backend)
+    service.poll_interval = 0.1
+
+    audio = service.extract_audio(args.video)
+    print(f"Audio: {audio.duration:.1f}s, {audio.nbytes} bytes raw PCM")
+    print(f"{'codec':<8}{'bytes sent':>14}{'ratio':>8}{'submit s':>10}{'total s':>10}")
+
+    try:
+        for codec in args.codecs:
+            service.upload_codec = codec
+            server.state.reset()
+
+            start = time.perf_counter()
+            job = service.submit_audio(audio)
+            submitted = time.perf_counter()
+            job.result()
+            finished = time.perf_counter()
+
+            bytes_sent = server.state.stats()["bytes_received"]
+            print(
+                f"{codec:<8}{bytes_sent:>14}{bytes_sent / audio.nbytes:>8.2f}"
+                f"{submitted - start:>10.2f}{finished - start:>10.2f}"
+            )
+    finally:
+        audio.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
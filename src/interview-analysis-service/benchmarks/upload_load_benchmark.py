@@ -0,0 +1,114 @@
+"""
+Measure sustained upload throughput and memory of a running server.
+
+Posts the same video from several concurrent clients for a fixed time and
+reports accepted uploads per second. When the gunicorn master PID is given,
+also sums RSS and PSS over the master and its workers, which shows how much
+of the model memory the workers share after a preloaded start.
+
+Usage:
+    gunicorn -c gunicorn.conf.py "app:create_app()" &
+    python -m benchmarks.upload_load_benchmark video.mp4 --clients 16 \\
+        --gunicorn-pid $(pgrep -o -f gunicorn)
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import requests
+
+DEFAULT_URL = "http://localhost:4000/api/v1/interview/analyze"
+
+
+def process_tree(pid):
+    """PIDs of a process and its direct children."""
+    pids = [pid]
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces; the parent PID follows it
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            pids.append(int(entry))
+    return pids
+
+
+def memory_totals(pid):
+    """Summed RSS and PSS in MiB of a process and its children."""
+    rss = pss = 0
+    for child in process_tree(pid):
+        try:
+            with open(f"/proc/{child}/smaps_rollup", "r") as f:
+                for line in f:
+                    parts = line.split()
+                    if parts[0] == "Rss:":
+                        rss += int(parts[1])
+                    elif parts[0] == "Pss:":
+                        pss += int(parts[1])
+        except OSError:
+            continue
+    return rss / 1024, pss / 1024
+
+
+def client(url, video, deadline, counts, lock):
+    with open(video, "rb") as f:
+        data = f.read()
+    name = os.path.basename(video)
+
+    session = requests.Session()
+    while time.monotonic() < deadline:
+        try:
+            response = session.post(url, files={"video": (name, data)}, timeout=60)
+            key = "accepted" if response.status_code < 300 else "rejected"
+        except requests.RequestException:
+            key = "errors"
+        with lock:
+            counts[key] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("video")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--gunicorn-pid", type=int)
+    args = parser.parse_args()
+
+    counts = {"accepted": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    threads = [
+        threading.Thread(
+            target=client, args=(args.url, args.video, deadline, counts, lock)
+        )
+        for _ in range(args.clients)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    print(f"Clients: {args.clients}, duration: {elapsed:.1f}s")
+    print(
+        f"Uploads/sec: {counts['accepted'] / elapsed:.2f} "
+        f"(accepted {counts['accepted']}, rejected {counts['rejected']}, "
+        f"errors {counts['errors']})"
+    )
+
+    if args.gunicorn_pid:
+        rss, pss = memory_totals(args.gunicorn_pid)
+        print(f"Server memory: RSS {rss:.1f} MiB, PSS {pss:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
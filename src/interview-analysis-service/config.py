@@ -24,15 +24,140 @@ class Config:
     TEMPORARY_ARTIFACTS_PATH = os.environ.get(
         "TEMPORARY_ARTIFACTS_PATH", os.path.join(BASE_DIR, "tmp")
     )
+    # Each upload gets a workspace directory here, removed with its task
+    UPLOAD_FOLDER = os.environ.get(
+        "UPLOAD_FOLDER", os.path.join(TEMPORARY_ARTIFACTS_PATH, "uploads")
+    )
 
     # AssemblyAI API key (should be set as environment variable in production)
     ASSEMBLYAI_API_KEY = os.environ.get("ASSEMBLYAI_API_KEY", "")
+    ASSEMBLYAI_BASE_URL = os.environ.get(
+        "ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com/v2"
+    )
+
+    # Transcription settings; offline runs point ASSEMBLYAI_BASE_URL at
+    # benchmarks/assemblyai_stub_server.py
+    TRANSCRIPTION_UPLOAD_CODEC = os.getenv("TRANSCRIPTION_UPLOAD_CODEC", "flac")
+    TRANSCRIPTION_POLL_INTERVAL = float(os.getenv("TRANSCRIPTION_POLL_INTERVAL", "3"))
+    TRANSCRIPTION_TIMEOUT = int(
+        os.getenv("TRANSCRIPTION_TIMEOUT", "1800")
+    )  # 30 minutes in seconds
+    # Split recordings into chunks of about this length (0 disables chunking)
+    TRANSCRIPTION_CHUNK_SECONDS = int(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "0"))
+    # Threads encoding, uploading and polling chunks at once, per recording
+    TRANSCRIPTION_MAX_IN_FLIGHT = int(os.getenv("TRANSCRIPTION_MAX_IN_FLIGHT", "4"))
+
+    # Transcript cache keyed by the hash of the extracted audio
+    TRANSCRIPT_CACHE_ENABLED = (
+        os.environ.get("TRANSCRIPT_CACHE_ENABLED", "True").lower() == "true"
+    )
+    TRANSCRIPT_CACHE_PATH = os.environ.get(
+        "TRANSCRIPT_CACHE_PATH", os.path.join(TEMPORARY_ARTIFACTS_PATH, "transcripts")
+    )
+    TRANSCRIPT_CACHE_MAX_BYTES = int(
+        os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(100 * 1024 * 1024))
+    )  # 100MB
+    TRANSCRIPT_CACHE_TTL = int(
+        os.getenv("TRANSCRIPT_CACHE_TTL", str(30 * 86400))
+    )  # 30 days in seconds
+
+    # Optional .json or LIWC .dic lexicon extending the built-in categories
+    LEXICON_PATH = os.environ.get("LEXICON_PATH")
+    # "nltk" (word_tokenize) or "fast" (single compiled regex)
+    LEXICAL_TOKENIZER = os.getenv("LEXICAL_TOKENIZER", "nltk")
+    LEXICAL_STEM_CACHE_SIZE = int(os.getenv("LEXICAL_STEM_CACHE_SIZE", "50000"))
+
+    # Audio extraction: recordings longer than this are spooled to a
+    # memory-mapped file instead of being held in memory
+    AUDIO_SPOOL_THRESHOLD_SECONDS = int(
+        os.getenv("AUDIO_SPOOL_THRESHOLD_SECONDS", "600")
+    )
+
+    # Per-stage feature store keyed by video content hash
+    FEATURE_STORE_ENABLED = (
+        os.environ.get("FEATURE_STORE_ENABLED", "True").lower() == "true"
+    )
+    FEATURE_STORE_PATH = os.environ.get(
+        "FEATURE_STORE_PATH", os.path.join(TEMPORARY_ARTIFACTS_PATH, "features.sqlite3")
+    )
+
+    # Load model arrays read-only from memory-mapped joblib sidecars, so
+    # worker processes share them through the page cache
+    MODEL_MMAP_ENABLED = os.environ.get("MODEL_MMAP_ENABLED", "True").lower() == "true"
+
+    # Micro-batched model inference across concurrent tasks
+    INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "8"))
+    INFERENCE_MAX_WAIT = float(os.getenv("INFERENCE_MAX_WAIT", "0.05"))  # seconds
+
+    # Set when gunicorn preloads the app in its master process; task queue
+    # workers are then started in each server worker after it forks
+    PRELOAD_APP = os.environ.get("PRELOAD_APP", "False").lower() == "true"
 
     # Task queue configuration
+    # Analyses run at once per process; gunicorn.conf.py derives it from
+    # the node-wide ANALYSIS_CONCURRENCY
     TASK_QUEUE_WORKERS = int(os.getenv("TASK_QUEUE_WORKERS", "4"))
     TASK_QUEUE_RESULTS_TTL = int(
         os.getenv("TASK_QUEUE_RESULTS_TTL", "86400")
     )  # 24 hours in seconds
+    # Finished tasks are kept in memory this long, then served from disk
+    TASK_QUEUE_HOT_SECONDS = int(os.getenv("TASK_QUEUE_HOT_SECONDS", "300"))
+    TASK_QUEUE_MAX_HOT_TASKS = int(os.getenv("TASK_QUEUE_MAX_HOT_TASKS", "1000"))
+    TASK_QUEUE_MAX_RESULTS = int(os.getenv("TASK_QUEUE_MAX_RESULTS", "10000"))
+    TASK_QUEUE_MAX_RESULT_BYTES = int(
+        os.getenv("TASK_QUEUE_MAX_RESULT_BYTES", str(1024 * 1024 * 1024))
+    )  # 1GB
+    TASK_QUEUE_JANITOR_INTERVAL = int(os.getenv("TASK_QUEUE_JANITOR_INTERVAL", "60"))
+    # Runs per task before it is marked failed; retries and tasks resumed
+    # after a restart continue from their last completed stage
+    TASK_QUEUE_MAX_ATTEMPTS = int(os.getenv("TASK_QUEUE_MAX_ATTEMPTS", "2"))
+    # Tasks run shortest estimated job first; each second waited counts as
+    # this many seconds less estimated work, so long videos still get run
+    TASK_QUEUE_AGING = float(os.getenv("TASK_QUEUE_AGING", "1.0"))
+    # Take turns between clients (X-Client-ID header, else remote address)
+    TASK_QUEUE_FAIR_SHARE = (
+        os.environ.get("TASK_QUEUE_FAIR_SHARE", "False").lower() == "true"
+    )
+    # "thread", or "process" to extract features in a pool of worker
+    # processes; their feature vectors are scored in the server process, so
+    # the shared scorer still batches them
+    TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "thread")
+    # "sqlite" (shared by all server processes), "journal" (append-only
+    # file with compaction, keeping only an index in memory) or "json" (a
+    # file per task, not shared)
+    TASK_STORE = os.getenv("TASK_STORE", "sqlite")
+    TASK_STORE_PATH = os.environ.get(
+        "TASK_STORE_PATH", os.path.join(TEMPORARY_ARTIFACTS_PATH, "tasks.sqlite3")
+    )
+    # Extra seconds a task store commit waits for state changes of other
+    # workers to join it; concurrent changes are batched even without it
+    TASK_STORE_COMMIT_DELAY = float(os.getenv("TASK_STORE_COMMIT_DELAY", "0"))
+    # Flush every journal commit to disk, surviving a power loss as well as
+    # a server crash; costs a disk flush per commit, which makes the journal
+    # several times slower than SQLite in synchronous=NORMAL mode
+    TASK_STORE_FSYNC = os.environ.get("TASK_STORE_FSYNC", "False").lower() == "true"
+
+    # Uploads are rejected with 429 while a new task would wait longer than
+    # this many seconds to start (0 accepts every upload)
+    ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "1800"))
+    # Uploads are rejected with 503 if they would leave less space free
+    SPOOL_MIN_FREE_BYTES = int(
+        os.getenv("SPOOL_MIN_FREE_BYTES", str(1024 * 1024 * 1024))
+    )  # 1GB
+
+    # /task/<id>/events long-polls wait at most this many seconds
+    STATUS_WAIT_MAX_SECONDS = float(os.getenv("STATUS_WAIT_MAX_SECONDS", "30"))
+    # Event streams are closed after this many seconds; clients reconnect
+    STATUS_STREAM_SECONDS = float(os.getenv("STATUS_STREAM_SECONDS", "300"))
+    # Waiting status requests per server process; each holds a server
+    # thread, so further ones are answered at once
+    STATUS_MAX_WATCHERS = int(os.getenv("STATUS_MAX_WATCHERS", "4"))
+    # Status bodies of finished tasks are kept serialized, up to this many
+    # bytes in total, for this many seconds
+    STATUS_CACHE_MAX_BYTES = int(
+        os.getenv("STATUS_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    )
+    STATUS_CACHE_SECONDS = float(os.getenv("STATUS_CACHE_SECONDS", "300"))
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,71 @@
+"""
+Production gunicorn settings.
+
+The app is preloaded in the master process, so the model artifacts are
+loaded once and shared copy-on-write by every forked worker. Requests are
+served by threads (``gthread``), which is enough since the analysis itself
+runs on the task queue. Nothing started in the master survives the fork,
+so each worker starts its own task queue threads in ``post_fork``; the
+ML runtimes (TensorFlow, MediaPipe) are only initialized on first use
+inside the workers.
+
+Analyses run in dedicated task worker processes
+(``TASK_QUEUE_BACKEND=process``), spawned by each server worker, so they
+run in parallel outside the GIL and never slow down the HTTP threads.
+Each task worker process loads its own models; they are not shared
+copy-on-write with the server workers. The arrays of memory-mapped
+artifacts (``MODEL_MMAP_ENABLED``) are still shared through the page
+cache, but the rest of every model, TensorFlow included, is private to
+each analysis slot (``python -m benchmarks.memory_report`` measures it). ``ANALYSIS_CONCURRENCY`` caps the slots for the whole
+node: it is split evenly over the server workers as the size of their
+task worker pools, unless ``TASK_QUEUE_WORKERS`` is set explicitly. With
+``TASK_QUEUE_BACKEND=thread`` the same slots are threads of the server
+workers, each with its own models, which saves the process overhead but
+shares the GIL with request handling.
+
+Usage:
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+"""
+
+import multiprocessing
+import os
+
+# Read by Config before the app is imported, so both agree on preloading
+os.environ.setdefault("PRELOAD_APP", "true")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '4000')}"
+preload_app = os.environ["PRELOAD_APP"].lower() == "true"
+
+worker_class = "gthread"
+workers = int(
+    os.environ.get("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count(), 4)))
+)
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+# Analyses running at once across all workers; read by Config as the
+# per-worker TASK_QUEUE_WORKERS before the app is imported
+os.environ.setdefault("TASK_QUEUE_BACKEND", "process")
+analysis_concurrency = int(os.environ.get("ANALYSIS_CONCURRENCY", "4"))
+os.environ.setdefault(
+    "TASK_QUEUE_WORKERS", str(max(1, analysis_concurrency // workers))
+)
+
+# Large uploads are streamed to disk within the request
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "300"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "60"))
+
+# OpenCV threads per worker; its default of one per core oversubscribes the
+# host once several workers decode video at the same time
+opencv_threads = int(os.environ.get("OPENCV_THREADS", "1"))
+
+
+def post_fork(server, worker):
+    import cv2
+
+    cv2.setNumThreads(opencv_threads)
+
+    if preload_app:
+        from api.routes import task_queue
+
+        task_queue.start()
+        server.log.info(f"Started task queue in worker {worker.pid}")
@@ -0,0 +1,96 @@
+"""
+Re-score stored interviews with a (new) model, without re-extracting features.
+
+Reads every video whose lexical, prosodic and emotion features are in the
+feature store at the current extractor versions, scores them in large
+batches and writes one JSON line per video with its content hash and the
+model's predictions.
+
+Usage:
+    python rescore.py --model models/model_custom.pkl --output scores.jsonl
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from config import Config
+from services.feature_store import FeatureStore, stage_versions
+from services.model_scorer import ModelScorer
+
+logger = logging.getLogger(__name__)
+
+
+def _to_builtin(value):
+    """Convert NumPy scalars to plain Python values for JSON."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def rescore(store, scorer, output, batch_size):
+    """
+    Score all complete feature sets in the store.
+
+    Args:
+        store (FeatureStore): Feature store to read
+        scorer (ModelScorer): Scorer holding the model to apply
+        output: Text stream receiving JSON lines
+        batch_size (int): Videos scored per ``predict`` call
+
+    Returns:
+        int: Number of videos scored
+    """
+    count = 0
+    batch = []
+
+    def flush():
+        hashes = [content_hash for content_hash, _ in batch]
+        predictions = scorer.predict_many([features for _, features in batch])
+        for content_hash, prediction in zip(hashes, predictions):
+            record = {
+                "content_hash": content_hash,
+                "predictions": {k: _to_builtin(v) for k, v in prediction.items()},
+            }
+            output.write(json.dumps(record) + "\n")
+        batch.clear()
+
+    for content_hash, features in store.iter_complete(stage_versions()):
+        batch.append((content_hash, features))
+        count += 1
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", help="Model file (default: deployed model)")
+    parser.add_argument("--store", default=Config.FEATURE_STORE_PATH)
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    store = FeatureStore(args.store)
+    scorer = ModelScorer(model_path=args.model)
+
+    start = time.perf_counter()
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        count = rescore(store, scorer, output, args.batch_size)
+    finally:
+        if args.output:
+            output.close()
+        store.close()
+
+    logger.info(f"Re-scored {count} interviews in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """A single model input feature."""
+
+    name: str
+    group: str
+    default: float = 0.0
+
+
+class FeatureSchema:
+    """
+    Declared, ordered set of model input features.
+
+    Assembles feature dicts into contiguous NumPy vectors in a fixed column
+    order, filling missing features with their declared defaults and
+    ignoring features the model does not use.
+    """
+
+    def __init__(self, specs, dtype=np.float64):
+        """
+        Initialize the schema.
+
+        Args:
+            specs (list[FeatureSpec]): Features in model column order
+            dtype: NumPy dtype of assembled vectors
+        """
+        self.specs = list(specs)
+        self.dtype = np.dtype(dtype)
+        self.names = [spec.name for spec in self.specs]
+        self.defaults = np.array([spec.default for spec in self.specs], dtype=dtype)
+
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Feature schema contains duplicate names")
+
+    def __len__(self):
+        return len(self.specs)
+
+    def vector(self, features):
+        """
+        Assemble one feature vector.
+
+        Args:
+            features (dict): Feature name to value; extra names are ignored
+
+        Returns:
+            numpy.ndarray: 1-D array of ``len(self)`` values
+        """
+        vector = self.defaults.copy()
+        missing = []
+
+        for i, name in enumerate(self.names):
+            value = features.get(name)
+            if value is None:
+                missing.append(name)
+            else:
+                vector[i] = value
+
+        if missing:
+            logger.warning(f"Using defaults for missing features: {missing}")
+
+        return vector
+
+    def matrix(self, vectors):
+        """
+        Stack feature vectors into a contiguous 2-D array.
+
+        Args:
+            vectors (list[numpy.ndarray]): Vectors built by ``vector``
+
+        Returns:
+            numpy.ndarray: Array of shape ``(len(vectors), len(self))``
+        """
+        return np.ascontiguousarray(np.vstack(vectors), dtype=self.dtype)
+
+    def validate(self, model):
+        """
+        Check that the schema matches the inputs the model was fitted on.
+
+        Uses ``feature_names_in_`` when the model was fitted on a DataFrame,
+        otherwise ``n_features_in_``.
+
+        Args:
+            model: Fitted scikit-learn estimator
+
+        Raises:
+            ValueError: If the model expects different features
+        """
+        expected_names = getattr(model, "feature_names_in_", None)
+        if expected_names is not None:
+            expected_names = [str(name) for name in expected_names]
+            if expected_names == self.names:
+                return
+            if sorted(expected_names) == sorted(self.names):
+                raise ValueError(
+                    "Feature schema lists the model's features in a different "
+                    f"order; the model expects {expected_names}"
+                )
+            raise ValueError(
+                "Feature schema does not match the model: "
+                f"missing {sorted(set(expected_names) - set(self.names))}, "
+                f"unexpected {sorted(set(self.names) - set(expected_names))}"
+            )
+
+        expected_count = getattr(model, "n_features_in_", None)
+        if expected_count is not None and expected_count != len(self):
+            raise ValueError(
+                f"Model expects {expected_count} features, "
+                f"schema declares {len(self)}"
+            )
+
+        if expected_count is None:
+            logger.warning("Model does not declare its inputs; schema not validated")
+
+
+def _specs(group, names, default=0.0):
+    return [FeatureSpec(name, group, default) for name in names]
+
+
+# Model inputs in the column order the model was trained with
+INTERVIEW_FEATURES = FeatureSchema(
+    _specs(
+        "lexical",
+        ["posEmotion", "Cognitive", "Work", "Tentative_Language", "Filler_Words"],
+    )
+    + _specs(
+        "pitch",
+        [
+            "duration",
+            "meanF0Hz",
+            "stdevF0Hz",
+            "HNR",
+            "localJitter",
+            "localabsoluteJitter",
+            "rapJitter",
+            "ppq5Jitter",
+            "ddpJitter",
+            "localShimmer",
+            "localdbShimmer",
+            "apq3Shimmer",
+            "apq5Shimmer",
+            "apq11Shimmer",
+            "ddaShimmer",
+        ],
+    )
+    + _specs(
+        "formant",
+        [
+            "f1_mean",
+            "f2_mean",
+            "f3_mean",
+            "f4_mean",
+            "f1_median",
+            "f2_median",
+            "f3_median",
+            "f4_median",
+        ],
+    )
+    + _specs("voice_quality", ["JitterPCA", "ShimmerPCA"])
+    + _specs(
+        "vocal_tract",
+        ["pF", "fdisp", "avgFormant", "mff", "fitch_vtl", "delta_f", "vtl_delta_f"],
+    )
+    # Frames without a detected face leave the emotion averages undefined
+    + _specs(
+        "emotion",
+        ["angry", "fear", "happy", "sad", "surprise", "neutral"],
+        default=np.nan,
+    )
+)
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Bump a stage's version when its extractor's output changes, so features
+# stored by the old extractor are recomputed instead of reused
+EXTRACTOR_VERSIONS = {
+    "emotion": "1",
+    "prosodic": "1",
+    "lexical": "1",
+}
+
+STAGES = tuple(EXTRACTOR_VERSIONS)
+
+
+def file_content_hash(path, block_size=1024 * 1024):
+    """
+    Hash a file's contents.
+
+    Args:
+        path (str): Path to the file
+        block_size (int): Bytes read at a time
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_versions(lexical_tokenizer=None, lexicon_path=None):
+    """
+    Current extractor version of every stage.
+
+    The lexical version also reflects the configured tokenizer and custom
+    lexicon, since both change the counts.
+
+    Args:
+        lexical_tokenizer (str): Defaults to ``Config.LEXICAL_TOKENIZER``
+        lexicon_path (str): Defaults to ``Config.LEXICON_PATH``
+
+    Returns:
+        dict: Stage name to version string
+    """
+    versions = dict(EXTRACTOR_VERSIONS)
+    versions["lexical"] += f"-{lexical_tokenizer or Config.LEXICAL_TOKENIZER}"
+
+    lexicon_path = lexicon_path or Config.LEXICON_PATH
+    if lexicon_path:
+        versions["lexical"] += f"-{file_content_hash(lexicon_path)[:12]}"
+
+    return versions
+
+
+class FeatureStore:
+    """
+    SQLite store of extracted feature dicts.
+
+    Rows are keyed by video content hash, stage (emotion, prosodic, lexical)
+    and extractor version, so a stage is only reused when it was produced
+    by the extractor currently configured. Several workers and processes
+    can share the database file. Each row also records how long the stage
+    took to extract, i.e. the time saved whenever it is reused.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and if needed create) the store.
+
+        Args:
+            db_path (str): Path to the SQLite database
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS features (
+                content_hash TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                version TEXT NOT NULL,
+                features TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                seconds REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (content_hash, stage, version)
+            )
+            """
+        )
+        # Stores created before extraction times were recorded
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(features)")]
+        if "seconds" not in columns:
+            conn.execute(
+                "ALTER TABLE features ADD COLUMN seconds REAL NOT NULL DEFAULT 0"
+            )
+        conn.commit()
+
+    def _connection(self):
+        """
+        Connection for the current process.
+
+        SQLite connections must not be used across ``fork``, so a store
+        opened before a server forks reconnects in each worker process.
+        """
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, content_hash, versions, with_seconds=False):
+        """
+        Load the stored stages of a video.
+
+        Args:
+            content_hash (str): Video content hash
+            versions (dict): Stage name to required extractor version
+            with_seconds (bool): Also return each stage's extraction time
+
+        Returns:
+            dict: Stage name to feature dict, for the stages found; with
+            ``with_seconds``, a second dict of stage name to seconds
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT stage, version, features, seconds FROM features "
+                "WHERE content_hash = ?",
+                (content_hash,),
+            ).fetchall()
+
+        rows = [row for row in rows if versions.get(row[0]) == row[1]]
+        stages = {stage: json.loads(features) for stage, _, features, _ in rows}
+        if with_seconds:
+            return stages, {stage: seconds for stage, _, _, seconds in rows}
+        return stages
+
+    def put(self, content_hash, stage, version, features, seconds=0.0):
+        """
+        Store the features of one stage.
+
+        Args:
+            content_hash (str): Video content hash
+            stage (str): Stage name
+            version (str): Extractor version that produced the features
+            features (dict): Feature name to value
+            seconds (float): Time the stage took to extract
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO features "
+                "(content_hash, stage, version, features, created_at, seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    content_hash,
+                    stage,
+                    version,
+                    json.dumps(features),
+                    time.time(),
+                    seconds,
+                ),
+            )
+            conn.commit()
+
+    def iter_complete(self, versions):
+        """
+        Iterate over videos that have every stage at the given versions.
+
+        Args:
+            versions (dict): Stage name to extractor version
+
+        Yields:
+            tuple[str, dict]: Content hash and merged feature dict
+        """
+        conditions = " OR ".join(["(stage = ? AND version = ?)"] * len(versions))
+        params = [value for item in versions.items() for value in item]
+
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT content_hash, stage, features FROM features "
+                f"WHERE {conditions} ORDER BY content_hash",
+                params,
+            ).fetchall()
+
+        current_hash, stages = None, {}
+        for content_hash, stage, features in rows + [(None, None, None)]:
+            if content_hash != current_hash:
+                if len(stages) == len(versions):
+                    yield current_hash, merge_stages(stages)
+                current_hash, stages = content_hash, {}
+            if stage is not None:
+                stages[stage] = json.loads(features)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn, self._pid = None, None
+
+
+def merge_stages(stages):
+    """
+    Merge per-stage feature dicts into one.
+
+    Args:
+        stages (dict): Stage name to feature dict
+
+    Returns:
+        dict: Feature name to value
+    """
+    features = {}
+    for stage in ("lexical", "prosodic", "emotion"):
+        features.update(stages.get(stage, {}))
+    return features
@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+from threading import Lock, Thread
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """
+    Collects feature vectors from concurrent tasks into micro-batches.
+
+    ``submit`` returns a future immediately. A single background thread
+    takes the first waiting request, keeps collecting until the batch is
+    full or ``max_wait`` seconds have passed since that request arrived,
+    scores the whole batch with one ``predict_fn`` call and resolves each
+    future with its own row.
+
+    The thread is started on first use in each process, so a batcher
+    created before a server forks its workers is safe to use in them.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=8, max_wait=0.05):
+        """
+        Initialize the batcher.
+
+        Args:
+            predict_fn (callable): Scores a list of feature vectors and
+                returns one prediction per vector, in order
+            max_batch_size (int): Maximum number of requests per batch
+            max_wait (float): Maximum seconds the first request of a batch
+                waits for others to join it
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.queue = None
+        self.thread = None
+        self._pid = None
+        self._start_lock = Lock()
+
+    def _ensure_started(self):
+        """Start the batching thread if this process has none yet."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = Queue()
+            self.thread = Thread(target=self._run, args=(self.queue,), daemon=True)
+            self.thread.start()
+            self._pid = os.getpid()
+
+    def submit(self, features):
+        """
+        Queue a feature vector for scoring.
+
+        Args:
+            features: Feature vector, as accepted by ``predict_fn``
+
+        Returns:
+            Future: Resolves to the model's prediction for ``features``
+        """
+        self._ensure_started()
+        future = Future()
+        self.queue.put((features, future, time.monotonic()))
+        return future
+
+    def _collect(self, queue):
+        """Block for one request, then gather more until full or timed out."""
+        batch = [queue.get()]
+        deadline = batch[0][2] + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(queue.get(timeout=remaining))
+                else:
+                    batch.append(queue.get_nowait())
+            except Empty:
+                break
+
+        return batch
+
+    def _run(self, queue):
+        while True:
+            batch = self._collect(queue)
+            started = time.monotonic()
+
+            metrics.observe("inference.batch_size", len(batch))
+            for _, _, submitted in batch:
+                metrics.observe("inference.queue_delay_seconds", started - submitted)
+
+            try:
+                predictions = self.predict_fn([features for features, _, _ in batch])
+            except Exception as e:
+                logger.exception(f"Batch inference failed for {len(batch)} requests")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            metrics.observe("inference.predict_seconds", time.monotonic() - started)
+            logger.info(
+                f"Scored batch of {len(batch)} in {time.monotonic() - started:.3f}s"
+            )
+
+            for (_, future, _), prediction in zip(batch, predictions):
+                future.set_result(prediction)
@@ -0,0 +1,118 @@
+import logging
+import os
+
+import pandas as pd
+from config import MODEL_PATH, Config
+from services.feature_schema import INTERVIEW_FEATURES
+from services.inference_batcher import InferenceBatcher
+from services.result_interpreter import ResultInterpreter
+from utils.model_artifacts import load_model_artifact
+
+logger = logging.getLogger(__name__)
+
+# Labels of the model's output columns, in order
+PREDICTION_LABELS = [
+    "Excited",
+    "Paused",
+    "EngagingTone",
+    "Calm",
+    "NoFillers",
+]
+
+
+class ModelScorer:
+    """
+    Scores interview feature vectors with the classification model.
+
+    One scorer is shared by all task queue workers: the model is loaded
+    once and concurrent requests are scored together in micro-batches.
+    """
+
+    def __init__(
+        self,
+        max_batch_size=None,
+        max_wait=None,
+        schema=INTERVIEW_FEATURES,
+        model_path=None,
+    ):
+        """
+        Load the model and start the inference batcher.
+
+        Args:
+            max_batch_size (int): Maximum batch size; defaults to
+                ``Config.INFERENCE_MAX_BATCH_SIZE``
+            max_wait (float): Maximum batching delay in seconds; defaults to
+                ``Config.INFERENCE_MAX_WAIT``
+            schema (FeatureSchema): Model input features
+            model_path (str): Model file; defaults to the deployed model
+        """
+        self.schema = schema
+        self.model = self._load_model(
+            model_path or os.path.join(MODEL_PATH, "model_custom.pkl")
+        )
+        self.schema.validate(self.model)
+        # A model fitted on a DataFrame is given its inputs with the same
+        # column names, so scikit-learn checks them on every prediction
+        self.named_inputs = getattr(self.model, "feature_names_in_", None) is not None
+        self.batcher = InferenceBatcher(
+            self._predict_batch,
+            max_batch_size=max_batch_size or Config.INFERENCE_MAX_BATCH_SIZE,
+            max_wait=Config.INFERENCE_MAX_WAIT if max_wait is None else max_wait,
+        )
+        logger.info("Model scorer initialized successfully")
+
+    def _load_model(self, model_path):
+        """
+        Load the machine learning model.
+        """
+        try:
+            logger.info(f"Loading model from: {model_path}")
+            return load_model_artifact(model_path, mmap=Config.MODEL_MMAP_ENABLED)
+        except FileNotFoundError:
+            logger.error(f"Model file not found at: {model_path}")
+            raise
+        except Exception as e:
+            logger.exception(f"Error loading model: {str(e)}")
+            raise
+
+    def _predict_batch(self, vectors):
+        """Score several feature vectors with one ``predict`` call."""
+        inputs = self.schema.matrix(vectors)
+        if self.named_inputs:
+            inputs = pd.DataFrame(inputs, columns=self.schema.names, copy=False)
+        return list(self.model.predict(inputs))
+
+    def predict_many(self, feature_dicts):
+        """
+        Score many feature vectors directly, bypassing the batcher.
+
+        Args:
+            feature_dicts (list[dict]): Feature name to value, one per video
+
+        Returns:
+            list[dict]: Prediction label to model output, one per video
+        """
+        if not feature_dicts:
+            return []
+        vectors = [self.schema.vector(features) for features in feature_dicts]
+        return [
+            dict(zip(PREDICTION_LABELS, prediction))
+            for prediction in self._predict_batch(vectors)
+        ]
+
+    def score(self, features):
+        """
+        Score one feature vector and interpret the prediction.
+
+        Args:
+            features (dict): Feature name to value; see ``FeatureSchema``
+
+        Returns:
+            dict: Dictionary of classification results.
+        """
+        vector = self.schema.vector(features)
+        prediction = self.batcher.submit(vector).result()
+        prediction_dict = dict(zip(PREDICTION_LABELS, prediction))
+
+        result_interpreter = ResultInterpreter()
+        return result_interpreter.interpret(prediction_dict)
@@ -1,14 +1,25 @@
+import functools
 import logging
-import os
-import pickle
+import time
 
 import pandas as pd
 
-from config import MEDIANS_PATH, MODEL_PATH, Config
-from services.result_interpreter import ResultInterpreter
+from config import MEDIANS_PATH, Config
+from services.feature_store import (
+    STAGES,
+    FeatureStore,
+    file_content_hash,
+    merge_stages,
+    stage_versions,
+)
+from utils.audio import seconds_to_bytes, stream_audio
+from utils.cancellation import TaskCancelled, checkpoint
+from utils.demux import demux_media
 from utils.emotion import EmotionDetector
 from utils.lexical_extraction import LexicalFeatureExtractor
 from utils.praat_extraction import PraatFeatureExtractor
+from utils.metrics import metrics
+from utils.progress import TaskProgress
 from utils.speech_to_text import TranscriptionService
 
 # Configure logging
@@ -18,39 +29,40 @@ logger = logging.getLogger(__name__)
 class PredictionService:
     """Service for making predictions on interview videos."""
 
-    def __init__(self):
+    def __init__(self, scorer=None, extract_only=False):
         """
-        Initialize the prediction service by loading the model.
+        Initialize the prediction service.
+
+        Args:
+            scorer (ModelScorer): Scorer shared with other workers; a private
+                one is created (loading the model) if omitted
+            extract_only (bool): Only extract features and leave scoring to
+                the caller; no scorer is loaded and ``predict`` is unusable
         """
         try:
-            self.model = self._load_model()
+            if scorer is None and not extract_only:
+                from services.model_scorer import ModelScorer
+
+                scorer = ModelScorer()
+            self.scorer = scorer
             self.medians = self._load_medians()
             self.transcript_service = TranscriptionService(Config.ASSEMBLYAI_API_KEY)
-            self.lexical_feature_extractor = LexicalFeatureExtractor()
+            self.lexical_feature_extractor = LexicalFeatureExtractor(
+                Config.LEXICON_PATH
+            )
             self.praat_feature_extractor = PraatFeatureExtractor()
             self.emotion_detector = EmotionDetector()
+            self.stage_versions = stage_versions()
+            self.feature_store = (
+                FeatureStore(Config.FEATURE_STORE_PATH)
+                if Config.FEATURE_STORE_ENABLED
+                else None
+            )
             logger.info("Prediction service initialized successfully")
         except Exception as e:
             logger.exception(f"Failed to initialize prediction service: {str(e)}")
             raise
 
-    def _load_model(self):
-        """
-        Load the machine learning model.
-        """
-        model_path = os.path.join(MODEL_PATH, "model_custom.pkl")
-        try:
-            logger.info(f"Loading model from: {model_path}")
-            with open(model_path, "rb") as f:
-                model = pickle.load(f)
-            return model
-        except FileNotFoundError:
-            logger.error(f"Model file not found at: {model_path}")
-            raise
-        except Exception as e:
-            logger.exception(f"Error loading model: {str(e)}")
-            raise
-
     def _load_medians(self):
         """
         Load the median values for classification.
@@ -64,73 +76,185 @@ class PredictionService:
             logger.exception(f"Error loading medians: {str(e)}")
             raise
 
-    def predict(self, video_path):
+    def predict(self, video_path, content_hash=None, cancel=None, progress=None):
         """
         Make a prediction based on a video file.
 
         Args:
             video_path (str): Path to the video file.
+            content_hash (str): Hash of the file's contents, if already known.
+            cancel (CancellationToken): Checked between stages and frames;
+                raises ``TaskCancelled`` once cancelled.
+            progress (TaskProgress): Receives the stages and frames done.
 
         Returns:
             dict: Dictionary of classification results.
         """
         try:
-            logger.info(f"Starting prediction for video: {video_path}")
-
-            # Transcribe video
-            logger.info("Transcribing video...")
-            transcript, audio_file_path = self.transcript_service.transcribe_video_file(
-                video_path
+            features = self.extract_features(
+                video_path, content_hash, cancel, progress
             )
+            checkpoint(cancel)
+
+            logger.info("Making prediction...")
+            result = self.scorer.score(features)
+
+            logger.info("Prediction completed successfully")
+            return result
+
+        except TaskCancelled:
+            logger.info(f"Prediction cancelled for video: {video_path}")
+            raise
 
-            # Extract features
-            logger.info("Extracting lexical features...")
-            lexical_features_dict = self.lexical_feature_extractor.extract_features(
-                transcript
+        except Exception as e:
+            logger.exception(f"Error in prediction process: {str(e)}")
+            raise
+
+    def extract_features(
+        self, video_path, content_hash=None, cancel=None, progress=None
+    ):
+        """
+        Extract the model's input features from a video file.
+
+        Stages already stored for this video at the current extractor
+        versions are reused; every newly extracted stage is stored as soon
+        as it completes. A retried or resumed task therefore continues
+        after its last completed stage instead of starting over.
+
+        Args:
+            video_path (str): Path to the video file.
+            content_hash (str): Hash of the file's contents, if already known.
+            cancel (CancellationToken): Checked between stages and frames.
+            progress (TaskProgress): Receives the stages and frames done.
+
+        Returns:
+            dict: Feature name to value.
+        """
+        logger.info(f"Starting feature extraction for video: {video_path}")
+
+        stages = {}
+        if self.feature_store is not None:
+            content_hash = content_hash or file_content_hash(video_path)
+            stages, seconds = self.feature_store.get(
+                content_hash, self.stage_versions, with_seconds=True
             )
+            if stages:
+                saved = sum(seconds.values())
+                metrics.increment("features.stages_reused", len(stages))
+                metrics.increment("features.seconds_saved", saved)
+                logger.info(
+                    f"Reusing stored {sorted(stages)} features, "
+                    f"saving {saved:.1f}s of extraction"
+                )
+
+        progress = progress if progress is not None else TaskProgress()
+        progress.plan(STAGES)
+        for stage in stages:
+            progress.skip(stage)
 
-            logger.info("Extracting prosodic features...")
-            prosodic_features_dict = self.praat_feature_extractor.extract_features(
-                audio_file_path
+        if len(stages) < len(STAGES):
+            checkpoint(cancel)
+            spool_threshold_bytes = seconds_to_bytes(
+                Config.AUDIO_SPOOL_THRESHOLD_SECONDS
             )
 
-            # Cleanup temporary audio file
-            if os.path.exists(audio_file_path):
-                os.remove(audio_file_path)
+            if "emotion" not in stages:
+                # Read the container once for both audio and sampled frames;
+                # emotions are detected while the frames are being decoded
+                logger.info("Demuxing audio and extracting emotion features...")
+                progress.start_stage("emotion")
+                start = time.perf_counter()
+                audio, emotions_dict = demux_media(
+                    video_path,
+                    functools.partial(
+                        self.emotion_detector.extract_emotions_from_frames,
+                        cancel=cancel,
+                    ),
+                    spool_dir=Config.TEMPORARY_ARTIFACTS_PATH,
+                    spool_threshold_bytes=spool_threshold_bytes,
+                    progress=progress,
+                )
+                self._store_stage(
+                    content_hash, stages, "emotion", emotions_dict, start
+                )
+                progress.finish_stage("emotion")
+            else:
+                logger.info("Extracting audio...")
+                audio = stream_audio(
+                    video_path, Config.TEMPORARY_ARTIFACTS_PATH, spool_threshold_bytes
+                )
 
-            logger.info("Extracting emotion features...")
-            emotions_dict = self.emotion_detector.extract_emotions(video_path)
+            transcription_job = None
+            try:
+                # Submit transcription and run Praat while it is processed
+                if "lexical" not in stages:
+                    logger.info("Submitting audio for transcription...")
+                    lexical_start = time.perf_counter()
+                    transcription_job = self.transcript_service.submit_audio(audio)
 
-            # Combine features
-            lexical_features_dict.update(prosodic_features_dict)
-            lexical_features_dict.update(emotions_dict)
+                if "prosodic" not in stages:
+                    checkpoint(cancel)
+                    logger.info("Extracting prosodic features...")
+                    progress.start_stage("prosodic")
+                    start = time.perf_counter()
+                    self._store_stage(
+                        content_hash,
+                        stages,
+                        "prosodic",
+                        self.praat_feature_extractor.extract_features(
+                            audio.to_sound(Config.TEMPORARY_ARTIFACTS_PATH)
+                        ),
+                        start,
+                    )
+                    progress.finish_stage("prosodic")
 
-            # Create DataFrame for prediction
-            df = pd.DataFrame([lexical_features_dict])
+            except BaseException:
+                # Keep the transcript already paid for, for the retry
+                if transcription_job is not None:
+                    self.transcript_service.abandon(transcription_job)
+                raise
 
-            # Make prediction
-            logger.info("Making prediction...")
-            prediction = self.model.predict(df)
+            finally:
+                # Release the audio buffer
+                audio.close()
 
-            # Map predictions to labels
-            prediction_labels = [
-                "Excited",
-                "Paused",
-                "EngagingTone",
-                "Calm",
-                "NoFillers",
-            ]
-            prediction_dict = dict(zip(prediction_labels, prediction[0]))
+            if transcription_job is not None:
+                logger.info("Waiting for transcript...")
+                progress.start_stage("lexical")
+                try:
+                    transcript = transcription_job.result(
+                        timeout=self.transcript_service.timeout, cancel=cancel
+                    )
+                except BaseException:
+                    self.transcript_service.abandon(transcription_job)
+                    raise
 
-            result_interpreter = ResultInterpreter()
-            result = result_interpreter.interpret(prediction_dict)
+                # Categories added by a custom lexicon are ignored by the
+                # feature schema
+                logger.info("Extracting lexical features...")
+                self._store_stage(
+                    content_hash,
+                    stages,
+                    "lexical",
+                    self.lexical_feature_extractor.extract_features(transcript),
+                    lexical_start,
+                )
+                progress.finish_stage("lexical")
 
-            logger.info("Prediction completed successfully")
-            return result
+        # Combine features
+        return merge_stages(stages)
 
-        except Exception as e:
-            logger.exception(f"Error in prediction process: {str(e)}")
-            raise
+    def _store_stage(self, content_hash, stages, stage, features, start):
+        """Record a completed stage and checkpoint it to the feature store."""
+        stages[stage] = features
+        if self.feature_store is not None:
+            self.feature_store.put(
+                content_hash,
+                stage,
+                self.stage_versions[stage],
+                features,
+                seconds=time.perf_counter() - start,
+            )
 
     def get_tips(self, label):
         """
@@ -0,0 +1,115 @@
+import logging
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from services.feature_schema import INTERVIEW_FEATURES, FeatureSchema, FeatureSpec
+
+SCHEMA = FeatureSchema(
+    [
+        FeatureSpec("b", "group"),
+        FeatureSpec("a", "group", default=-1.0),
+        FeatureSpec("c", "other", default=np.nan),
+    ]
+)
+
+
+def test_vector_follows_declared_order():
+    vector = SCHEMA.vector({"a": 1.0, "b": 2.0, "c": 3.0})
+
+    np.testing.assert_array_equal(vector, [2.0, 1.0, 3.0])
+    assert vector.dtype == np.float64
+
+
+def test_vector_fills_declared_defaults(caplog):
+    with caplog.at_level(logging.WARNING, logger="services.feature_schema"):
+        vector = SCHEMA.vector({"b": 2.0, "c": None})
+
+    np.testing.assert_array_equal(vector, [2.0, -1.0, np.nan])
+    assert "['a', 'c']" in caplog.text
+
+
+def test_vector_ignores_unknown_features():
+    vector = SCHEMA.vector({"a": 1.0, "b": 2.0, "c": 3.0, "extra": 4.0})
+
+    assert len(vector) == len(SCHEMA) == 3
+
+
+def test_vector_does_not_modify_defaults():
+    SCHEMA.vector({"a": 5.0})
+
+    np.testing.assert_array_equal(SCHEMA.defaults, [0.0, -1.0, np.nan])
+
+
+def test_matrix_is_contiguous_and_typed():
+    schema = FeatureSchema(SCHEMA.specs, dtype=np.float32)
+    vectors = [schema.vector({"a": i, "b": i, "c": i}) for i in range(4)]
+    matrix = schema.matrix(vectors)
+
+    assert matrix.shape == (4, 3)
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(matrix[2], [2.0, 2.0, 2.0])
+
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(ValueError, match="duplicate"):
+        FeatureSchema([FeatureSpec("a", "x"), FeatureSpec("a", "y")])
+
+
+def test_validate_accepts_matching_names():
+    SCHEMA.validate(SimpleNamespace(feature_names_in_=np.array(["b", "a", "c"])))
+
+
+def test_validate_rejects_reordered_names():
+    model = SimpleNamespace(feature_names_in_=np.array(["a", "b", "c"]))
+
+    with pytest.raises(ValueError, match="different order"):
+        SCHEMA.validate(model)
+
+
+def test_validate_reports_missing_and_unexpected_names():
+    model = SimpleNamespace(feature_names_in_=np.array(["b", "a", "d"]))
+
+    with pytest.raises(ValueError, match=r"missing \['d'\], unexpected \['c'\]"):
+        SCHEMA.validate(model)
+
+
+def test_validate_checks_feature_count_without_names():
+    SCHEMA.validate(SimpleNamespace(n_features_in_=3))
+
+    with pytest.raises(ValueError, match="expects 4 features"):
+        SCHEMA.validate(SimpleNamespace(n_features_in_=4))
+
+
+def test_validate_warns_when_model_declares_nothing(caplog):
+    with caplog.at_level(logging.WARNING, logger="services.feature_schema"):
+        SCHEMA.validate(object())
+
+    assert "not validated" in caplog.text
+
+
+def test_interview_features_keep_model_column_order():
+    names = INTERVIEW_FEATURES.names
+
+    assert len(INTERVIEW_FEATURES) == 43
+    assert names[:5] == [
+        "posEmotion",
+        "Cognitive",
+        "Work",
+        "Tentative_Language",
+        "Filler_Words",
+    ]
+    assert names[5:7] == ["duration", "meanF0Hz"]
+    assert names[-6:] == ["angry", "fear", "happy", "sad", "surprise", "neutral"]
+
+
+def test_interview_emotions_default_to_nan():
+    vector = INTERVIEW_FEATURES.vector({})
+    groups = [spec.group for spec in INTERVIEW_FEATURES.specs]
+
+    for value, group in zip(vector, groups):
+        if group == "emotion":
+            assert np.isnan(value)
+        else:
+            assert value == 0.0
@@ -0,0 +1,82 @@
+import threading
+
+import numpy as np
+import pytest
+from services.inference_batcher import InferenceBatcher
+
+
+class RecordingModel:
+    """Scores each vector as ten times its sum, recording batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, batch):
+        with self._lock:
+            self.batch_sizes.append(len(batch))
+        return np.vstack(batch).sum(axis=1) * 10
+
+
+def submit_concurrently(batcher, count):
+    start = threading.Barrier(count)
+    futures = [None] * count
+
+    def submit(i):
+        start.wait()
+        futures[i] = batcher.submit(np.array([i, 0.5]))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return futures
+
+
+def test_each_caller_gets_its_own_prediction():
+    model = RecordingModel()
+    batcher = InferenceBatcher(model, max_batch_size=8, max_wait=0.2)
+
+    futures = submit_concurrently(batcher, 40)
+
+    for i, future in enumerate(futures):
+        assert future.result(timeout=5) == pytest.approx((i + 0.5) * 10)
+
+
+def test_concurrent_requests_are_batched_up_to_the_limit():
+    model = RecordingModel()
+    batcher = InferenceBatcher(model, max_batch_size=8, max_wait=0.2)
+
+    for future in submit_concurrently(batcher, 40):
+        future.result(timeout=5)
+
+    assert sum(model.batch_sizes) == 40
+    assert max(model.batch_sizes) == 8
+    assert len(model.batch_sizes) < 40
+
+
+def test_lone_request_is_scored_after_max_wait():
+    model = RecordingModel()
+    batcher = InferenceBatcher(model, max_batch_size=8, max_wait=0.01)
+
+    assert batcher.submit(np.array([1.0])).result(timeout=5) == 10.0
+    assert model.batch_sizes == [1]
+
+
+def test_failed_batch_fails_every_caller_and_batcher_recovers():
+    calls = []
+
+    def predict(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("model unavailable")
+        return [float(vector[0]) for vector in batch]
+
+    batcher = InferenceBatcher(predict, max_batch_size=4, max_wait=0.2)
+    futures = submit_concurrently(batcher, 4)
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            future.result(timeout=5)
+    assert batcher.submit(np.array([3.0])).result(timeout=5) == 3.0
@@ -0,0 +1,117 @@
+import pytest
+from utils.lexicon import Lexicon, load_lexicon_file
+
+
+def plural_stem(word):
+    return word[:-1] if word.endswith("s") else word
+
+
+def count(lexicon, text, stem=plural_stem):
+    words = text.lower().split()
+    return lexicon.count(words, [stem(word) for word in words])
+
+
+def test_words_are_matched_by_stem():
+    lexicon = Lexicon({"Work": ["job", "task"]}, plural_stem)
+
+    assert count(lexicon, "jobs and tasks and a job") == {"Work": 3}
+
+
+def test_word_in_several_categories_counts_for_each():
+    lexicon = Lexicon({"Work": ["deadline"], "Stress": ["deadline"]}, plural_stem)
+
+    assert count(lexicon, "the deadline") == {"Work": 1, "Stress": 1}
+
+
+def test_longest_phrase_wins_and_consumes_its_tokens():
+    lexicon = Lexicon(
+        {
+            "Polite": ["thank you", "thank you very much"],
+            "Other": ["you", "much"],
+        },
+        plural_stem,
+    )
+
+    # "you" and "much" inside the phrase are not counted again
+    assert count(lexicon, "thank you very much you") == {"Polite": 1, "Other": 1}
+    assert count(lexicon, "thank you very") == {"Polite": 1, "Other": 0}
+
+
+def test_incomplete_phrase_falls_back_to_single_words():
+    lexicon = Lexicon(
+        {"Polite": ["thank you kindly"], "Gratitude": ["thank"]}, plural_stem
+    )
+
+    assert count(lexicon, "thank you") == {"Polite": 0, "Gratitude": 1}
+    assert count(lexicon, "thank you kindly") == {"Polite": 1, "Gratitude": 0}
+
+
+def test_phrases_are_matched_by_stem():
+    lexicon = Lexicon({"Work": ["team meeting"]}, plural_stem)
+
+    assert count(lexicon, "two team meetings") == {"Work": 1}
+
+
+def test_prefixes_match_the_surface_form():
+    lexicon = Lexicon({"posEmotion": ["happ*", "glad*"]}, lambda word: "x")
+
+    words = "happy happiness hap gladly sad".split()
+    assert lexicon.count(words, ["x"] * len(words)) == {"posEmotion": 3}
+
+
+def test_prefixes_of_different_lengths():
+    lexicon = Lexicon({"A": ["un*"], "B": ["under*"]}, plural_stem)
+
+    assert count(lexicon, "under unable u") == {"A": 2, "B": 1}
+
+
+def test_word_matching_entry_and_prefix_counts_once_per_category():
+    lexicon = Lexicon({"posEmotion": ["happy", "happ*"]}, plural_stem)
+
+    assert count(lexicon, "happy") == {"posEmotion": 1}
+
+
+def test_entries_are_normalized_and_counted():
+    lexicon = Lexicon(
+        {"A": [" Job ", "", "happ*", "thank you"], "B": ["job"]}, plural_stem
+    )
+
+    assert len(lexicon) == 3
+    assert count(lexicon, "job") == {"A": 1, "B": 1}
+
+
+def test_every_category_is_reported():
+    lexicon = Lexicon({"A": ["job"], "B": ["task"]}, plural_stem)
+
+    assert count(lexicon, "") == {"A": 0, "B": 0}
+
+
+def test_load_liwc_dic(tmp_path):
+    path = tmp_path / "lexicon.dic"
+    path.write_text(
+        "%\n"
+        "1\tWork\n"
+        "2\tposEmotion\n"
+        "%\n"
+        "job\t1\n"
+        "happ*\t2\n"
+        "good job\t1\t2\n"
+        "deadline 1\n"
+    )
+
+    assert load_lexicon_file(str(path)) == {
+        "Work": ["job", "good job", "deadline"],
+        "posEmotion": ["happ*", "good job"],
+    }
+
+
+def test_load_json(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text('{"Work": ["job", "team meeting"]}')
+
+    assert load_lexicon_file(str(path)) == {"Work": ["job", "team meeting"]}
+
+
+def test_unsupported_lexicon_format(tmp_path):
+    with pytest.raises(ValueError):
+        load_lexicon_file(str(tmp_path / "lexicon.csv"))
@@ -0,0 +1,139 @@
+from task_scheduler import CostModel, CostScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def drain(queue):
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def test_shortest_estimate_first():
+    queue = CostScheduler(aging=0.0)
+    queue.put(("long", 100.0, None))
+    queue.put(("short", 10.0, None))
+    queue.put(("medium", 50.0, None))
+
+    assert drain(queue) == ["short", "medium", "long"]
+
+
+def test_equal_estimates_keep_arrival_order():
+    queue = CostScheduler(aging=0.0)
+    for task_id in ("a", "b", "c"):
+        queue.put((task_id, 10.0, None))
+
+    assert drain(queue) == ["a", "b", "c"]
+
+
+def test_waiting_task_is_overtaken_only_until_it_has_aged():
+    clock = FakeClock()
+    queue = CostScheduler(aging=1.0, clock=clock)
+    queue.put(("long", 100.0, None))
+
+    # Arrives 50s later and is still 40s cheaper after aging
+    clock.now = 50.0
+    queue.put(("short", 10.0, None))
+    assert queue.get_nowait() == "short"
+
+    # Arrives once the long task has waited more than the cost difference
+    clock.now = 95.0
+    queue.put(("late short", 10.0, None))
+    assert drain(queue) == ["long", "late short"]
+
+
+def test_aging_prevents_starvation():
+    clock = FakeClock()
+    queue = CostScheduler(aging=1.0, clock=clock)
+    queue.put(("long", 100.0, None))
+
+    served = []
+    for second in range(200):
+        clock.now = float(second)
+        queue.put((f"short-{second}", 10.0, None))
+        served.append(queue.get_nowait())
+        if served[-1] == "long":
+            break
+
+    assert served[-1] == "long"
+    # Overtaken for at most (cost difference / aging) seconds
+    assert len(served) <= 92
+
+
+def test_fair_share_alternates_between_clients():
+    queue = CostScheduler(aging=0.0, fair_share=True)
+    for i in range(4):
+        queue.put((f"a{i}", 10.0, "alice"))
+    queue.put(("b0", 10.0, "bob"))
+    queue.put(("b1", 10.0, "bob"))
+
+    assert drain(queue) == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+
+def test_fair_share_serves_cheap_client_more_often():
+    queue = CostScheduler(aging=0.0, fair_share=True)
+    queue.put(("a-long", 30.0, "alice"))
+    queue.put(("a-next", 30.0, "alice"))
+    for i in range(3):
+        queue.put((f"b{i}", 10.0, "bob"))
+
+    # Bob's three 10s tasks cost as much as one of Alice's
+    assert drain(queue) == ["a-long", "b0", "b1", "b2", "a-next"]
+
+
+def test_returning_client_gets_no_credit_for_idle_time():
+    queue = CostScheduler(aging=0.0, fair_share=True)
+    for i in range(8):
+        queue.put((f"a{i}", 10.0, "alice"))
+    assert [queue.get_nowait() for _ in range(4)] == ["a0", "a1", "a2", "a3"]
+
+    for i in range(3):
+        queue.put((f"b{i}", 10.0, "bob"))
+
+    # Bob starts level with Alice instead of running all of his tasks first
+    assert drain(queue) == ["a4", "b0", "a5", "b1", "a6", "b2", "a7"]
+
+
+def test_without_fair_share_clients_are_ignored():
+    queue = CostScheduler(aging=0.0)
+    queue.put(("a0", 10.0, "alice"))
+    queue.put(("a1", 10.0, "alice"))
+    queue.put(("b0", 10.0, "bob"))
+
+    assert drain(queue) == ["a0", "a1", "b0"]
+
+
+def test_remove_skips_task_and_settles_accounting():
+    queue = CostScheduler(aging=0.0)
+    queue.put(("a", 10.0, None))
+    queue.put(("b", 20.0, None))
+    queue.put(("c", 30.0, None))
+
+    assert queue.remove("a")
+    assert not queue.remove("a")
+    assert not queue.remove("unknown")
+    assert queue.qsize() == 2
+    assert queue.queued_seconds() == 50.0
+
+    assert drain(queue) == ["b", "c"]
+    assert queue.queued_seconds() == 0.0
+    queue.task_done()
+    queue.task_done()
+    assert queue.unfinished_tasks == 0
+
+
+def test_cost_model_follows_observed_rate():
+    model = CostModel(initial_rate=1.0, alpha=0.5)
+    assert model.estimate(10.0) == 10.0
+
+    model.observe(10.0, 30.0)
+    assert model.estimate(10.0) == 20.0
+
+    # Tasks without a cost do not move the estimate
+    model.observe(0, 100.0)
+    model.observe(None, 100.0)
+    assert model.estimate(10.0) == 20.0
@@ -0,0 +1,250 @@
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+
+import pytest
+from task_store import (
+    JournalTaskStore,
+    JsonTaskStore,
+    SqliteTaskStore,
+    create_task_store,
+    dedup_key,
+)
+
+BACKENDS = ["json", "sqlite", "journal"]
+
+
+def open_store(backend, path):
+    return create_task_store(backend, str(path))
+
+
+def make_task(task_id, status="pending", created_at=1.0, **fields):
+    return {
+        "id": task_id,
+        "status": status,
+        "created_at": created_at,
+        "content_hash": None,
+        "options": None,
+        **fields,
+    }
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
+
+def test_get_returns_latest_state(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    store.save(make_task("a"))
+    store.save(make_task("a", "processing"))
+    store.save(make_task("a", "completed", result={"score": 0.5}))
+
+    assert store.get("a")["status"] == "completed"
+    assert store.get("a")["result"] == {"score": 0.5}
+    assert store.get("unknown") is None
+
+
+def test_reopened_store_replays_saved_states(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    store.save(make_task("done", "processing"))
+    store.save(make_task("done", "completed", result={"score": 1}))
+    store.save(make_task("running", "processing"))
+    store.save(make_task("queued"))
+    store.close()
+
+    reopened = open_store(backend, tmp_path)
+    assert reopened.get("done") == make_task("done", "completed", result={"score": 1})
+    unfinished = {task["id"]: task["status"] for task in reopened.iter_unfinished()}
+    assert unfinished == {"running": "processing", "queued": "pending"}
+
+
+def test_second_store_sees_saves_of_the_first(backend, tmp_path):
+    # As another server process sharing the directory would
+    writer = open_store(backend, tmp_path)
+    reader = open_store(backend, tmp_path)
+
+    writer.save(make_task("a"))
+    assert reader.get("a")["status"] == "pending"
+    writer.save(make_task("a", "completed"))
+    assert reader.get("a")["status"] == "completed"
+
+
+def test_evicted_tasks_stay_deleted_after_reopening(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    store.save(make_task("finished", "completed"))
+    store.save(make_task("running", "processing"))
+
+    expired, evicted, count, _ = store.evict(
+        ttl=-1, max_entries=100, max_bytes=2**30, keep=["running"]
+    )
+    assert (expired, evicted, count) == (1, 0, 1)
+    store.close()
+
+    reopened = open_store(backend, tmp_path)
+    assert reopened.get("finished") is None
+    assert reopened.get("running")["status"] == "processing"
+
+
+def test_evict_enforces_entry_bound_oldest_first(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    for task_id in ("old", "middle", "new"):
+        store.save(make_task(task_id, "completed"))
+        # File modification times may have coarse resolution
+        time.sleep(0.02)
+
+    expired, evicted, count, _ = store.evict(
+        ttl=3600, max_entries=2, max_bytes=2**30
+    )
+    assert (expired, evicted, count) == (0, 1, 2)
+    assert store.get("old") is None
+    assert store.get("new") is not None
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "journal"])
+def test_find_returns_latest_reusable_duplicate(backend, tmp_path):
+    store = open_store(backend, tmp_path)
+    options = {"language": "en"}
+    for task_id, status, created_at in [
+        ("first", "completed", 1.0),
+        ("second", "processing", 2.0),
+        ("failed", "failed", 3.0),
+    ]:
+        store.save(
+            make_task(task_id, status, created_at, content_hash="h", options=options)
+        )
+    store.save(make_task("other", "completed", 4.0, content_hash="h"))
+
+    assert store.find(dedup_key("h", options))["id"] == "second"
+    assert store.find(dedup_key("h", {}))["id"] == "other"
+    assert store.find(dedup_key("missing", options)) is None
+
+
+def test_dedup_key_ignores_option_order():
+    assert dedup_key("h", {"a": 1, "b": 2}) == dedup_key("h", {"b": 2, "a": 1})
+    assert dedup_key("h", None) == dedup_key("h", {})
+    assert dedup_key(None, {"a": 1}) is None
+
+
+def test_json_store_ignores_files_left_by_interrupted_writes(tmp_path):
+    store = JsonTaskStore(str(tmp_path))
+    store.save(make_task("a", "processing"))
+    (tmp_path / "a.json.0123.tmp").write_text('{"id": "a", "sta')
+
+    assert store.get("a")["status"] == "processing"
+    assert [task["id"] for task in store.iter_unfinished()] == ["a"]
+
+
+def test_journal_skips_torn_record_and_keeps_appending(tmp_path, caplog):
+    store = JournalTaskStore(str(tmp_path))
+    store.save(make_task("a", "processing"))
+    store.close()
+
+    # A process killed in the middle of an append
+    with open(tmp_path / JournalTaskStore.JOURNAL, "ab") as f:
+        f.write(b'{"updated_at": 1, "task": {"id": "a", "sta')
+
+    store = JournalTaskStore(str(tmp_path))
+    assert store.get("a")["status"] == "processing"
+    store.save(make_task("b"))
+    store.close()
+
+    with caplog.at_level(logging.WARNING, logger="task_store"):
+        reopened = JournalTaskStore(str(tmp_path))
+        assert reopened.get("a")["status"] == "processing"
+        assert reopened.get("b")["status"] == "pending"
+    assert "unreadable task journal record" in caplog.text
+
+
+def test_journal_compaction_keeps_live_states(tmp_path):
+    store = JournalTaskStore(str(tmp_path))
+    for status in ("pending", "processing", "completed"):
+        store.save(make_task("a", status))
+    store.save(make_task("b", "processing"))
+    store.compact()
+
+    assert os.path.getsize(tmp_path / JournalTaskStore.JOURNAL) == 0
+    snapshot = (tmp_path / JournalTaskStore.SNAPSHOT).read_bytes().splitlines()
+    # Header line plus one record per live task
+    assert len(snapshot) == 3
+    assert "compacted_at" in json.loads(snapshot[0])
+
+    store.save(make_task("b", "completed"))
+    store.close()
+
+    reopened = JournalTaskStore(str(tmp_path))
+    assert reopened.get("a")["status"] == "completed"
+    assert reopened.get("b")["status"] == "completed"
+    assert list(reopened.iter_unfinished()) == []
+
+
+def test_journal_reader_follows_compaction_by_another_store(tmp_path):
+    writer = JournalTaskStore(str(tmp_path))
+    reader = JournalTaskStore(str(tmp_path))
+    writer.save(make_task("a", "processing"))
+    assert reader.get("a")["status"] == "processing"
+
+    writer.compact()
+    writer.save(make_task("a", "completed"))
+    writer.save(make_task("b"))
+
+    assert reader.get("a")["status"] == "completed"
+    assert reader.get("b")["status"] == "pending"
+
+
+def test_journal_evict_compacts_once_journal_has_grown(tmp_path):
+    store = JournalTaskStore(str(tmp_path), compact_ratio=2)
+    for _ in range(5):
+        store.save(make_task("a", "processing"))
+    store.evict(ttl=3600, max_entries=100, max_bytes=2**30)
+
+    assert os.path.getsize(tmp_path / JournalTaskStore.JOURNAL) == 0
+    assert store.get("a")["status"] == "processing"
+
+
+@pytest.mark.parametrize(
+    "name, store_class",
+    [
+        ("json", JsonTaskStore),
+        ("sqlite", SqliteTaskStore),
+        ("journal", JournalTaskStore),
+    ],
+)
+def test_backend_names(name, store_class, tmp_path):
+    assert isinstance(open_store(name, tmp_path), store_class)
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_store("redis", tmp_path)
+
+
+def _save_until_killed(backend, path):
+    store = open_store(backend, path)
+    step = 0
+    while True:
+        step += 1
+        store.save(make_task(f"task-{step % 20}", "processing", step=step))
+
+
+def test_store_recovers_after_writer_is_killed(backend, tmp_path):
+    context = multiprocessing.get_context("fork")
+    writer = context.Process(target=_save_until_killed, args=(backend, tmp_path))
+    writer.start()
+    time.sleep(0.5)
+    os.kill(writer.pid, signal.SIGKILL)
+    writer.join()
+
+    store = open_store(backend, tmp_path)
+    tasks = [store.get(f"task-{i}") for i in range(20)]
+    assert all(task is not None for task in tasks)
+    assert {task["status"] for task in tasks} == {"processing"}
+
+    # Every task holds a state that was saved for it, and the store
+    # keeps accepting writes
+    assert all(task["step"] % 20 == int(task["id"][5:]) for task in tasks)
+    store.save(make_task("task-0", "completed"))
+    assert open_store(backend, tmp_path).get("task-0")["status"] == "completed"
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+from nltk.tokenize import word_tokenize
+from utils.tokenizer import fast_word_tokenize
+
+CORPUS = os.path.join(
+    os.path.dirname(__file__), os.pardir, "benchmarks", "data", "sample_transcripts.txt"
+)
+
+# Single sentences, so NLTK's Punkt sentence splitting does not change the
+# result and the Treebank tokenizer alone is the reference
+SENTENCES = [
+    "I don't know, it's fine.",
+    "I'm sure they'll say we're done.",
+    "It's the team's well-known plan.",
+    'Dr. Smith said "hello" to me.',
+    "Mr. and Mrs. Jones went out.",
+    "The U.S.A. is big -- right?",
+    "We cannot gonna do C++ and 3.5 or 1,000 things...",
+    "(well) it's 10:30 now!",
+    "Yes; no: maybe?",
+    "I gotta say, lemme think.",
+]
+
+# Accepted differences: the fast tokenizer splits dotted names like domain
+# names, and splits every clitic of a stacked contraction where the
+# Treebank tokenizer keeps the first one attached. Neither affects the
+# lexical features of interview transcripts. Listed so that a change in
+# either tokenizer is noticed.
+KNOWN_DIFFERENCES = {
+    "Go to b.com today.": (
+        ["Go", "to", "b.com", "today", "."],
+        ["Go", "to", "b", ".", "com", "today", "."],
+    ),
+    "I'd've gone there.": (
+        ["I'd", "'ve", "gone", "there", "."],
+        ["I", "'d", "'ve", "gone", "there", "."],
+    ),
+    "She wouldn't've.": (
+        ["She", "wouldn't", "'ve", "."],
+        ["She", "would", "n't", "'ve", "."],
+    ),
+}
+
+
+def punkt_available():
+    try:
+        word_tokenize("Punkt. Available.")
+    except LookupError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("text", SENTENCES)
+def test_matches_nltk_on_single_sentences(text):
+    assert fast_word_tokenize(text) == word_tokenize(text, preserve_line=True)
+
+
+@pytest.mark.parametrize("text", sorted(KNOWN_DIFFERENCES))
+def test_known_differences_from_nltk(text):
+    nltk_tokens, fast_tokens = KNOWN_DIFFERENCES[text]
+
+    assert word_tokenize(text, preserve_line=True) == nltk_tokens
+    assert fast_word_tokenize(text) == fast_tokens
+
+
+def test_sentence_internal_periods_are_split():
+    assert fast_word_tokenize("I left. Then I came back.") == [
+        "I",
+        "left",
+        ".",
+        "Then",
+        "I",
+        "came",
+        "back",
+        ".",
+    ]
+
+
+@pytest.mark.skipif(not punkt_available(), reason="NLTK punkt_tab data not installed")
+def test_matches_nltk_on_sample_transcripts():
+    with open(CORPUS, "r", encoding="utf-8") as f:
+        transcripts = [block.strip() for block in f.read().split("\n\n")]
+
+    for transcript in filter(None, transcripts):
+        assert fast_word_tokenize(transcript) == word_tokenize(transcript)
@@ -2,18 +2,21 @@
 Utility modules for the interview analysis microservice.
 
 This package contains utility modules for various types of feature extraction:
+- Streaming audio extraction to analysis-ready PCM
 - Speech to text transcription
 - Emotion detection from video
 - Lexical feature extraction from text
 - Prosodic feature extraction using Praat
 """
 
+from .audio import PCMAudio
 from .emotion import EmotionDetector
 from .lexical_extraction import LexicalFeatureExtractor
 from .praat_extraction import PraatFeatureExtractor
 from .speech_to_text import TranscriptionService
 
 __all__ = [
+    "PCMAudio",
     "TranscriptionService",
     "EmotionDetector",
     "LexicalFeatureExtractor",
@@ -0,0 +1,410 @@
+import logging
+import os
+import subprocess
+import tempfile
+import uuid
+import wave
+
+import numpy as np
+import parselmouth
+from pydub import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+# Analysis-ready audio format shared by transcription and Praat
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit signed PCM
+CHUNK_BYTES = 64 * 1024
+
+# Upload encodings: file extension and ffmpeg codec options
+UPLOAD_CODECS = {
+    "flac": (".flac", ["-c:a", "flac", "-compression_level", "5"]),
+    "opus": (".ogg", ["-c:a", "libopus", "-b:a", "32k", "-application", "voip"]),
+    "wav": (".wav", None),
+}
+
+
+class PCMAudio:
+    """
+    Mono 16-bit PCM audio held in a NumPy buffer.
+
+    The samples either live in memory or, for long recordings, in a
+    memory-mapped spool file that is removed by ``close``.
+    """
+
+    def __init__(self, samples, sample_rate=SAMPLE_RATE, spool_path=None):
+        """
+        Initialize the audio container.
+
+        Args:
+            samples (numpy.ndarray): int16 samples
+            sample_rate (int): Sampling frequency in Hz
+            spool_path (str): Backing file of a memory-mapped buffer, if any
+        """
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.spool_path = spool_path
+
+    @property
+    def duration(self):
+        """Duration of the audio in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def nbytes(self):
+        """Size of the raw PCM data in bytes."""
+        return len(self.samples) * SAMPLE_WIDTH
+
+    def slice(self, start, end):
+        """
+        Return a view of the samples between two sample indices.
+
+        Args:
+            start (int): First sample index
+            end (int): Sample index after the last sample
+
+        Returns:
+            PCMAudio: Audio sharing this buffer (closing it is a no-op)
+        """
+        return PCMAudio(self.samples[start:end], self.sample_rate)
+
+    def to_sound(self, spool_dir):
+        """
+        Build a parselmouth Sound from the samples.
+
+        Praat holds its samples as float64, four times the size of the
+        int16 buffer. Scaling the buffer in NumPy and handing the result to
+        ``parselmouth.Sound`` would hold that copy twice, so the samples are
+        written block by block to a temporary WAV file that Praat reads
+        into the only float64 copy instead.
+
+        Args:
+            spool_dir (str): Directory for the temporary WAV file
+
+        Returns:
+            parselmouth.Sound: Sound object scaled to [-1, 1)
+        """
+        os.makedirs(spool_dir, exist_ok=True)
+        path = os.path.join(spool_dir, f"praat_{uuid.uuid4().hex}.wav")
+        try:
+            return parselmouth.Sound(self.write_wav(path))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def write_wav(self, path):
+        """
+        Write the audio to a WAV file block by block.
+
+        Args:
+            path (str): Destination path
+
+        Returns:
+            str: The path written to
+        """
+        block = CHUNK_BYTES // SAMPLE_WIDTH
+        with wave.open(path, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(SAMPLE_WIDTH)
+            wav_file.setframerate(self.sample_rate)
+            for start in range(0, len(self.samples), block):
+                wav_file.writeframes(self.samples[start : start + block].tobytes())
+        return path
+
+    def close(self):
+        """Release the sample buffer and remove the spool file, if any."""
+        self.samples = np.zeros(0, dtype=np.int16)
+        if self.spool_path and os.path.exists(self.spool_path):
+            try:
+                os.remove(self.spool_path)
+            except OSError as e:
+                logger.error(f"Failed to remove audio spool {self.spool_path}: {e}")
+        self.spool_path = None
+
+
+class PCMBuffer:
+    """
+    Accumulates a raw PCM byte stream into a ``PCMAudio``.
+
+    Data is kept in memory until it exceeds ``spool_threshold_bytes``, after
+    which it is appended to a spool file and memory-mapped on ``finish`` so
+    resident memory stays bounded for long recordings.
+    """
+
+    def __init__(self, spool_dir, spool_threshold_bytes, sample_rate=SAMPLE_RATE):
+        """
+        Initialize the buffer.
+
+        Args:
+            spool_dir (str): Directory for the spool file
+            spool_threshold_bytes (int): In-memory size limit before spooling
+            sample_rate (int): Sampling frequency of the incoming stream
+        """
+        self.spool_dir = spool_dir
+        self.spool_threshold_bytes = spool_threshold_bytes
+        self.sample_rate = sample_rate
+        self._memory = bytearray()
+        self._spool_file = None
+        self._spool_path = None
+        self._size = 0
+
+    def write(self, data):
+        """
+        Append a chunk of raw little-endian int16 PCM.
+
+        Args:
+            data (bytes): PCM bytes
+        """
+        if self._spool_file is None and (
+            len(self._memory) + len(data) > self.spool_threshold_bytes
+        ):
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._spool_path = os.path.join(
+                self.spool_dir, f"pcm_{uuid.uuid4().hex}.raw"
+            )
+            self._spool_file = open(self._spool_path, "wb")
+            self._spool_file.write(self._memory)
+            self._memory = bytearray()
+
+        if self._spool_file is not None:
+            self._spool_file.write(data)
+        else:
+            self._memory.extend(data)
+        self._size += len(data)
+
+    def finish(self):
+        """
+        Finalize the buffer.
+
+        Returns:
+            PCMAudio: Audio backed by memory or by the memory-mapped spool
+        """
+        # Drop a trailing partial sample if the stream ended mid-sample
+        usable = self._size - (self._size % SAMPLE_WIDTH)
+
+        if self._spool_file is None:
+            del self._memory[usable:]
+            samples = np.frombuffer(self._memory, dtype="<i2")
+            return PCMAudio(samples, self.sample_rate)
+
+        self._spool_file.close()
+        if usable == 0:
+            os.remove(self._spool_path)
+            return PCMAudio(np.zeros(0, dtype=np.int16), self.sample_rate)
+
+        samples = np.memmap(
+            self._spool_path, dtype="<i2", mode="r", shape=(usable // SAMPLE_WIDTH,)
+        )
+        return PCMAudio(samples, self.sample_rate, spool_path=self._spool_path)
+
+    def abort(self):
+        """Discard buffered data and remove the spool file."""
+        self._memory = bytearray()
+        if self._spool_file is not None:
+            self._spool_file.close()
+            if os.path.exists(self._spool_path):
+                os.remove(self._spool_path)
+            self._spool_file = None
+
+
+def find_silence_splits(
+    audio, target_chunk_seconds, search_window_seconds=5.0, frame_seconds=0.03
+):
+    """
+    Choose split points close to every ``target_chunk_seconds`` of audio.
+
+    Around each target boundary the quietest frame (lowest RMS energy)
+    within ``search_window_seconds`` is chosen, so chunks end in pauses
+    rather than mid-word. Only the search windows are scanned, which keeps
+    this cheap for memory-mapped hour-long recordings.
+
+    Args:
+        audio (PCMAudio): Audio to split
+        target_chunk_seconds (float): Desired chunk length
+        search_window_seconds (float): Maximum distance from the target boundary
+        frame_seconds (float): Length of the frames energy is measured over
+
+    Returns:
+        list[int]: Sorted sample indices to split at
+    """
+    total = len(audio.samples)
+    chunk = int(target_chunk_seconds * audio.sample_rate)
+    window = int(search_window_seconds * audio.sample_rate)
+    frame = max(1, int(frame_seconds * audio.sample_rate))
+
+    splits = []
+    target = chunk
+    while target < total - chunk // 2:
+        start = max(splits[-1] + frame if splits else 0, target - window)
+        end = min(total, target + window)
+        n_frames = (end - start) // frame
+
+        if n_frames == 0:
+            split = target
+        else:
+            frames = np.asarray(
+                audio.samples[start : start + n_frames * frame], dtype=np.float32
+            ).reshape(n_frames, frame)
+            energy = np.mean(frames * frames, axis=1)
+            split = start + int(np.argmin(energy)) * frame + frame // 2
+
+        splits.append(split)
+        target = split + chunk
+
+    return splits
+
+
+def seconds_to_bytes(seconds, sample_rate=SAMPLE_RATE):
+    """Size in bytes of ``seconds`` of mono 16-bit PCM."""
+    return int(seconds * sample_rate) * SAMPLE_WIDTH
+
+
+def ffmpeg_binary():
+    """Return the ffmpeg executable pydub is configured to use."""
+    return AudioSegment.converter
+
+
+def ffmpeg_stderr():
+    """
+    Temporary file to pass as an ffmpeg process's stderr.
+
+    Unlike a pipe it never fills up, so ffmpeg cannot block on a pipe
+    nobody reads while its output is being consumed.
+    """
+    return tempfile.TemporaryFile()
+
+
+def read_ffmpeg_stderr(stderr):
+    """Text ffmpeg wrote to a file from ``ffmpeg_stderr``."""
+    stderr.seek(0)
+    return stderr.read().decode(errors="replace")
+
+
+def pcm_output_args(sample_rate=SAMPLE_RATE):
+    """ffmpeg output options producing mono 16-bit little-endian PCM."""
+    return [
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-acodec",
+        "pcm_s16le",
+        "-f",
+        "s16le",
+    ]
+
+
+def encode_audio(audio, path_without_extension, codec="flac"):
+    """
+    Encode audio for upload, piping the PCM buffer through ffmpeg.
+
+    Args:
+        audio (PCMAudio): Audio to encode
+        path_without_extension (str): Destination path; the codec's file
+            extension is appended
+        codec (str): One of ``UPLOAD_CODECS``
+
+    Returns:
+        str: Path of the encoded file
+    """
+    if codec not in UPLOAD_CODECS:
+        raise ValueError(
+            f"Unsupported upload codec: {codec}. "
+            f"Supported codecs: {', '.join(UPLOAD_CODECS)}"
+        )
+
+    extension, codec_args = UPLOAD_CODECS[codec]
+    path = path_without_extension + extension
+
+    if codec_args is None:
+        return audio.write_wav(path)
+
+    command = (
+        [ffmpeg_binary(), "-nostdin", "-v", "error", "-y"]
+        + ["-f", "s16le", "-ar", str(audio.sample_rate), "-ac", "1", "-i", "pipe:0"]
+        + codec_args
+        + [path]
+    )
+    stderr = ffmpeg_stderr()
+    try:
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=stderr)
+    except BaseException:
+        stderr.close()
+        raise
+
+    try:
+        block = CHUNK_BYTES // SAMPLE_WIDTH
+        for start in range(0, len(audio.samples), block):
+            process.stdin.write(audio.samples[start : start + block].tobytes())
+        process.stdin.close()
+
+        if process.wait() != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to encode audio: {read_ffmpeg_stderr(stderr)}"
+            )
+        return path
+
+    except BaseException:
+        process.kill()
+        process.wait()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    finally:
+        stderr.close()
+
+
+def stream_audio(video_path, spool_dir, spool_threshold_bytes, sample_rate=SAMPLE_RATE):
+    """
+    Decode the audio track of a media file straight into a PCM buffer.
+
+    ffmpeg decodes, downmixes and resamples in a single pass and pipes the
+    samples to us; nothing is written to disk unless the recording is long
+    enough to be spooled.
+
+    Args:
+        video_path (str): Path to the media file
+        spool_dir (str): Directory for spool files of long recordings
+        spool_threshold_bytes (int): In-memory size limit before spooling
+        sample_rate (int): Target sampling frequency
+
+    Returns:
+        PCMAudio: Decoded audio
+    """
+    command = (
+        [ffmpeg_binary(), "-nostdin", "-v", "error", "-i", video_path, "-vn"]
+        + pcm_output_args(sample_rate)
+        + ["pipe:1"]
+    )
+    stderr = ffmpeg_stderr()
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+    except BaseException:
+        stderr.close()
+        raise
+    buffer = PCMBuffer(spool_dir, spool_threshold_bytes, sample_rate)
+
+    try:
+        while True:
+            chunk = process.stdout.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            buffer.write(chunk)
+
+        if process.wait() != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to decode audio: {read_ffmpeg_stderr(stderr)}"
+            )
+
+        return buffer.finish()
+
+    except BaseException:
+        process.kill()
+        process.wait()
+        buffer.abort()
+        raise
+
+    finally:
+        process.stdout.close()
+        stderr.close()
@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import subprocess
+import threading
+
+import numpy as np
+from pydub.utils import get_prober_name
+
+from utils.audio import (
+    CHUNK_BYTES,
+    SAMPLE_RATE,
+    PCMBuffer,
+    ffmpeg_binary,
+    ffmpeg_stderr,
+    pcm_output_args,
+    read_ffmpeg_stderr,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def probe_media(video_path):
+    """
+    Read stream properties from the container header with ffprobe.
+
+    Args:
+        video_path (str): Path to the media file
+
+    Returns:
+        dict: width, height, fps, duration and has_audio
+    """
+    command = [
+        get_prober_name(),
+        "-v",
+        "error",
+        "-show_entries",
+        "stream=codec_type,width,height,avg_frame_rate,r_frame_rate:format=duration",
+        "-of",
+        "json",
+        video_path,
+    ]
+    output = subprocess.run(command, capture_output=True, check=True).stdout
+    info = json.loads(output)
+
+    streams = info.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise ValueError(f"No video stream found in: {video_path}")
+
+    return {
+        "width": int(video["width"]),
+        "height": int(video["height"]),
+        "fps": _parse_rate(video.get("avg_frame_rate"))
+        or _parse_rate(video.get("r_frame_rate")),
+        "duration": float(info.get("format", {}).get("duration") or 0),
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+    }
+
+
+def _parse_rate(rate):
+    """Parse an ffprobe rational such as '30000/1001' into a float."""
+    if not rate or rate == "0/0":
+        return 0.0
+    numerator, _, denominator = rate.partition("/")
+    return float(numerator) / float(denominator or 1)
+
+
+def demux_media(
+    video_path,
+    frames_consumer,
+    spool_dir,
+    spool_threshold_bytes,
+    frame_sample_rate=1,
+    sample_rate=SAMPLE_RATE,
+    progress=None,
+):
+    """
+    Read a video container once, emitting both audio PCM and sampled frames.
+
+    A single ffmpeg process decodes the file and writes 16kHz mono PCM to
+    one pipe and every ``fps / frame_sample_rate``-th frame as raw BGR to
+    another. Audio is drained into a ``PCMBuffer`` on a background thread
+    while the sampled frames are handed to ``frames_consumer`` as they are
+    decoded, so neither stream is ever fully materialized in memory.
+
+    Args:
+        video_path (str): Path to the video file
+        frames_consumer (callable): Receives an iterator of BGR frames
+            (numpy.ndarray) and returns a result
+        spool_dir (str): Directory for spool files of long recordings
+        spool_threshold_bytes (int): In-memory audio size limit before spooling
+        frame_sample_rate (int): Number of frames to sample per second
+        sample_rate (int): Target audio sampling frequency
+        progress (TaskProgress): Counts the sampled frames handed out
+
+    Returns:
+        tuple[PCMAudio, Any]: [Extracted audio, result of frames_consumer]
+    """
+    media = probe_media(video_path)
+    if not media["has_audio"]:
+        raise ValueError(f"No audio stream found in: {video_path}")
+
+    # Same frame selection as sampling with cv2: every n-th decoded frame
+    frame_interval = max(1, int(media["fps"] / frame_sample_rate))
+    frame_size = media["width"] * media["height"] * 3
+    if progress is not None:
+        progress.set_frames_total(
+            max(1, int(media["duration"] * media["fps"] / frame_interval))
+        )
+
+    frame_read_fd, frame_write_fd = os.pipe()
+    # Frames keep the coded orientation ffprobe reports, as cv2 read them;
+    # auto-rotating portrait phone videos would swap width and height
+    command = (
+        [ffmpeg_binary(), "-nostdin", "-v", "error", "-noautorotate"]
+        + ["-i", video_path]
+        + ["-map", "0:a:0"]
+        + pcm_output_args(sample_rate)
+        + ["pipe:1"]
+        + ["-map", "0:v:0", "-vf", f"select=not(mod(n\\,{frame_interval}))"]
+        + ["-vsync", "vfr", "-pix_fmt", "bgr24", "-f", "rawvideo"]
+        + [f"pipe:{frame_write_fd}"]
+    )
+
+    stderr = ffmpeg_stderr()
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            pass_fds=(frame_write_fd,),
+        )
+    except BaseException:
+        os.close(frame_read_fd)
+        stderr.close()
+        raise
+    finally:
+        # Only the child keeps the write end open so we see EOF when it exits
+        os.close(frame_write_fd)
+
+    buffer = PCMBuffer(spool_dir, spool_threshold_bytes, sample_rate)
+    audio_errors = []
+
+    def drain_audio():
+        try:
+            while True:
+                chunk = process.stdout.read(CHUNK_BYTES)
+                if not chunk:
+                    break
+                buffer.write(chunk)
+        except Exception as e:
+            audio_errors.append(e)
+
+    audio_thread = threading.Thread(target=drain_audio, daemon=True)
+    audio_thread.start()
+
+    frame_pipe = os.fdopen(frame_read_fd, "rb")
+
+    def sampled_frames():
+        while True:
+            data = frame_pipe.read(frame_size)
+            if len(data) < frame_size:
+                return
+            if progress is not None:
+                progress.advance()
+            yield np.frombuffer(data, dtype=np.uint8).reshape(
+                media["height"], media["width"], 3
+            )
+
+    try:
+        frames_result = frames_consumer(sampled_frames())
+
+        # Consumers may stop early; keep draining so ffmpeg can finish
+        for _ in sampled_frames():
+            pass
+
+        audio_thread.join()
+        if process.wait() != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to demux video: {read_ffmpeg_stderr(stderr)}"
+            )
+        if audio_errors:
+            raise audio_errors[0]
+
+        return buffer.finish(), frames_result
+
+    except BaseException:
+        process.kill()
+        process.wait()
+        audio_thread.join()
+        buffer.abort()
+        raise
+
+    finally:
+        frame_pipe.close()
+        process.stdout.close()
+        stderr.close()
@@ -5,6 +5,7 @@ import cv2
 import numpy as np
 import pandas as pd
 from fer import FER
+from utils.cancellation import checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -21,16 +22,30 @@ class EmotionDetector:
         if not use_gpu:
             os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 
-        # Initialize the FER detector
-        self.detector = FER(mtcnn=True)
+        self._detector = None
 
-    def extract_emotions(self, video_path, sample_rate=1):
+    @property
+    def detector(self):
+        """
+        FER detector, created on first use.
+
+        Building it initializes TensorFlow, whose runtime must not be
+        started in a server process that later forks its workers. Every
+        task worker has its own detector, so analyses never wait on each
+        other's inference; TASK_QUEUE_WORKERS bounds how many exist.
+        """
+        if self._detector is None:
+            self._detector = FER(mtcnn=True)
+        return self._detector
+
+    def extract_emotions(self, video_path, sample_rate=1, cancel=None):
         """
         Extract emotions from video frames.
 
         Args:
             video_path (str): Path to the video file
             sample_rate (int): Number of frames to sample per second
+            cancel (CancellationToken): Checked before every sampled frame
 
         Returns:
             dict: Dictionary of average emotion values
@@ -46,58 +61,78 @@ class EmotionDetector:
                 logger.error(f"Failed to open video file: {video_path}")
                 raise ValueError(f"Failed to open video file: {video_path}")
 
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_interval = int(
-                fps / sample_rate
-            )  # Extract sample_rate frames per second
+            try:
+                # Get video properties
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                frame_interval = max(
+                    1, int(fps / sample_rate)
+                )  # Extract sample_rate frames per second
 
-            # Create a DataFrame to store emotion values
-            columns = ["angry", "fear", "happy", "sad", "surprise", "neutral"]
-            df = pd.DataFrame(columns=columns)
+                return self.extract_emotions_from_frames(
+                    self._sampled_frames(cap, frame_interval), cancel
+                )
 
-            # Process each frame
-            frame_count = 0
-            processed_frames = 0
+            finally:
+                # Release video capture
+                cap.release()
 
-            while True:
-                ret, frame = cap.read()
+        except Exception as e:
+            logger.error(f"Error extracting emotions: {str(e)}")
+            raise
 
-                if not ret:
-                    break
+    def extract_emotions_from_frames(self, frames, cancel=None):
+        """
+        Extract emotions from already sampled video frames.
 
-                if frame_count % frame_interval == 0:
-                    # Detect emotions in the frame
-                    emotions = self.detector.detect_emotions(frame)
+        Args:
+            frames (Iterable[numpy.ndarray]): BGR frames to analyse
+            cancel (CancellationToken): Checked before every frame
 
-                    # If faces are found, add emotions to the DataFrame
-                    if emotions:
-                        emotion_values = emotions[0]["emotions"]
-                        df = pd.concat(
-                            [df, pd.DataFrame([emotion_values], columns=columns)],
-                            ignore_index=True,
-                        )
-                    else:
-                        # If no faces are found, add default values
-                        df = pd.concat(
-                            [df, pd.DataFrame([{col: np.nan for col in columns}])],
-                            ignore_index=True,
-                        )
+        Returns:
+            dict: Dictionary of average emotion values
+        """
+        try:
+            # Collect one row of emotion values per frame
+            columns = ["angry", "fear", "happy", "sad", "surprise", "neutral"]
+            rows = []
+
+            for frame in frames:
+                checkpoint(cancel)
 
-                    processed_frames += 1
+                # Detect emotions in the frame
+                emotions = self.detector.detect_emotions(frame)
 
-                frame_count += 1
+                # If faces are found, keep their emotions, otherwise a NaN row
+                if emotions:
+                    emotion_values = emotions[0]["emotions"]
+                    rows.append([emotion_values.get(col, np.nan) for col in columns])
+                else:
+                    rows.append([np.nan] * len(columns))
 
-            # Release video capture
-            cap.release()
+            df = pd.DataFrame(rows, columns=columns, dtype=float)
 
             # Calculate the average emotion values, ignoring NaN values
             avg_emotions = df.mean(skipna=True).to_dict()
 
-            logger.info(f"Extracted emotions from {processed_frames} frames")
+            logger.info(f"Extracted emotions from {len(rows)} frames")
 
             return avg_emotions
 
         except Exception as e:
             logger.error(f"Error extracting emotions: {str(e)}")
             raise
+
+    def _sampled_frames(self, cap, frame_interval):
+        """Yield every ``frame_interval``-th frame read from a capture."""
+        frame_count = 0
+
+        while True:
+            ret, frame = cap.read()
+
+            if not ret:
+                break
+
+            if frame_count % frame_interval == 0:
+                yield frame
+
+            frame_count += 1
@@ -1,119 +1,164 @@
 import logging
+from functools import lru_cache
 
 from nltk.stem import PorterStemmer
 from nltk.tokenize import word_tokenize
 
+from config import Config
+from utils.lexicon import Lexicon, load_lexicon_file
+from utils.metrics import metrics
+from utils.tokenizer import fast_word_tokenize
+
 logger = logging.getLogger(__name__)
 
+TOKENIZERS = {
+    "nltk": word_tokenize,
+    "fast": fast_word_tokenize,
+}
+
+_stemmer = PorterStemmer()
+
+
+@lru_cache(maxsize=Config.LEXICAL_STEM_CACHE_SIZE)
+def stem(word):
+    """
+    Porter-stem a lowercased word, memoized across calls and threads.
+
+    Args:
+        word (str): Lowercased word
+
+    Returns:
+        str: Stem
+    """
+    return _stemmer.stem(word)
+
+
+def _stem_cache_hit_rate():
+    info = stem.cache_info()
+    total = info.hits + info.misses
+    return info.hits / total if total else 0.0
+
+
+metrics.register_gauge("lexical.stem_cache_hit_rate", _stem_cache_hit_rate)
+
+# Built-in LIWC-like categories; these are the lexical features the model
+# was trained on. Tokens are lowercased before matching.
+LIWC_CATEGORIES = {
+    "posEmotion": [
+        "hope",
+        "improve",
+        "kind",
+        "love",
+        "happy",
+        "pretty",
+        "good",
+        "joy",
+        "excited",
+        "optimistic",
+        "satisfied",
+        "confident",
+        "enthusiastic",
+        "pleased",
+        "grateful",
+    ],
+    "Cognitive": [
+        "cause",
+        "know",
+        "ought",
+        "learn",
+        "make",
+        "notice",
+        "understand",
+        "think",
+        "reason",
+        "realize",
+        "analyze",
+        "comprehend",
+        "ponder",
+        "contemplate",
+        "reflect",
+    ],
+    "Work": [
+        "project",
+        "study",
+        "thesis",
+        "class",
+        "work",
+        "university",
+        "job",
+        "employment",
+        "career",
+        "task",
+        "interview",
+        "meeting",
+        "resume",
+        "deadline",
+        "position",
+    ],
+    "Tentative_Language": [
+        "maybe",
+        "perhaps",
+        "guess",
+        "possibly",
+        "potentially",
+        "could",
+        "might",
+        "assuming",
+        "probable",
+        "likely",
+        "feasible",
+        "possible",
+        "hypothetical",
+        "uncertain",
+        "tentative",
+    ],
+    "Filler_Words": [
+        "ah",
+        "ahh",
+        "uhm",
+        "uhmmm",
+        "um",
+        "uh",
+        "uhh",
+        "umm",
+        "ummm",
+        "mmhmm",
+        "uhhhh",
+        "hmm",
+    ],
+}
+
 
 class LexicalFeatureExtractor:
-    def __init__(self):
+    def __init__(self, lexicon_path=None, tokenizer=None):
         """
         Initialize the lexical feature extractor with LIWC-like categories.
+
+        Args:
+            lexicon_path (str): Optional ``.json`` or LIWC ``.dic`` lexicon
+                whose entries extend the built-in categories and may add new
+                ones
+            tokenizer (str): ``nltk`` or ``fast``; defaults to
+                ``Config.LEXICAL_TOKENIZER``
         """
-        # Define LIWC-like categories for lexical feature extraction
+        tokenizer = tokenizer or Config.LEXICAL_TOKENIZER
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown lexical tokenizer: {tokenizer}")
+        self.tokenize = TOKENIZERS[tokenizer]
+
         self.liwc_categories = {
-            "posEmotion": [
-                "hope",
-                "improve",
-                "kind",
-                "love",
-                "happy",
-                "pretty",
-                "good",
-                "joy",
-                "excited",
-                "optimistic",
-                "satisfied",
-                "confident",
-                "enthusiastic",
-                "pleased",
-                "grateful",
-            ],
-            "Cognitive": [
-                "cause",
-                "know",
-                "ought",
-                "learn",
-                "make",
-                "notice",
-                "understand",
-                "think",
-                "reason",
-                "realize",
-                "analyze",
-                "comprehend",
-                "ponder",
-                "contemplate",
-                "reflect",
-            ],
-            "Work": [
-                "project",
-                "study",
-                "thesis",
-                "class",
-                "work",
-                "university",
-                "job",
-                "employment",
-                "career",
-                "task",
-                "interview",
-                "meeting",
-                "resume",
-                "deadline",
-                "position",
-            ],
-            "Tentative_Language": [
-                "maybe",
-                "perhaps",
-                "guess",
-                "possibly",
-                "potentially",
-                "could",
-                "might",
-                "assuming",
-                "probable",
-                "likely",
-                "feasible",
-                "possible",
-                "hypothetical",
-                "uncertain",
-                "tentative",
-            ],
-            "Filler_Words": [
-                "ah",
-                "Ah",
-                "Ahh",
-                "ahh",
-                "uhm",
-                "Uhm",
-                "Uhmmm",
-                "um",
-                "Um",
-                "uh",
-                "Uhh",
-                "Umm",
-                "ummm",
-                "Mmhmm",
-                "Uhhhh",
-                "Hmm",
-                "uhhhh",
-                "uhh",
-                "umm",
-                "Uh",
-            ],
+            category: list(words) for category, words in LIWC_CATEGORIES.items()
         }
+        if lexicon_path:
+            for category, words in load_lexicon_file(lexicon_path).items():
+                self.liwc_categories.setdefault(category, []).extend(words)
 
-        # Initialize Porter Stemmer
-        self.stemmer = PorterStemmer()
-
-        # Create stemmed category words for faster lookup
-        self.stemmed_categories = {}
-        for category, words in self.liwc_categories.items():
-            self.stemmed_categories[category] = [
-                self.stemmer.stem(word.lower()) for word in words
-            ]
+        # Compile all categories into a single stem index
+        self.lexicon = Lexicon(self.liwc_categories, stem)
+        logger.info(
+            f"Compiled lexicon with {len(self.lexicon)} entries in "
+            f"{len(self.liwc_categories)} categories"
+        )
 
     def extract_features(self, text):
         """
@@ -128,21 +173,32 @@ class LexicalFeatureExtractor:
         logger.info("Extracting lexical features from text")
 
         try:
-            # Tokenize and stem the input text
-            tokens = word_tokenize(text)
-            stemmed_tokens = [self.stemmer.stem(word.lower()) for word in tokens]
+            return self._count(text)
 
-            # Initialize category counts
-            category_counts = {category: 0 for category in self.liwc_categories.keys()}
+        except Exception as e:
+            logger.error(f"Error extracting lexical features: {str(e)}")
+            raise
 
-            # Count occurrences of stemmed words in LIWC categories
-            for word in stemmed_tokens:
-                for category, stemmed_words in self.stemmed_categories.items():
-                    if word in stemmed_words:
-                        category_counts[category] += 1
+    def extract_many(self, texts):
+        """
+        Extract lexical features from several texts.
 
-            return category_counts
+        Args:
+            texts (list[str]): Input texts to analyze
+
+        Returns:
+            list[dict]: Lexical feature counts by category, one per text
+        """
+        logger.info(f"Extracting lexical features from {len(texts)} texts")
+
+        try:
+            return [self._count(text) for text in texts]
 
         except Exception as e:
             logger.error(f"Error extracting lexical features: {str(e)}")
             raise
+
+    def _count(self, text):
+        """Tokenize, stem and count categories in ``text``."""
+        words = [token.lower() for token in self.tokenize(text)]
+        return self.lexicon.count(words, [stem(word) for word in words])
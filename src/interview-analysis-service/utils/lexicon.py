@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Marks the categories of a complete phrase in the phrase trie
+_PHRASE_END = None
+
+
+class Lexicon:
+    """
+    LIWC-style lexicon compiled for linear-time matching.
+
+    Entries are compiled once into:
+    - a hashed index from word stem to the categories it belongs to,
+    - a trie over stem sequences for multi-word phrases (longest match wins
+      and consumes its tokens),
+    - a table of wildcard prefixes (``happ*``) matched against the
+      lowercased surface form, as in LIWC dictionaries.
+
+    Counting a transcript is then one dictionary probe per token plus a
+    short walk for tokens that start a phrase or match a prefix, regardless
+    of how many categories or entries the lexicon has.
+    """
+
+    def __init__(self, categories, stem):
+        """
+        Compile the lexicon.
+
+        Args:
+            categories (dict): Category name to list of entries
+            stem (callable): Stemmer applied to lowercased single words
+        """
+        self.categories = list(categories)
+        self._index = {}
+        self._phrases = {}
+        self._prefixes = {}
+        self._prefix_lengths = set()
+
+        for category, entries in categories.items():
+            for entry in entries:
+                self._add(category, entry.strip().lower(), stem)
+
+        # Freeze category sets into tuples for cheap iteration
+        self._index = {key: tuple(value) for key, value in self._index.items()}
+        self._prefixes = {key: tuple(value) for key, value in self._prefixes.items()}
+
+    def _add(self, category, entry, stem):
+        if not entry:
+            return
+
+        words = entry.split()
+        if len(words) > 1:
+            node = self._phrases
+            for word in words:
+                node = node.setdefault(stem(word), {})
+            node.setdefault(_PHRASE_END, set()).add(category)
+        elif entry.endswith("*"):
+            prefix = entry.rstrip("*")
+            self._prefixes.setdefault(prefix, set()).add(category)
+            self._prefix_lengths.add(len(prefix))
+        else:
+            self._index.setdefault(stem(entry), set()).add(category)
+
+    def __len__(self):
+        return len(self._index) + len(self._prefixes) + self._count_phrases(
+            self._phrases
+        )
+
+    def _count_phrases(self, node):
+        return sum(
+            1 if key is _PHRASE_END else self._count_phrases(child)
+            for key, child in node.items()
+        )
+
+    def count(self, words, stems):
+        """
+        Count category occurrences in a token sequence.
+
+        Args:
+            words (list[str]): Lowercased tokens
+            stems (list[str]): Stems of ``words``, index-aligned
+
+        Returns:
+            dict: Category name to number of matching tokens or phrases
+        """
+        counts = dict.fromkeys(self.categories, 0)
+        prefix_lengths = sorted(self._prefix_lengths)
+        i = 0
+        n = len(stems)
+
+        while i < n:
+            matched, length = self._match_phrase(stems, i)
+            if matched:
+                for category in matched:
+                    counts[category] += 1
+                i += length
+                continue
+
+            matched = set(self._index.get(stems[i], ()))
+            word = words[i]
+            for prefix_length in prefix_lengths:
+                if prefix_length > len(word):
+                    break
+                matched.update(self._prefixes.get(word[:prefix_length], ()))
+
+            for category in matched:
+                counts[category] += 1
+            i += 1
+
+        return counts
+
+    def _match_phrase(self, stems, start):
+        """Longest phrase starting at ``start``; returns (categories, length)."""
+        node = self._phrases.get(stems[start])
+        best, best_length = (), 0
+        i = start + 1
+
+        while node is not None:
+            if _PHRASE_END in node:
+                best, best_length = node[_PHRASE_END], i - start
+            if i >= len(stems):
+                break
+            node = node.get(stems[i])
+            i += 1
+
+        return best, best_length
+
+
+def load_lexicon_file(path):
+    """
+    Load lexicon entries from a file.
+
+    Supported formats:
+    - ``.json``: ``{"Category": ["word", "multi word phrase", "prefix*"]}``
+    - ``.dic``: LIWC dictionary format, a ``%``-delimited header mapping
+      category IDs to names followed by tab-separated ``entry<TAB>id...``
+      lines
+
+    Args:
+        path (str): Path to the lexicon file
+
+    Returns:
+        dict: Category name to list of entries
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            categories = json.load(f)
+    elif extension == ".dic":
+        categories = _load_liwc_dic(path)
+    else:
+        raise ValueError(f"Unsupported lexicon format: {path}")
+
+    logger.info(
+        f"Loaded {sum(len(v) for v in categories.values())} lexicon entries "
+        f"in {len(categories)} categories from {path}"
+    )
+    return categories
+
+
+def _load_liwc_dic(path):
+    category_names = {}
+    categories = {}
+    header_markers = 0
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for raw_line in f:
+            line = raw_line.rstrip("\n")
+            if not line.strip():
+                continue
+
+            if line.strip() == "%":
+                header_markers += 1
+                continue
+
+            if header_markers == 1:
+                category_id, name = line.split(None, 1)
+                category_names[category_id] = name.strip()
+                categories.setdefault(name.strip(), [])
+                continue
+
+            if "\t" in line:
+                entry, *rest = [part for part in line.split("\t") if part.strip()]
+                ids = " ".join(rest).split()
+            else:
+                # Without tabs, trailing numeric fields are category IDs
+                parts = line.split()
+                split = len(parts)
+                while split > 1 and parts[split - 1].isdigit():
+                    split -= 1
+                entry, ids = " ".join(parts[:split]), parts[split:]
+
+            for category_id in ids:
+                name = category_names.get(category_id.strip())
+                if name is not None:
+                    categories[name].append(entry.strip())
+
+    return categories
@@ -0,0 +1,103 @@
+import threading
+from collections import deque
+
+
+class Metrics:
+    """
+    Thread-safe, process-wide registry of counters, summaries and gauges.
+
+    Counters only go up, summaries track count/sum/min/max plus percentiles
+    over a window of recent observations, and gauges are callables
+    evaluated when a snapshot is taken.
+    """
+
+    def __init__(self, window=1024):
+        """
+        Initialize the registry.
+
+        Args:
+            window (int): Number of recent observations kept per summary
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._summaries = {}
+        self._gauges = {}
+
+    def increment(self, name, value=1):
+        """Add ``value`` to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        """Record one observation in a summary."""
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                summary = self._summaries[name] = {
+                    "count": 0,
+                    "sum": 0.0,
+                    "min": value,
+                    "max": value,
+                    "recent": deque(maxlen=self.window),
+                }
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["recent"].append(value)
+
+    def register_gauge(self, name, func):
+        """Register a callable whose value is reported in every snapshot."""
+        with self._lock:
+            self._gauges[name] = func
+
+    def counter(self, name):
+        """Current value of a counter."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def ratio(self, numerator, *others):
+        """``numerator / (numerator + others)`` over counters, 0 if empty."""
+        with self._lock:
+            hits = self._counters.get(numerator, 0)
+            total = hits + sum(self._counters.get(name, 0) for name in others)
+        return hits / total if total else 0.0
+
+    def snapshot(self):
+        """
+        Take a JSON-serializable snapshot of all metrics.
+
+        Returns:
+            dict: Counters, summaries and gauges keyed by metric name
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = {
+                name: self._summarize(summary)
+                for name, summary in self._summaries.items()
+            }
+            gauges = dict(self._gauges)
+
+        return {
+            "counters": counters,
+            "summaries": summaries,
+            "gauges": {name: func() for name, func in gauges.items()},
+        }
+
+    @staticmethod
+    def _summarize(summary):
+        recent = sorted(summary["recent"])
+        return {
+            "count": summary["count"],
+            "sum": summary["sum"],
+            "mean": summary["sum"] / summary["count"],
+            "min": summary["min"],
+            "max": summary["max"],
+            "p50": recent[int(0.5 * (len(recent) - 1))],
+            "p95": recent[int(0.95 * (len(recent) - 1))],
+        }
+
+
+# Process-wide registry
+metrics = Metrics()
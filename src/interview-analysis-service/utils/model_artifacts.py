@@ -0,0 +1,96 @@
+import logging
+import os
+import pickle
+import threading
+import uuid
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def sidecar_path(path):
+    """Path of the memory-mappable joblib copy of a pickled artifact."""
+    return f"{os.path.splitext(path)[0]}.joblib"
+
+
+def ensure_sidecar(path):
+    """
+    Make sure an up-to-date joblib sidecar exists next to a pickle.
+
+    The sidecar is written uncompressed, which is what allows joblib to
+    memory-map the NumPy arrays inside it. It carries the modification
+    time of the pickle it was built from and is rebuilt whenever the two
+    differ, e.g. after a new model is rolled out or rolled back.
+
+    Several workers may find the sidecar missing at the same time. Each
+    writes and syncs its own temporary file and renames it into place, so
+    readers only ever see a complete sidecar, whichever rename wins.
+
+    Args:
+        path (str): Path to the pickled artifact
+
+    Returns:
+        str | None: Sidecar path, or None if it could not be written
+    """
+    sidecar = sidecar_path(path)
+    source_mtime_ns = os.stat(path).st_mtime_ns
+    if os.path.exists(sidecar) and os.stat(sidecar).st_mtime_ns == source_mtime_ns:
+        return sidecar
+
+    tmp_path = f"{sidecar}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(path, "rb") as f:
+            artifact = pickle.load(f)
+        with open(tmp_path, "wb") as f:
+            joblib.dump(artifact, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.utime(tmp_path, ns=(source_mtime_ns, source_mtime_ns))
+        os.replace(tmp_path, sidecar)
+    except OSError as e:
+        logger.warning(f"Could not write memory-mappable copy of {path}: {e}")
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"Wrote memory-mappable copy of {path} to {sidecar}")
+    return sidecar
+
+
+def load_model_artifact(path, mmap=True):
+    """
+    Load a pickled model artifact, memory-mapping its arrays when possible.
+
+    With ``mmap`` the artifact is loaded from its joblib sidecar with
+    ``mmap_mode="r"``: large arrays stay read-only views of the file, so
+    every worker process on the host shares the same page-cache pages
+    instead of holding a private copy. Artifacts are loaded once per
+    process and shared between threads.
+
+    Args:
+        path (str): Path to the pickled artifact
+        mmap (bool): Memory-map arrays through a joblib sidecar
+
+    Returns:
+        The loaded artifact
+    """
+    key = (os.path.abspath(path), mmap)
+
+    with _lock:
+        if key in _loaded:
+            return _loaded[key]
+
+        sidecar = ensure_sidecar(path) if mmap else None
+        if sidecar is not None:
+            artifact = joblib.load(sidecar, mmap_mode="r")
+        else:
+            with open(path, "rb") as f:
+                artifact = pickle.load(f)
+
+        _loaded[key] = artifact
+        return artifact
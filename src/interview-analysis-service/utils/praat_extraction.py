@@ -1,6 +1,5 @@
 import logging
 import os
-import pickle
 import statistics
 
 import pandas as pd
@@ -9,6 +8,9 @@ from parselmouth.praat import call
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 
+from config import Config
+from utils.model_artifacts import load_model_artifact
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,20 +24,38 @@ class PraatFeatureExtractor:
         """
         self.pca_model_path = pca_model_path or os.path.join("models", "pca_model.pkl")
 
-    def extract_features(self, audio_path):
+        # Load the PCA model once; its arrays are shared between workers
+        self.pca = None
+        if os.path.exists(self.pca_model_path):
+            self.pca = load_model_artifact(
+                self.pca_model_path, mmap=Config.MODEL_MMAP_ENABLED
+            )
+
+    def extract_features(self, audio):
         """
-        Extract prosodic features from an audio file using Praat.
+        Extract prosodic features from audio using Praat.
 
         Args:
-            audio_path (str): Path to the audio file
+            audio (str | parselmouth.Sound): Path to an audio file or a Sound
+                built in memory
 
         Returns:
             dict: Dictionary of extracted prosodic features
         """
-        logger.info(f"Extracting Praat features from: {audio_path}")
+        if isinstance(audio, str):
+            logger.info(f"Extracting Praat features from: {audio}")
+        else:
+            # Formatting a Sound would render its full description
+            logger.info(
+                f"Extracting Praat features from {audio.duration:.1f}s of audio "
+                f"at {audio.sampling_frequency:.0f} Hz"
+            )
 
         try:
-            sound = parselmouth.Sound(audio_path)
+            if isinstance(audio, parselmouth.Sound):
+                sound = audio
+            else:
+                sound = parselmouth.Sound(audio)
 
             # Measure pitch features
             pitch_features = self._measure_pitch(sound, 75, 300, "Hertz")
@@ -271,10 +291,9 @@ class PraatFeatureExtractor:
             x = df.loc[:, measures].values
             x = StandardScaler().fit_transform(x)
 
-            # Load PCA model
-            if os.path.exists(self.pca_model_path):
-                with open(self.pca_model_path, "rb") as f:
-                    pca = pickle.load(f)
+            # Use the loaded PCA model
+            if self.pca is not None:
+                pca = self.pca
             else:
                 logger.warning(
                     f"PCA model not found at {self.pca_model_path}, using default PCA"
@@ -1,23 +1,56 @@
 import logging
 import os
+import threading
+import time
+import uuid
 
-import assemblyai as aai
 from config import Config
-from pydub import AudioSegment
+
+from utils.audio import (
+    encode_audio,
+    find_silence_splits,
+    seconds_to_bytes,
+    stream_audio,
+)
+from utils.metrics import metrics
+from utils.transcript_cache import TranscriptCache, audio_content_hash
+from utils.transcription_backends import (
+    AssemblyAIBackend,
+    ChunkedTranscriptionJob,
+    CompletedTranscriptionJob,
+    submit_file,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class TranscriptionService:
-    def __init__(self, api_key):
+    def __init__(self, api_key, backend=None):
         """
         Initialize the transcription service with the provided API key.
 
         Args:
             api_key (str): The AssemblyAI API key
+            backend: Transcription backend to use instead of AssemblyAI
         """
         self.api_key = api_key
-        aai.settings.api_key = api_key
+        self.backend = backend or AssemblyAIBackend(
+            api_key, Config.ASSEMBLYAI_BASE_URL
+        )
+        self.upload_codec = Config.TRANSCRIPTION_UPLOAD_CODEC
+        self.poll_interval = Config.TRANSCRIPTION_POLL_INTERVAL
+        self.timeout = Config.TRANSCRIPTION_TIMEOUT
+        self.chunk_seconds = Config.TRANSCRIPTION_CHUNK_SECONDS
+        self.max_in_flight = Config.TRANSCRIPTION_MAX_IN_FLIGHT
+        self.cache = (
+            TranscriptCache(
+                Config.TRANSCRIPT_CACHE_PATH,
+                max_bytes=Config.TRANSCRIPT_CACHE_MAX_BYTES,
+                ttl=Config.TRANSCRIPT_CACHE_TTL,
+            )
+            if Config.TRANSCRIPT_CACHE_ENABLED
+            else None
+        )
 
     def transcribe_video_file(self, video_file_path):
         """
@@ -27,49 +60,187 @@ class TranscriptionService:
             video_file_path (str): Path to the video file
 
         Returns:
-            tuple[str, str]: [Transcribed text from the video, audio path]
+            tuple[str, PCMAudio]: [Transcribed text from the video, extracted audio]
         """
         logger.info(f"Transcribing video file: {video_file_path}")
 
         try:
-            # Extract audio from video
-            audio_path = self._extract_audio_from_video(video_file_path)
+            audio = self.extract_audio(video_file_path)
+            return (self.transcribe_audio(audio), audio)
+
+        except Exception as e:
+            logger.error(f"Error transcribing video: {str(e)}")
+            raise
+
+    def extract_audio(self, video_file_path):
+        """
+        Extract analysis-ready audio (16kHz mono PCM) from a video file.
+
+        Args:
+            video_file_path (str): Path to the video file
+
+        Returns:
+            PCMAudio: Extracted audio
+        """
+        return self._extract_audio_from_video(video_file_path)
+
+    def transcribe_audio(self, audio):
+        """
+        Transcribe already extracted audio, waiting for the result.
+
+        Args:
+            audio (PCMAudio): Audio to transcribe
+
+        Returns:
+            str: Transcribed text
+        """
+        return self.submit_audio(audio).result(timeout=self.timeout)
+
+    def submit_audio(self, audio):
+        """
+        Upload compressed audio and submit it for transcription.
+
+        Returns as soon as the job is created so the caller can run other
+        stages and collect the transcript later with ``job.result()``.
+        Recordings longer than 1.5 chunk lengths are split at pauses and
+        transcribed as concurrent chunks when chunking is enabled. Audio
+        transcribed before is answered from the transcript cache.
+
+        Args:
+            audio (PCMAudio): Audio to transcribe
+
+        Returns:
+            BaseTranscriptionJob: Handle to the submitted job
+        """
+        key = None
+        if self.cache is not None:
+            key = audio_content_hash(audio)
+            text = self.cache.get(key)
+            if text is not None:
+                return CompletedTranscriptionJob(text)
+
+        job = self._submit(audio)
+        job.add_done_callback(lambda text: self._on_transcribed(job, key, text))
+        return job
+
+    def abandon(self, job):
+        """
+        Let go of a job whose transcript will not be collected.
+
+        Called when the task that submitted it fails or is cancelled first.
+        The transcript is already paid for, so with the transcript cache
+        the job is polled to completion on a background thread and the
+        transcript cached; a retry of the task then finds it instead of
+        submitting the audio again. Without the cache, chunks that were
+        not uploaded yet are dropped.
+
+        Args:
+            job (BaseTranscriptionJob): Job returned by ``submit_audio``
+        """
+        if job.done():
+            return
+        if self.cache is None:
+            job.cancel()
+            return
+
+        metrics.increment("transcription.jobs_abandoned")
+        threading.Thread(
+            target=self._finish_abandoned, args=(job,), daemon=True
+        ).start()
+
+    def _finish_abandoned(self, job):
+        """Wait for an abandoned job so its transcript gets cached."""
+        try:
+            job.result(timeout=self.timeout)
+            logger.info("Cached the transcript of an abandoned transcription job")
+        except Exception as e:
+            logger.warning(f"Abandoned transcription job did not finish: {str(e)}")
+            job.cancel()
+
+    def _on_transcribed(self, job, key, text):
+        """Record transcription metrics and cache the transcript."""
+        latency = time.time() - job.submitted_at
+        metrics.observe("transcription.latency_seconds", latency)
+        metrics.increment("transcription.bytes_sent", job.bytes_sent)
+
+        if key is not None:
+            self.cache.put(key, text, job.bytes_sent, latency)
+
+    def _submit(self, audio):
+        """Submit audio to the backend, chunked if it is long enough."""
+        if self.chunk_seconds > 0 and audio.duration > 1.5 * self.chunk_seconds:
+            return self._submit_chunks(audio)
 
-            # Transcribe the audio
-            transcriber = aai.Transcriber()
-            transcript = transcriber.transcribe(audio_path)
+        audio_path = self._encode(audio)
 
-            return (transcript.text, audio_path)
+        try:
+            job = submit_file(self.backend, audio_path, self.poll_interval)
+            logger.info(
+                f"Uploaded {job.bytes_sent} bytes of {self.upload_codec} audio "
+                f"({audio.nbytes} bytes of raw PCM)"
+            )
+            return job
 
         except Exception as e:
-            logger.error(f"Error transcribing video: {str(e)}")
+            logger.error(f"Error submitting audio for transcription: {str(e)}")
             raise
 
+        finally:
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    def _submit_chunks(self, audio):
+        """
+        Split audio at silences and transcribe the chunks in the background.
+
+        Args:
+            audio (PCMAudio): Audio to transcribe
+
+        Returns:
+            ChunkedTranscriptionJob: Handle stitching the chunk transcripts
+        """
+        bounds = [0] + find_silence_splits(audio, self.chunk_seconds) + [
+            len(audio.samples)
+        ]
+        # Views of the buffer; they keep it alive until encoded, however
+        # soon the caller closes the recording
+        chunks = [audio.slice(start, end) for start, end in zip(bounds, bounds[1:])]
+
+        logger.info(
+            f"Submitting {len(chunks)} transcript chunks "
+            f"(max {self.max_in_flight} in flight)"
+        )
+        return ChunkedTranscriptionJob(
+            self.backend, chunks, self._encode, self.max_in_flight, self.poll_interval
+        )
+
+    def _encode(self, audio):
+        """Encode audio with the upload codec into a temporary file."""
+        return encode_audio(
+            audio,
+            os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, f"temp_{uuid.uuid4().hex}"),
+            codec=self.upload_codec,
+        )
+
     def _extract_audio_from_video(self, video_path):
         """
-        Extract audio from video file and save as WAV.
+        Stream the audio track of a video file into a PCM buffer.
 
         Args:
             video_path (str): Path to the video file
 
         Returns:
-            str: Path to the extracted audio file
+            PCMAudio: Extracted audio
         """
         try:
-            # Create a unique filename using the original filename plus a timestamp
-            filename = os.path.basename(video_path)
-            base_name = os.path.splitext(filename)[0]
-            audio_path = os.path.join(
-                Config.TEMPORARY_ARTIFACTS_PATH, f"temp_{base_name}.wav"
+            return stream_audio(
+                video_path,
+                spool_dir=Config.TEMPORARY_ARTIFACTS_PATH,
+                spool_threshold_bytes=seconds_to_bytes(
+                    Config.AUDIO_SPOOL_THRESHOLD_SECONDS
+                ),
             )
 
-            # Load the video file and extract audio
-            video = AudioSegment.from_file(video_path, format="mp4")
-            audio = video.set_channels(1).set_frame_rate(16000).set_sample_width(2)
-            audio.export(audio_path, format="wav")
-
-            return audio_path
-
         except Exception as e:
             logger.error(f"Error extracting audio: {str(e)}")
             raise
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+from utils.audio import CHUNK_BYTES, SAMPLE_WIDTH
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached transcript, e.g. after a backend change
+CACHE_KEY_VERSION = "1"
+
+
+def audio_content_hash(audio):
+    """
+    Hash the PCM samples of extracted audio.
+
+    Identical recordings decode to identical 16kHz mono PCM, so the hash
+    identifies re-submissions regardless of the container they came in.
+
+    Args:
+        audio (PCMAudio): Audio to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256(f"v{CACHE_KEY_VERSION}:{audio.sample_rate}:".encode())
+    block = CHUNK_BYTES // SAMPLE_WIDTH * 16
+    for start in range(0, len(audio.samples), block):
+        digest.update(audio.samples[start : start + block].tobytes())
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Content-addressed on-disk transcript cache with TTL and LRU eviction.
+
+    Each entry is a small JSON file named after the audio hash. Reads touch
+    the file's mtime, so evicting the oldest mtimes first when the cache
+    exceeds ``max_bytes`` is least-recently-used eviction. Files are written
+    atomically, which makes the directory safe to share between workers.
+    """
+
+    def __init__(self, cache_dir, max_bytes, ttl):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding cache entries
+            max_bytes (int): Maximum total size of the entries
+            ttl (int): Seconds after which an entry expires
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+        metrics.register_gauge(
+            "transcript_cache.hit_rate",
+            lambda: metrics.ratio("transcript_cache.hits", "transcript_cache.misses"),
+        )
+
+    def get(self, key):
+        """
+        Look up a transcript.
+
+        Args:
+            key (str): Audio content hash
+
+        Returns:
+            str | None: Cached transcript text, or None on a miss
+        """
+        path = self._path(key)
+
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            metrics.increment("transcript_cache.misses")
+            return None
+
+        if time.time() - entry["created_at"] > self.ttl:
+            self._remove(path)
+            metrics.increment("transcript_cache.expired")
+            metrics.increment("transcript_cache.misses")
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        metrics.increment("transcript_cache.hits")
+        metrics.increment("transcript_cache.bytes_saved", entry["bytes_sent"])
+        metrics.increment("transcript_cache.seconds_saved", entry["latency"])
+        logger.info(f"Transcript cache hit for audio {key[:12]}")
+        return entry["text"]
+
+    def put(self, key, text, bytes_sent, latency):
+        """
+        Store a transcript and evict entries beyond the size bound.
+
+        Args:
+            key (str): Audio content hash
+            text (str): Transcript text
+            bytes_sent (int): Bytes uploaded to produce the transcript
+            latency (float): Seconds the transcription took
+        """
+        entry = {
+            "text": text,
+            "created_at": time.time(),
+            "bytes_sent": bytes_sent,
+            "latency": latency,
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Failed to write transcript cache entry {key[:12]}: {e}")
+            self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones over max_bytes."""
+        now = time.time()
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes and now - mtime <= self.ttl:
+                break
+            self._remove(path)
+            total -= size
+            metrics.increment("transcript_cache.evictions")
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
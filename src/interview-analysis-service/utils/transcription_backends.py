@@ -0,0 +1,311 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from utils.cancellation import checkpoint
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionError(RuntimeError):
+    """Raised when the transcription backend reports a failed job."""
+
+
+class AssemblyAIBackend:
+    """
+    Minimal client for the AssemblyAI upload and transcript REST endpoints.
+
+    Talking to the endpoints directly lets the service upload compressed
+    audio, submit without waiting for completion and poll on its own
+    schedule. ``base_url`` can point at a local stand-in server.
+    """
+
+    def __init__(self, api_key, base_url, request_timeout=60):
+        """
+        Initialize the backend.
+
+        Args:
+            api_key (str): The AssemblyAI API key
+            base_url (str): API base URL, e.g. https://api.assemblyai.com/v2
+            request_timeout (float): Timeout for individual HTTP requests
+        """
+        self.base_url = base_url.rstrip("/")
+        self.request_timeout = request_timeout
+        self.session = requests.Session()
+        self.session.headers.update({"authorization": api_key})
+
+    def upload(self, audio_path):
+        """
+        Upload an audio file.
+
+        Args:
+            audio_path (str): Path to the (encoded) audio file
+
+        Returns:
+            str: URL of the uploaded audio
+        """
+        with open(audio_path, "rb") as f:
+            response = self.session.post(
+                f"{self.base_url}/upload",
+                data=f,
+                headers={"content-type": "application/octet-stream"},
+                timeout=self.request_timeout,
+            )
+        response.raise_for_status()
+        return response.json()["upload_url"]
+
+    def submit(self, audio_url):
+        """
+        Create a transcription job without waiting for it to finish.
+
+        Args:
+            audio_url (str): URL returned by ``upload``
+
+        Returns:
+            str: Transcript ID
+        """
+        response = self.session.post(
+            f"{self.base_url}/transcript",
+            json={"audio_url": audio_url},
+            timeout=self.request_timeout,
+        )
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def get(self, transcript_id):
+        """
+        Fetch the current state of a transcription job.
+
+        Args:
+            transcript_id (str): Transcript ID
+
+        Returns:
+            dict: Transcript with at least ``status`` and, once completed, ``text``
+        """
+        response = self.session.get(
+            f"{self.base_url}/transcript/{transcript_id}",
+            timeout=self.request_timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+class BaseTranscriptionJob:
+    """Common polling and waiting logic for transcription jobs."""
+
+    def __init__(self, poll_interval):
+        self.poll_interval = poll_interval
+        self.submitted_at = time.time()
+        self._text = None
+        self._callbacks = []
+
+    def add_done_callback(self, callback):
+        """Call ``callback(text)`` once the transcript is available."""
+        if self._text is not None:
+            callback(self._text)
+        else:
+            self._callbacks.append(callback)
+
+    def done(self):
+        """Whether the transcript is available"""
+        return self._text is not None
+
+    def cancel(self):
+        """Stop work on the job that has not started yet."""
+
+    def poll(self):
+        """
+        Check the job once.
+
+        Returns:
+            str | None: Transcript text if completed, otherwise None
+        """
+        if self._text is None:
+            text = self._poll()
+            if text is not None:
+                self._text = text
+                for callback in self._callbacks:
+                    callback(text)
+                self._callbacks = []
+        return self._text
+
+    def _poll(self):
+        """Query the backend once; return the text when completed."""
+        raise NotImplementedError
+
+    def result(self, timeout=None, cancel=None):
+        """
+        Wait for the job to finish.
+
+        Args:
+            timeout (float): Maximum seconds to wait, or None to wait forever
+            cancel (CancellationToken): Stops the wait when cancelled
+
+        Returns:
+            str: Transcript text
+        """
+        deadline = None if timeout is None else self.submitted_at + timeout
+
+        while True:
+            text = self.poll()
+            if text is not None:
+                return text
+            checkpoint(cancel)
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"Transcription did not finish in {timeout}s")
+            time.sleep(self.poll_interval)
+
+
+class TranscriptionJob(BaseTranscriptionJob):
+    """Handle to a single submitted transcription."""
+
+    def __init__(self, backend, transcript_id, bytes_sent, poll_interval=3.0):
+        """
+        Initialize the job handle.
+
+        Args:
+            backend: Backend the job was submitted to
+            transcript_id (str): Transcript ID
+            bytes_sent (int): Size of the uploaded audio in bytes
+            poll_interval (float): Seconds between polls in ``result``
+        """
+        super().__init__(poll_interval)
+        self.backend = backend
+        self.transcript_id = transcript_id
+        self.bytes_sent = bytes_sent
+
+    def _poll(self):
+        transcript = self.backend.get(self.transcript_id)
+        status = transcript.get("status")
+
+        if status == "completed":
+            logger.info(
+                f"Transcript {self.transcript_id} completed in "
+                f"{time.time() - self.submitted_at:.1f}s"
+            )
+            return transcript.get("text") or ""
+        if status == "error":
+            raise TranscriptionError(
+                f"Transcription {self.transcript_id} failed: {transcript.get('error')}"
+            )
+        return None
+
+
+class ChunkedTranscriptionJob(BaseTranscriptionJob):
+    """
+    Transcribes audio chunks on a small thread pool.
+
+    Each of ``max_in_flight`` threads encodes a chunk, uploads it, submits
+    it and polls it to completion before taking the next one, so at most
+    that many chunks are in flight and the work carries on while the
+    caller runs other stages. The texts are stitched back together in
+    chunk order.
+    """
+
+    def __init__(self, backend, chunks, encode, max_in_flight, poll_interval=3.0):
+        """
+        Initialize the job and start transcribing the chunks.
+
+        Args:
+            backend: Transcription backend
+            chunks (list[PCMAudio]): Audio chunks, in order; views of the
+                recording stay valid after the recording is closed
+            encode (callable): Encodes a chunk into a temporary file and
+                returns its path; the file is removed once uploaded
+            max_in_flight (int): Maximum chunks being transcribed at once
+            poll_interval (float): Seconds between polls of a chunk
+        """
+        super().__init__(poll_interval)
+        self.backend = backend
+        self.encode = encode
+        self.bytes_sent = 0
+        self._texts = [None] * len(chunks)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._error = None
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_in_flight), thread_name_prefix="transcription"
+        )
+        for index, chunk in enumerate(chunks):
+            self._executor.submit(self._transcribe_chunk, index, chunk)
+        self._executor.shutdown(wait=False)
+
+    def _transcribe_chunk(self, index, chunk):
+        """Encode, upload and submit one chunk, and wait for its text."""
+        try:
+            if self._stopped.is_set():
+                return
+            path = self.encode(chunk)
+            try:
+                job = submit_file(self.backend, path, self.poll_interval)
+            finally:
+                if os.path.exists(path):
+                    os.remove(path)
+            with self._lock:
+                self.bytes_sent += job.bytes_sent
+
+            while not self._stopped.is_set():
+                text = job.poll()
+                if text is not None:
+                    with self._lock:
+                        self._texts[index] = text
+                    return
+                self._stopped.wait(self.poll_interval)
+
+        except BaseException as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+            self.cancel()
+
+    def _poll(self):
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if any(text is None for text in self._texts):
+                return None
+
+        logger.info(
+            f"Stitched {len(self._texts)} transcript chunks in "
+            f"{time.time() - self.submitted_at:.1f}s"
+        )
+        return " ".join(text.strip() for text in self._texts if text.strip())
+
+    def cancel(self):
+        """Stop transcribing; chunks not started yet are never uploaded."""
+        self._stopped.set()
+
+
+class CompletedTranscriptionJob(BaseTranscriptionJob):
+    """Job whose transcript is already known, e.g. from a cache."""
+
+    def __init__(self, text):
+        super().__init__(poll_interval=0)
+        self.bytes_sent = 0
+        self._text = text
+
+    def _poll(self):
+        return self._text
+
+
+def submit_file(backend, audio_path, poll_interval):
+    """
+    Upload an audio file and submit it for transcription.
+
+    Args:
+        backend: Transcription backend
+        audio_path (str): Path to the audio file
+        poll_interval (float): Seconds between polls when waiting
+
+    Returns:
+        TranscriptionJob: Handle to the submitted job
+    """
+    bytes_sent = os.path.getsize(audio_path)
+    audio_url = backend.upload(audio_path)
+    transcript_id = backend.submit(audio_url)
+    logger.info(f"Submitted transcript {transcript_id} ({bytes_sent} bytes uploaded)")
+    return TranscriptionJob(backend, transcript_id, bytes_sent, poll_interval)
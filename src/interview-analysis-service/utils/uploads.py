@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from werkzeug.formparser import FormDataParser
+from werkzeug.utils import secure_filename
+
+logger = logging.getLogger(__name__)
+
+# Bytes kept from the start of an upload to identify its container
+HEADER_BYTES = 16
+
+# Leading ISO base media (MP4/QuickTime) box types
+MP4_BOX_TYPES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide"}
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file written to a task workspace"""
+
+    path: str
+    filename: str
+    content_hash: str
+    size: int
+    # Container identified from the first bytes, or None if unrecognized
+    container: Optional[str]
+
+
+class _SpoolFile:
+    """
+    Workspace file the form parser writes an uploaded file part to.
+
+    The part is hashed and its first bytes kept as they are written, so
+    neither costs another read of the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.header = b""
+
+    def write(self, data):
+        self.digest.update(data)
+        if len(self.header) < HEADER_BYTES:
+            self.header += data[: HEADER_BYTES - len(self.header)]
+        self.size += len(data)
+        return self.file.write(data)
+
+    def seek(self, *args):
+        return self.file.seek(*args)
+
+    def close(self):
+        self.file.close()
+
+
+def create_workspace(root):
+    """
+    Create the workspace directory of a new upload.
+
+    The upload and the files derived from it live in the workspace, which
+    is removed as a whole once its task is done. Each workspace is unique,
+    so concurrent uploads with the same filename never meet.
+
+    Args:
+        root (str): Directory holding the workspaces
+
+    Returns:
+        str: Path of the new, empty workspace
+    """
+    path = os.path.join(root, uuid.uuid4().hex)
+    os.makedirs(path)
+    return path
+
+
+def remove_workspace(path):
+    """
+    Delete a workspace and everything in it.
+
+    Args:
+        path (str): Workspace directory
+    """
+    try:
+        shutil.rmtree(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.error(f"Failed to remove workspace {path}: {str(e)}")
+
+
+def spool_upload(request, field, workspace):
+    """
+    Stream the file uploaded as form field ``field`` into a workspace.
+
+    The multipart body is parsed straight from the request stream, and
+    every file part is written to ``workspace`` in chunks as it arrives,
+    instead of being spooled to a temporary file first and copied after.
+    The content hash and container are determined during the copy.
+
+    Args:
+        request (flask.Request): Current request; its form data must not
+            have been accessed yet
+        field (str): Name of the form field carrying the file
+        workspace (str): Workspace directory to write to
+
+    Returns:
+        SpooledUpload | None: The upload, or None if the request has no
+        file in ``field``
+
+    Raises:
+        werkzeug.exceptions.RequestEntityTooLarge: If the body exceeds the
+            configured limits
+    """
+    parts = []
+
+    def stream_factory(
+        total_content_length, content_type, filename, content_length=None
+    ):
+        name = secure_filename(filename or "") or "upload"
+        part = _SpoolFile(os.path.join(workspace, f"{len(parts)}_{name}"))
+        parts.append(part)
+        return part
+
+    parser = FormDataParser(
+        stream_factory,
+        max_form_memory_size=request.max_form_memory_size,
+        max_content_length=request.max_content_length,
+        max_form_parts=request.max_form_parts,
+    )
+
+    try:
+        _, _, files = parser.parse(
+            request.stream,
+            request.mimetype,
+            request.content_length,
+            request.mimetype_params,
+        )
+    finally:
+        for part in parts:
+            part.close()
+
+    file_storage = files.get(field)
+    if file_storage is None or not file_storage.filename:
+        return None
+
+    part = file_storage.stream
+    container = sniff_container(part.header)
+    logger.info(f"Spooled upload {part.path} ({part.size} bytes, {container})")
+    return SpooledUpload(
+        path=part.path,
+        filename=file_storage.filename,
+        content_hash=part.digest.hexdigest(),
+        size=part.size,
+        container=container,
+    )
+
+
+def sniff_container(header):
+    """
+    Identify a video container from the first bytes of a file.
+
+    Args:
+        header (bytes): At least the first 12 bytes of the file
+
+    Returns:
+        str | None: ``mp4`` or ``avi``, or None if unrecognized
+    """
+    if header[4:8] in MP4_BOX_TYPES:
+        return "mp4"
+    if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+        return "avi"
+    return None
+
+
+def client_id(request):
+    """
+    Identify the client making a request, for fair scheduling.
+
+    Args:
+        request (flask.Request): Current request
+
+    Returns:
+        str: The ``X-Client-ID`` header if sent, else the remote address
+    """
+    return request.headers.get("X-Client-ID") or request.remote_addr
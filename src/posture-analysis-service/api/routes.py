@@ -1,12 +1,24 @@
 import logging
 import os
+import threading
 import traceback
 
 from config import Config
-from flask import Blueprint, jsonify, request, url_for
+from core.video_processor import probe_video
+from flask import Blueprint, Response, jsonify, request, url_for
 from services.analysis_service import PostureAnalysisService
 from task_queue import TaskQueue
-from werkzeug.utils import secure_filename
+from task_store import FINISHED_STATUSES, create_task_store
+from utils.admission import AdmissionRejected, check_admission
+from utils.metrics import metrics
+from utils.status_cache import GZIP_MIN_BYTES, StatusBody, StatusBodyCache
+from utils.status_stream import BUSY_RECONNECT_MILLISECONDS, stream_task_status
+from utils.uploads import (
+    client_id,
+    create_workspace,
+    remove_workspace,
+    spool_upload,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,10 +30,38 @@ posture_bp = Blueprint("posture", __name__, url_prefix="/api/posture")
 analysis_service = PostureAnalysisService()
 
 # Initialize task queue
+task_results_dir = os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, "posture_task_results")
 posture_task_queue = TaskQueue(
-    results_dir=os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, "posture_task_results"),
+    results_dir=task_results_dir,
     num_workers=Config.TASK_QUEUE_WORKERS,
     processor_type="posture",
+    results_ttl=Config.TASK_QUEUE_RESULTS_TTL,
+    hot_seconds=Config.TASK_QUEUE_HOT_SECONDS,
+    max_hot_tasks=Config.TASK_QUEUE_MAX_HOT_TASKS,
+    max_results=Config.TASK_QUEUE_MAX_RESULTS,
+    max_result_bytes=Config.TASK_QUEUE_MAX_RESULT_BYTES,
+    janitor_interval=Config.TASK_QUEUE_JANITOR_INTERVAL,
+    max_attempts=Config.TASK_QUEUE_MAX_ATTEMPTS,
+    aging=Config.TASK_QUEUE_AGING,
+    fair_share=Config.TASK_QUEUE_FAIR_SHARE,
+    probe=probe_video,
+    backend=Config.TASK_QUEUE_BACKEND,
+    store=create_task_store(
+        Config.TASK_STORE,
+        task_results_dir,
+        db_path=Config.TASK_STORE_PATH,
+        commit_delay=Config.TASK_STORE_COMMIT_DELAY,
+        fsync=Config.TASK_STORE_FSYNC,
+    ),
+    autostart=not Config.PRELOAD_APP,
+)
+
+# Status requests waiting for a change each hold a server thread
+status_watchers = threading.BoundedSemaphore(Config.STATUS_MAX_WATCHERS)
+
+# Serialized status bodies of finished tasks
+status_bodies = StatusBodyCache(
+    Config.STATUS_CACHE_MAX_BYTES, Config.STATUS_CACHE_SECONDS
 )
 
 
@@ -33,31 +73,48 @@ def analyze_posture():
     Returns a task ID for asynchronous processing.
     """
 
+    # Turn the upload away before its body is read if the queue is too
+    # far behind or the spool disk too full to take it
+    try:
+        check_admission(
+            posture_task_queue,
+            request.content_length or Config.MAX_CONTENT_LENGTH,
+            Config.UPLOAD_FOLDER,
+            Config.ADMISSION_MAX_WAIT,
+            Config.SPOOL_MIN_FREE_BYTES,
+        )
+    except AdmissionRejected as e:
+        response = jsonify(
+            {"status": "error", "message": str(e), "retry_after": e.retry_after}
+        )
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, e.status_code
+
+    # Stream the upload into its own workspace, hashing it on the way
+    workspace = create_workspace(Config.UPLOAD_FOLDER)
+    try:
+        upload = spool_upload(request, "video", workspace)
+    except Exception:
+        remove_workspace(workspace)
+        raise
+
     # Check if file exists in request
-    if "video" not in request.files:
+    if upload is None:
+        remove_workspace(workspace)
         return (
             jsonify({"status": "error", "message": "No video file provided"}),
             400,
         )
-    video_file = request.files["video"]
-
-    # Check if filename is empty
-    if video_file.filename == "":
-        return jsonify({"status": "error", "message": "Empty video filename"}), 400
-
-    # Save the video file temporarily
-    filename = secure_filename(video_file.filename)
-    filepath = os.path.join(Config.TEMPORARY_ARTIFACTS_PATH, filename)
 
     try:
-        # Ensure directory exists
-        os.makedirs(Config.TEMPORARY_ARTIFACTS_PATH, exist_ok=True)
-
-        # Save the file
-        video_file.save(filepath)
-
-        # Enqueue the task for asynchronous processing
-        task_id = posture_task_queue.enqueue(filepath)
+        # Enqueue the task for asynchronous processing; a re-upload of a
+        # file that is queued or analysed returns the existing task
+        task_id = posture_task_queue.enqueue(
+            upload.path,
+            upload.content_hash,
+            client=client_id(request),
+            workspace=workspace,
+        )
 
         # Return task ID and status URL
         status_url = url_for("posture.get_task_status", task_id=task_id, _external=True)
@@ -76,8 +133,7 @@ def analyze_posture():
         logger.error(traceback.format_exc())
 
         # Clean up if error occurs
-        if "filepath" in locals() and os.path.exists(filepath):
-            os.remove(filepath)
+        remove_workspace(workspace)
 
         return (
             jsonify({"status": "error", "message": f"An error occurred: {str(e)}"}),
@@ -90,15 +146,114 @@ def get_task_status(task_id):
     """
     Get the status of a posture analysis task by ID.
     """
-    task_info = posture_task_queue.get_task_status(task_id)
+    body = status_bodies.get(task_id)
+    if body is None:
+        task_info = posture_task_queue.get_task_status(task_id)
+
+        if not task_info:
+            return jsonify({"status": "error", "message": "Task not found"}), 404
+
+        body = _status_body(task_id, task_info)
+
+    return _status_response(body)
+
+
+@posture_bp.route("/task/<task_id>/events", methods=["GET"])
+def get_task_events(task_id):
+    """
+    Follow the status of a posture analysis task as it changes.
+    With ``Accept: text/event-stream``, streams Server-Sent Events, one per
+    state or progress change, until the task finishes. Otherwise long-polls:
+    waits up to ``timeout`` seconds for the status to differ from
+    ``revision`` and returns it like GET /task/<task_id>, with a
+    ``Retry-After`` header if too many requests are waiting already.
+    """
+    accepted = request.accept_mimetypes.best_match(
+        ["application/json", "text/event-stream"]
+    )
+
+    # A finished task does not change again; answer at once from the cache
+    body = status_bodies.get(task_id)
+    if body is not None and accepted != "text/event-stream":
+        return _status_response(body)
+
+    # Beyond the watcher limit, answer at once rather than hold a thread
+    watching = status_watchers.acquire(blocking=False)
+    release = status_watchers.release if watching else None
+
+    if accepted == "text/event-stream":
+        events = stream_task_status(
+            posture_task_queue,
+            task_id,
+            request.headers.get("Last-Event-ID"),
+            _task_status_body,
+            {"status": "error", "message": "Task not found"},
+            Config.STATUS_STREAM_SECONDS if watching else 0,
+            on_close=release,
+        )
+        return Response(
+            events,
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    try:
+        timeout = min(
+            request.args.get("timeout", Config.STATUS_WAIT_MAX_SECONDS, type=float),
+            Config.STATUS_WAIT_MAX_SECONDS,
+        )
+        task_info = posture_task_queue.wait_for_change(
+            task_id, request.args.get("revision"), timeout if watching else 0
+        )
+    finally:
+        if watching:
+            release()
 
     if not task_info:
         return jsonify({"status": "error", "message": "Task not found"}), 404
 
+    response = _status_response(_status_body(task_id, task_info))
+    if not watching:
+        # Answered without waiting; ask the client not to come back at once
+        response.headers["Retry-After"] = str(BUSY_RECONNECT_MILLISECONDS // 1000)
+    return response
+
+
+def _status_body(task_id, task_info):
+    """Serialize the status body of a task, caching it once finished"""
+    body = StatusBody(_task_status_body(task_id, task_info), task_info["revision"])
+    if task_info["status"] in FINISHED_STATUSES:
+        status_bodies.put(task_id, body)
+    return body
+
+
+def _status_response(body):
+    """
+    Respond with a status body: 304 Not Modified if the client has it
+    already (``If-None-Match``), and gzipped when large and accepted.
+    """
+    if request.if_none_match.contains_weak(body.etag):
+        response = Response(status=304)
+    elif len(body.data) >= GZIP_MIN_BYTES and request.accept_encodings["gzip"]:
+        response = Response(body.gzipped(), mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(body.data, mimetype="application/json")
+
+    # Weak, as the gzipped and plain bodies share it
+    response.set_etag(body.etag, weak=True)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _task_status_body(task_id, task_info):
+    """Response body of the task status endpoints"""
     response = {
         "status": "success",
         "task_id": task_id,
         "task_status": task_info["status"],
+        "revision": task_info["revision"],
     }
 
     # Add additional information based on task status
@@ -109,8 +264,38 @@ def get_task_status(task_id):
         )
     elif task_info["status"] == "failed":
         response["error"] = task_info["error"]
+    elif task_info.get("progress"):
+        # Stage, frames processed and estimated seconds remaining
+        response["progress"] = task_info["progress"]
+
+    return response
+
 
-    return jsonify(response)
+@posture_bp.route("/task/<task_id>", methods=["DELETE"])
+def cancel_task(task_id):
+    """
+    Cancel a posture analysis task by ID.
+    A pending task is cancelled at once (200); a running task is signalled
+    and stops at its next checkpoint (202). Finished tasks are kept (409).
+    """
+    task_info = posture_task_queue.cancel(task_id)
+
+    if not task_info:
+        return jsonify({"status": "error", "message": "Task not found"}), 404
+
+    task_status = task_info["status"]
+    response = {"status": "success", "task_id": task_id, "task_status": task_status}
+
+    if task_status == "cancelled":
+        return jsonify(response)
+    if task_status in ("pending", "processing"):
+        response["message"] = "Cancellation has been requested"
+        return jsonify(response), 202
+
+    return (
+        jsonify({"status": "error", "message": f"Task has already {task_status}"}),
+        409,
+    )
 
 
 @posture_bp.route("/health", methods=["GET"])
@@ -124,5 +309,21 @@ def health_check():
             "service": "posture-analysis",
             "version": "1.0.0",
             "queue_size": posture_task_queue.queue.qsize(),
+            "backlog_seconds": round(posture_task_queue.backlog_seconds(), 1),
+            "estimated_wait_seconds": round(posture_task_queue.estimated_wait(), 1),
+        }
+    )
+
+
+@posture_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Endpoint exposing service metrics such as the upload de-duplication rate.
+    """
+    return jsonify(
+        {
+            "status": "ok",
+            "service": "posture-analysis",
+            "metrics": metrics.snapshot(),
         }
     )
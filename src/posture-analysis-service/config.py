@@ -8,6 +8,7 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-key-for-development-only")
     DEBUG = False
     TESTING = False
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
 
     # Paths
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -15,17 +16,79 @@ class Config:
         "TEMPORARY_ARTIFACTS_PATH", os.path.join(BASE_DIR, "tmp")
     )
 
-    # Service settings
+    # Service settings; each upload gets a workspace directory in
+    # UPLOAD_FOLDER, removed with its task
     UPLOAD_FOLDER = os.environ.get(
         "UPLOAD_FOLDER", os.path.join(TEMPORARY_ARTIFACTS_PATH, "uploads")
     )
     MAX_CONTENT_LENGTH = 200 * 1024 * 1024  # 16 MB maximum file size
 
+    # Set when gunicorn preloads the app in its master process; task queue
+    # workers are then started in each server worker after it forks
+    PRELOAD_APP = os.environ.get("PRELOAD_APP", "False").lower() == "true"
+
     # Task queue configuration
+    # Analyses run at once per process; gunicorn.conf.py derives it from
+    # the node-wide ANALYSIS_CONCURRENCY
     TASK_QUEUE_WORKERS = int(os.getenv("TASK_QUEUE_WORKERS", "2"))
     TASK_QUEUE_RESULTS_TTL = int(
         os.getenv("TASK_QUEUE_RESULTS_TTL", "86400")
     )  # 24 hours in seconds
+    # Finished tasks are kept in memory this long, then served from disk
+    TASK_QUEUE_HOT_SECONDS = int(os.getenv("TASK_QUEUE_HOT_SECONDS", "300"))
+    TASK_QUEUE_MAX_HOT_TASKS = int(os.getenv("TASK_QUEUE_MAX_HOT_TASKS", "1000"))
+    TASK_QUEUE_MAX_RESULTS = int(os.getenv("TASK_QUEUE_MAX_RESULTS", "10000"))
+    TASK_QUEUE_MAX_RESULT_BYTES = int(
+        os.getenv("TASK_QUEUE_MAX_RESULT_BYTES", str(1024 * 1024 * 1024))
+    )  # 1GB
+    TASK_QUEUE_JANITOR_INTERVAL = int(os.getenv("TASK_QUEUE_JANITOR_INTERVAL", "60"))
+    # Runs per task before it is marked failed
+    TASK_QUEUE_MAX_ATTEMPTS = int(os.getenv("TASK_QUEUE_MAX_ATTEMPTS", "2"))
+    # Tasks run shortest estimated job first; each second waited counts as
+    # this many seconds less estimated work, so long videos still get run
+    TASK_QUEUE_AGING = float(os.getenv("TASK_QUEUE_AGING", "1.0"))
+    # Take turns between clients (X-Client-ID header, else remote address)
+    TASK_QUEUE_FAIR_SHARE = (
+        os.environ.get("TASK_QUEUE_FAIR_SHARE", "False").lower() == "true"
+    )
+    # "thread", or "process" to run analyses in a pool of worker processes
+    TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "thread")
+    # "sqlite" (shared by all server processes), "journal" (append-only
+    # file with compaction, keeping only an index in memory) or "json" (a
+    # file per task, not shared)
+    TASK_STORE = os.getenv("TASK_STORE", "sqlite")
+    TASK_STORE_PATH = os.environ.get(
+        "TASK_STORE_PATH", os.path.join(TEMPORARY_ARTIFACTS_PATH, "tasks.sqlite3")
+    )
+    # Extra seconds a task store commit waits for state changes of other
+    # workers to join it; concurrent changes are batched even without it
+    TASK_STORE_COMMIT_DELAY = float(os.getenv("TASK_STORE_COMMIT_DELAY", "0"))
+    # Flush every journal commit to disk, surviving a power loss as well as
+    # a server crash; costs a disk flush per commit, which makes the journal
+    # several times slower than SQLite in synchronous=NORMAL mode
+    TASK_STORE_FSYNC = os.environ.get("TASK_STORE_FSYNC", "False").lower() == "true"
+
+    # Uploads are rejected with 429 while a new task would wait longer than
+    # this many seconds to start (0 accepts every upload)
+    ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "1800"))
+    # Uploads are rejected with 503 if they would leave less space free
+    SPOOL_MIN_FREE_BYTES = int(
+        os.getenv("SPOOL_MIN_FREE_BYTES", str(1024 * 1024 * 1024))
+    )  # 1GB
+
+    # /task/<id>/events long-polls wait at most this many seconds
+    STATUS_WAIT_MAX_SECONDS = float(os.getenv("STATUS_WAIT_MAX_SECONDS", "30"))
+    # Event streams are closed after this many seconds; clients reconnect
+    STATUS_STREAM_SECONDS = float(os.getenv("STATUS_STREAM_SECONDS", "300"))
+    # Waiting status requests per server process; each holds a server
+    # thread, so further ones are answered at once
+    STATUS_MAX_WATCHERS = int(os.getenv("STATUS_MAX_WATCHERS", "4"))
+    # Status bodies of finished tasks are kept serialized, up to this many
+    # bytes in total, for this many seconds
+    STATUS_CACHE_MAX_BYTES = int(
+        os.getenv("STATUS_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    )
+    STATUS_CACHE_SECONDS = float(os.getenv("STATUS_CACHE_SECONDS", "300"))
 
 
 class DevelopmentConfig(Config):
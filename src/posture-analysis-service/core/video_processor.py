@@ -4,6 +4,35 @@ import tempfile
 import cv2
 
 from core.pose_detector import PoseDetector
+from utils.cancellation import TaskCancelled, checkpoint
+from utils.progress import TaskProgress
+
+
+def probe_video(video_path):
+    """
+    Read a video's properties from its container header.
+
+    Args:
+        video_path (str): Path to the video file
+
+    Returns:
+        dict: width, height, fps and duration in seconds
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Failed to open video file: {video_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        return {
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": fps,
+            "duration": frames / fps if fps > 0 else 0.0,
+        }
+    finally:
+        cap.release()
 
 
 class VideoProcessor:
@@ -21,12 +50,15 @@ class VideoProcessor:
         self.skip_frames = skip_frames
         self.pose_detector = PoseDetector()
 
-    def process_video(self, video_data):
+    def process_video(self, video_data, cancel=None, progress=None):
         """
         Process video data to extract posture angles.
 
         Args:
             video_data (bytes): Video file data in bytes
+            cancel (CancellationToken): Checked before every frame; raises
+                ``TaskCancelled`` once cancelled
+            progress (TaskProgress): Receives the frames processed
 
         Returns:
             dict: Dictionary with angle data and processed frames count
@@ -36,6 +68,29 @@ class VideoProcessor:
             temp_file.write(video_data)
             temp_file_path = temp_file.name
 
+        try:
+            return self.process_video_file(temp_file_path, cancel, progress)
+
+        finally:
+            # Clean up the temporary file
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+
+    def process_video_file(self, video_path, cancel=None, progress=None):
+        """
+        Process a video file to extract posture angles.
+
+        The file is decoded where it is, without reading it into memory.
+
+        Args:
+            video_path (str): Path to the video file
+            cancel (CancellationToken): Checked before every frame; raises
+                ``TaskCancelled`` once cancelled
+            progress (TaskProgress): Receives the frames processed
+
+        Returns:
+            dict: Dictionary with angle data and processed frames count
+        """
         try:
             # Lists to store angle data
             angles_data = {
@@ -47,16 +102,24 @@ class VideoProcessor:
             }
 
             # Open video file
-            cap = cv2.VideoCapture(temp_file_path)
+            cap = cv2.VideoCapture(video_path)
 
             if not cap.isOpened():
                 raise ValueError("Failed to open video file")
 
+            progress = progress if progress is not None else TaskProgress()
+            progress.plan(["pose"])
+            progress.start_stage(
+                "pose", int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+            )
+
             frame_count = 0
             processed_frames = 0
 
             # Process video frames
             while cap.isOpened():
+                checkpoint(cancel)
+
                 ret, frame = cap.read()
 
                 if not ret:
@@ -76,9 +139,11 @@ class VideoProcessor:
                             processed_frames += 1
 
                 frame_count += 1
+                progress.advance()
 
             # Release resources
             cap.release()
+            progress.finish_stage("pose")
 
             return {
                 "angles_data": angles_data,
@@ -86,10 +151,9 @@ class VideoProcessor:
                 "total_frames": frame_count,
             }
 
+        except TaskCancelled:
+            cap.release()
+            raise
+
         except Exception as e:
             raise RuntimeError(f"Error processing video: {e}")
-
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
@@ -15,19 +15,52 @@ class PostureAnalysisService:
         self.video_processor = VideoProcessor()
         self.result_interpreter = ResultInterpreter()
 
-    def analyze_posture(self, video_data):
+    def analyze_posture_file(self, video_path, cancel=None, progress=None):
+        """
+        Analyze posture from a video file.
+
+        Args:
+            video_path (str): Path to the video file
+            cancel (CancellationToken): Stops the analysis when cancelled
+            progress (TaskProgress): Receives the frames processed
+
+        Returns:
+            dict: Analysis results, as returned by ``analyze_posture``
+        """
+        # Decode the upload in place rather than copy it through memory
+        processing_result = self.video_processor.process_video_file(
+            video_path, cancel, progress
+        )
+        return self._interpret(processing_result)
+
+    def analyze_posture(self, video_data, cancel=None, progress=None):
         """
         Analyze posture from video data.
 
         Args:
             video_data (bytes): Video file data in bytes
+            cancel (CancellationToken): Stops the analysis when cancelled
+            progress (TaskProgress): Receives the frames processed
 
         Returns:
             dict: Analysis results including average angles, feedback, inferences and tips
         """
         # Process the video to extract angles
-        processing_result = self.video_processor.process_video(video_data)
+        processing_result = self.video_processor.process_video(
+            video_data, cancel, progress
+        )
+        return self._interpret(processing_result)
 
+    def _interpret(self, processing_result):
+        """
+        Build the analysis results from the angles of the processed frames.
+
+        Args:
+            processing_result (dict): Output of the video processor
+
+        Returns:
+            dict: Analysis results including average angles, feedback, inferences and tips
+        """
         # If no frames were processed successfully, return error
         if processing_result["processed_frames"] == 0:
             return {
@@ -1,14 +1,23 @@
-import json
+import fcntl
 import logging
+import multiprocessing
 import os
 import time
 import uuid
-from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, fields
 from enum import Enum
-from queue import Queue
-from threading import Thread
+from threading import Condition, Lock, Thread
 from typing import Any, Dict, Optional
 
+from task_scheduler import CostModel, CostScheduler, video_cost_units
+from task_store import FINISHED_STATUSES, JsonTaskStore, dedup_key
+from utils.cancellation import CancellationToken, TaskCancelled
+from utils.metrics import metrics
+from utils.progress import PUBLISH_INTERVAL, TaskProgress, read_progress
+from utils.uploads import remove_workspace
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,7 @@ class TaskStatus(Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
     def __str__(self):
         return self.value
@@ -33,6 +43,21 @@ class Task:
     completed_at: Optional[float] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    content_hash: Optional[str] = None
+    options: Optional[Dict[str, Any]] = None
+    attempts: int = 0
+    client: Optional[str] = None
+    # Directory holding the upload and files derived from it, removed
+    # with the upload
+    workspace: Optional[str] = None
+    # Work in the video (see ``video_cost_units``) and its estimated
+    # processing time, from probing the upload
+    cost_units: Optional[float] = None
+    estimated_seconds: Optional[float] = None
+    # Server process that queued the task, as "pid:start time"
+    owner: Optional[str] = None
+    # Incremented on every saved state change
+    version: int = 0
 
     def to_dict(self):
         """Convert task to dictionary with proper enum handling"""
@@ -40,43 +65,245 @@ class Task:
         data["status"] = str(self.status)
         return data
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """Rebuild a task saved with ``to_dict``"""
+        names = {field.name for field in fields(cls)}
+        task = cls(**{key: value for key, value in data.items() if key in names})
+        task.status = TaskStatus(task.status)
+        return task
+
+
+def status_revision(data: Dict[str, Any]) -> str:
+    """
+    Identifier of a task status as returned by ``get_task_status``.
+
+    It changes with every state change of the task and every progress
+    update its worker publishes.
+    """
+    progress = data.get("progress") or {}
+    return f"{data.get('version', 0)}.{progress.get('sequence', 0)}"
+
+
+def process_identity(pid: int) -> Optional[str]:
+    """
+    Identify a running process as "pid:start time".
+
+    Unlike the PID alone, this does not match a new process that reuses
+    the PID, e.g. after a container restart. Returns None if the process
+    is not running (or ``/proc`` is unavailable).
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # The command name may contain spaces; start time is field 22
+            start_time = f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+    return f"{pid}:{start_time}"
+
 
 class TaskQueue:
     def __init__(
-        self, results_dir: str, num_workers: int = 2, processor_type: str = "posture"
+        self,
+        results_dir: str,
+        num_workers: int = 2,
+        processor_type: str = "posture",
+        results_ttl: int = 86400,
+        hot_seconds: int = 300,
+        max_hot_tasks: int = 1000,
+        max_results: int = 10000,
+        max_result_bytes: int = 1024 * 1024 * 1024,
+        janitor_interval: int = 60,
+        max_attempts: int = 2,
+        aging: float = 1.0,
+        fair_share: bool = False,
+        probe=None,
+        backend: str = "thread",
+        store=None,
+        autostart: bool = True,
     ):
-        self.queue = Queue()
+        # Shortest estimated job first, with aging so long videos still run
+        self.queue = CostScheduler(aging=aging, fair_share=fair_share)
+        self.cost_model = CostModel()
+        # Reads width, height and duration of an upload from its header
+        self.probe = probe
+        metrics.register_gauge(
+            "tasks.seconds_per_cost_unit", lambda: self.cost_model.rate
+        )
         self.tasks: Dict[str, Task] = {}
+        # Tasks being processed by the worker threads, for the backlog
+        self.running: Dict[str, Task] = {}
+        # Cancellation signals and progress of the running tasks
+        self.cancel_tokens: Dict[str, CancellationToken] = {}
+        self.progress: Dict[str, TaskProgress] = {}
+        # Notified on every task state change and published progress
+        self.changed = Condition()
+        self._change_count = 0
+        # Last saved state of each task in memory; status requests read
+        # this rather than the task, whose fields change before it is saved
+        self.saved_states: Dict[str, Dict[str, Any]] = {}
+        metrics.register_gauge("tasks.backlog_seconds", self.backlog_seconds)
         self.results_dir = results_dir
         self.num_workers = num_workers
         self.processor_type = processor_type
 
+        # Live tasks by (content hash, options), for upload de-duplication
+        self.lock = Lock()
+        self.dedup_index: Dict[str, str] = {}
+        metrics.register_gauge(
+            "uploads.dedup_hit_rate",
+            lambda: metrics.ratio("uploads.dedup_hits", "uploads.dedup_misses"),
+        )
+
+        # A failed task is retried until it has run ``max_attempts`` times
+        self.max_attempts = max(1, max_attempts)
+        self.owner = None
+
+        # "thread" runs analyses in the worker threads themselves; "process"
+        # hands each task's file path to a pool of worker processes, which
+        # load their models once and run in parallel outside the GIL
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Invalid task queue backend: {backend}")
+        self.backend = backend
+        self.executor = None
+
+        # Finished tasks stay in memory for ``hot_seconds`` (at most
+        # ``max_hot_tasks`` of them) and on disk until ``results_ttl``, with
+        # at most ``max_results`` stored tasks totalling ``max_result_bytes``
+        self.results_ttl = results_ttl
+        self.hot_seconds = hot_seconds
+        self.max_hot_tasks = max_hot_tasks
+        self.max_results = max_results
+        self.max_result_bytes = max_result_bytes
+        self.janitor_interval = janitor_interval
+        self.result_files = 0
+        self.result_bytes = 0
+        metrics.register_gauge("tasks.in_memory", lambda: len(self.tasks))
+        metrics.register_gauge("task_results.files", lambda: self.result_files)
+        metrics.register_gauge("task_results.bytes", lambda: self.result_bytes)
+
         # Ensure results directory exists
         os.makedirs(results_dir, exist_ok=True)
+        # Marker files cancelling tasks, visible to every server process
+        self.cancel_dir = os.path.join(results_dir, "cancel")
+        os.makedirs(self.cancel_dir, exist_ok=True)
+        # Progress snapshots of running tasks, likewise
+        self.progress_dir = os.path.join(results_dir, "progress")
+        os.makedirs(self.progress_dir, exist_ok=True)
+
+        # Persistent task states, shared by every process of the service
+        self.store = store if store is not None else JsonTaskStore(results_dir)
 
-        # Start worker threads
         self.workers = []
-        for _ in range(num_workers):
-            worker = Thread(target=self._process_queue, daemon=True)
-            worker.start()
-            self.workers.append(worker)
+        self._started_pid = None
 
         logger.info(
             f"Task queue initialized with {num_workers} workers for {processor_type} processing"
         )
 
-    def enqueue(self, filepath: str) -> str:
-        """Add a task to the queue and return its ID"""
-        task_id = str(uuid.uuid4())
-        task = Task(
-            id=task_id,
-            filepath=filepath,
-            status=TaskStatus.PENDING,
-            created_at=time.time(),
+        if autostart:
+            self.start()
+
+    def start(self):
+        """
+        Start the worker threads in the current process.
+
+        Threads do not survive ``fork``, so a preloading server constructs
+        the queue with ``autostart=False`` and calls this in each worker
+        process after forking. Calling it again in the same process is a
+        no-op.
+        """
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+
+        if self.backend == "process":
+            self._start_process_pool()
+
+        self.workers = []
+        for _ in range(self.num_workers):
+            worker = Thread(target=self._process_queue, daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+        Thread(target=self._run_janitor, daemon=True).start()
+
+        self._started_pid = pid
+        self.owner = process_identity(pid) or str(pid)
+
+        try:
+            self.resume_unfinished()
+        except Exception as e:
+            logger.exception(f"Failed to resume unfinished tasks: {str(e)}")
+        logger.info(
+            f"Started {self.num_workers} {self.processor_type} task workers "
+            f"in process {pid}"
         )
 
-        self.tasks[task_id] = task
-        self.queue.put(task_id)
+    def enqueue(
+        self,
+        filepath: str,
+        content_hash: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        client: Optional[str] = None,
+        workspace: Optional[str] = None,
+    ) -> str:
+        """
+        Add a task to the queue and return its ID.
+
+        The upload is probed for its duration and resolution, and the task
+        is scheduled by its estimated processing time. ``client``
+        identifies the uploader for fair sharing between clients.
+        ``workspace`` is the directory holding the upload, if it has one.
+
+        If a pending, processing or completed task exists for the same
+        content hash and options, in this process or (with a shared store)
+        any other, its ID is returned instead and the new file (with its
+        workspace) is removed.
+        """
+        key = dedup_key(content_hash, options)
+
+        with self.lock:
+            existing_id = None
+            existing = self.tasks.get(self.dedup_index.get(key))
+            if existing is not None and existing.status not in (
+                TaskStatus.FAILED,
+                TaskStatus.CANCELLED,
+            ):
+                existing_id = existing.id
+            elif key is not None:
+                stored = self.store.find(key)
+                existing_id = stored["id"] if stored else None
+
+            if existing_id is not None:
+                metrics.increment("uploads.dedup_hits")
+                logger.info(f"Upload duplicates task {existing_id}; reusing it")
+                self._remove_upload(filepath, workspace)
+                return existing_id
+
+            if key is not None:
+                metrics.increment("uploads.dedup_misses")
+
+            task_id = str(uuid.uuid4())
+            task = Task(
+                id=task_id,
+                filepath=filepath,
+                status=TaskStatus.PENDING,
+                created_at=time.time(),
+                content_hash=content_hash,
+                options=options,
+                owner=self.owner,
+                client=client,
+                workspace=workspace,
+            )
+
+            self.tasks[task_id] = task
+            if key is not None:
+                self.dedup_index[key] = task_id
+
+        task.cost_units = self._probe_cost_units(filepath)
+        task.estimated_seconds = self.cost_model.estimate(task.cost_units)
+        self._schedule(task)
 
         # Save task metadata
         self._save_task_metadata(task)
@@ -84,26 +311,265 @@ class TaskQueue:
         logger.info(f"Task {task_id} enqueued for file {filepath}")
         return task_id
 
+    def _probe_cost_units(self, filepath: str) -> Optional[float]:
+        """Cost units of an upload, or None if it cannot be probed"""
+        if self.probe is None:
+            return None
+        try:
+            info = self.probe(filepath)
+        except Exception as e:
+            logger.warning(f"Could not probe {filepath} for scheduling: {e}")
+            return None
+        return video_cost_units(info["duration"], info["width"], info["height"])
+
+    def _schedule(self, task: Task):
+        """Put a pending task on the queue by its estimated cost"""
+        if task.estimated_seconds is None:
+            task.estimated_seconds = self.cost_model.estimate(task.cost_units)
+        self.queue.put((task.id, task.estimated_seconds, task.client))
+
+    def backlog_seconds(self) -> float:
+        """Estimated seconds of work queued or still running"""
+        now = time.time()
+        remaining = 0.0
+        for task in list(self.running.values()):
+            elapsed = 0.0
+            if task.status == TaskStatus.PROCESSING:
+                elapsed = now - task.started_at
+            remaining += max(0.0, task.estimated_seconds - elapsed)
+        return self.queue.queued_seconds() + remaining
+
+    def estimated_wait(self) -> float:
+        """Estimated seconds until a task enqueued now starts processing"""
+        return self.backlog_seconds() / self.num_workers
+
+    def resume_unfinished(self) -> int:
+        """
+        Re-enqueue pending and processing tasks left by a stopped process.
+
+        Tasks whose owning server process is still running are left alone,
+        and the scan is serialized across processes, so each orphaned task
+        is resumed exactly once. A task that was processing when its
+        process died has that run counted in ``attempts`` (saved before it
+        started); once it has used up ``max_attempts`` it is marked failed
+        rather than run again, so a video that kills its worker does not
+        kill every replacement too. Returns the number of tasks resumed.
+        """
+        resumed = 0
+        lock_path = os.path.join(self.results_dir, "resume.lock")
+
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            for data in self.store.iter_unfinished():
+                owner = data.get("owner")
+                if owner and owner != self.owner:
+                    if process_identity(int(owner.split(":")[0])) == owner:
+                        continue
+
+                task = Task.from_dict(data)
+                task.owner = self.owner
+                if task.id in self.tasks:
+                    continue
+
+                if not os.path.exists(task.filepath):
+                    task.status = TaskStatus.FAILED
+                    task.error = "Upload is no longer available to resume the task"
+                    task.completed_at = time.time()
+                    self._save_task_metadata(task)
+                    continue
+
+                if (
+                    task.status == TaskStatus.PROCESSING
+                    and task.attempts >= self.max_attempts
+                ):
+                    task.status = TaskStatus.FAILED
+                    task.error = (
+                        f"Worker stopped during attempt {task.attempts} "
+                        f"of {self.max_attempts}"
+                    )
+                    task.completed_at = time.time()
+                    self._remove_upload(task.filepath, task.workspace)
+                    self._save_task_metadata(task)
+                    metrics.increment("tasks.abandoned")
+                    logger.error(f"Not resuming task {task.id}: {task.error}")
+                    continue
+
+                task.status = TaskStatus.PENDING
+                with self.lock:
+                    self.tasks[task.id] = task
+                    key = dedup_key(task.content_hash, task.options)
+                    if key is not None:
+                        self.dedup_index[key] = task.id
+                self._save_task_metadata(task)
+                self._schedule(task)
+                resumed += 1
+
+        if resumed:
+            metrics.increment("tasks.resumed", resumed)
+            logger.info(f"Resumed {resumed} unfinished tasks")
+        return resumed
+
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get the current status of a task"""
-        if task_id in self.tasks:
-            return self.tasks[task_id].to_dict()
+        """
+        Get the current status of a task.
+
+        Processing tasks include their progress; pending tasks of this
+        process include the estimated seconds until they are done.
+        """
+        task = self.tasks.get(task_id)
+        if task is not None:
+            saved = self.saved_states.get(task_id)
+            data = dict(saved) if saved is not None else task.to_dict()
+        else:
+            # It was evicted, or enqueued by another server process
+            data = self.store.get(task_id)
+            if data is None:
+                return None
+
+        if data["status"] == TaskStatus.PROCESSING.value:
+            data["progress"] = self._progress_snapshot(task_id)
+        elif data["status"] == TaskStatus.PENDING.value and task is not None:
+            # The backlog includes the task itself
+            estimate = task.estimated_seconds or 0.0
+            wait = max(0.0, self.backlog_seconds() - estimate) / self.num_workers
+            data["progress"] = {
+                "stage": "queued",
+                "eta_seconds": round(wait + estimate, 1),
+            }
+        data["revision"] = status_revision(data)
+        return data
 
-        # Check if task exists in the results directory
-        metadata_path = os.path.join(self.results_dir, f"{task_id}.json")
-        if os.path.exists(metadata_path):
-            with open(metadata_path, "r") as f:
-                return json.load(f)
+    def wait_for_change(
+        self, task_id: str, revision: Optional[str], timeout: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the status of a task to differ from ``revision``.
 
-        return None
+        State changes, and progress published by this process's worker
+        threads, wake the waiter as they happen. Progress reported by
+        worker processes and tasks of other server processes are looked up
+        again every ``PUBLISH_INTERVAL`` seconds.
+
+        Returns the status as soon as its revision differs or the task is
+        finished, or after ``timeout`` seconds; None if the task is unknown.
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self.changed:
+                seen = self._change_count
+
+            data = self.get_task_status(task_id)
+            if (
+                data is None
+                or data["revision"] != revision
+                or data["status"] in FINISHED_STATUSES
+            ):
+                return data
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return data
+            if task_id not in self.tasks or self.backend == "process":
+                remaining = min(remaining, PUBLISH_INTERVAL)
+
+            with self.changed:
+                if self._change_count == seen:
+                    self.changed.wait(remaining)
+
+    def _notify_change(self):
+        """Wake the threads waiting in ``wait_for_change``"""
+        with self.changed:
+            self._change_count += 1
+            self.changed.notify_all()
+
+    def _progress_path(self, task_id: str) -> str:
+        return os.path.join(self.progress_dir, f"{task_id}.json")
+
+    def _progress_snapshot(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Progress of a processing task, from memory or its progress file"""
+        progress = self.progress.get(task_id)
+        if progress is not None and self.backend == "thread":
+            return progress.published
+        # Reported by a worker process, or by another server process
+        return read_progress(self._progress_path(task_id))
+
+    def cancel(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a pending or processing task.
+
+        A pending task is taken off the queue at once. A processing task is
+        signalled and stops at its next cancellation checkpoint, as does a
+        task of another server process, through a marker file its worker
+        checks. Finished tasks are left as they are.
+
+        Returns the task's state after the request, or None if the task is
+        unknown.
+        """
+        task = self.tasks.get(task_id)
+        if task is None:
+            data = self.store.get(task_id)
+            if data is not None and data["status"] in (
+                TaskStatus.PENDING.value,
+                TaskStatus.PROCESSING.value,
+            ):
+                self._write_cancel_marker(task_id)
+            return data
+
+        if task.status == TaskStatus.PENDING and self.queue.remove(task_id):
+            self._mark_cancelled(task)
+            self._remove_upload(task.filepath, task.workspace)
+            self._save_task_metadata(task)
+        elif task.status in (TaskStatus.PENDING, TaskStatus.PROCESSING):
+            # Already taken by a worker, which checks the marker first
+            self._write_cancel_marker(task_id)
+            token = self.cancel_tokens.get(task_id)
+            if token is not None:
+                token.cancel()
+
+        return task.to_dict()
+
+    def _cancel_marker(self, task_id: str) -> str:
+        return os.path.join(self.cancel_dir, task_id)
+
+    def _write_cancel_marker(self, task_id: str):
+        with open(self._cancel_marker(task_id), "w"):
+            pass
+        logger.info(f"Cancellation of task {task_id} requested")
+
+    def _mark_cancelled(self, task: Task):
+        """Mark a task cancelled and count the worker time it no longer needs"""
+        remaining = task.estimated_seconds or 0.0
+        if task.status == TaskStatus.PROCESSING:
+            remaining -= time.time() - task.started_at
+
+        task.status = TaskStatus.CANCELLED
+        task.completed_at = time.time()
+
+        metrics.increment("tasks.cancelled")
+        metrics.increment("tasks.cancelled_seconds_freed", max(0.0, remaining))
+        logger.info(f"Task {task.id} cancelled")
+
+    def _remove_upload(self, filepath: str, workspace: Optional[str] = None):
+        """Delete the upload, or whole workspace, of a task that will not run again"""
+        if workspace is not None:
+            remove_workspace(workspace)
+        elif os.path.exists(filepath):
+            try:
+                os.remove(filepath)
+            except Exception as e:
+                logger.error(f"Failed to remove temporary file {filepath}: {str(e)}")
 
     def _process_queue(self):
         """Worker thread function to process tasks from the queue"""
         # Initialize the appropriate service based on processor type
         if self.processor_type == "posture":
-            from services.analysis_service import PostureAnalysisService
+            if self.backend == "process":
+                analyze = self._run_in_process
+            else:
+                from services.analysis_service import PostureAnalysisService
 
-            service = PostureAnalysisService()
+                analyze = PostureAnalysisService().analyze_posture_file
             process_func = self._process_posture_task
         else:
             raise ValueError("Invalid processor type")
@@ -117,53 +583,245 @@ class TaskQueue:
                 continue
 
             task = self.tasks[task_id]
+            self.running[task_id] = task
+            token = CancellationToken(self._cancel_marker(task_id))
+            self.cancel_tokens[task_id] = token
+            progress = TaskProgress(
+                self._progress_path(task_id),
+                task.estimated_seconds,
+                on_publish=self._notify_change,
+            )
+            self.progress[task_id] = progress
 
             try:
+                # Cancelled by another server process while it was queued
+                token.check()
+
                 # Update task status
                 task.status = TaskStatus.PROCESSING
                 task.started_at = time.time()
+                task.attempts += 1
                 self._save_task_metadata(task)
 
                 logger.info(f"Processing task {task_id}")
 
                 # Process the task with the appropriate function
-                process_func(task, service)
+                process_func(task, analyze, token, progress)
+
+                if task.attempts == 1:
+                    self.cost_model.observe(
+                        task.cost_units, task.completed_at - task.started_at
+                    )
+
+            except TaskCancelled:
+                self._mark_cancelled(task)
 
             except Exception as e:
                 logger.exception(f"Error processing task {task_id}: {str(e)}")
-                task.status = TaskStatus.FAILED
                 task.error = str(e)
-                task.completed_at = time.time()
+                if task.attempts < self.max_attempts:
+                    # Keep the upload for the next attempt
+                    task.status = TaskStatus.PENDING
+                    metrics.increment("tasks.retries")
+                    logger.info(
+                        f"Retrying task {task_id} "
+                        f"(attempt {task.attempts + 1} of {self.max_attempts})"
+                    )
+                else:
+                    task.status = TaskStatus.FAILED
+                    task.completed_at = time.time()
 
             finally:
-                # Cleanup the temporary file
-                if os.path.exists(task.filepath):
+                self.running.pop(task_id, None)
+                self.cancel_tokens.pop(task_id, None)
+
+                # Cleanup the temporary file once the task is done
+                if task.status != TaskStatus.PENDING:
+                    self._remove_upload(task.filepath, task.workspace)
                     try:
-                        os.remove(task.filepath)
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to remove temporary file {task.filepath}: {str(e)}"
-                        )
+                        os.remove(self._cancel_marker(task_id))
+                    except FileNotFoundError:
+                        pass
 
                 # Save final task metadata
                 self._save_task_metadata(task)
+                self.progress.pop(task_id, None)
+                progress.remove()
+                if task.status == TaskStatus.PENDING:
+                    self._schedule(task)
                 self.queue.task_done()
 
-    def _process_posture_task(self, task, service):
+    def _process_posture_task(self, task, analyze, cancel=None, progress=None):
         """Process a posture analysis task"""
-        # Read video data from file
-        with open(task.filepath, "rb") as f:
-            video_data = f.read()
-
-        # Analyze posture
-        results = service.analyze_posture(video_data)
+        results = analyze(task.filepath, cancel, progress)
 
         task.result = results
         task.status = TaskStatus.COMPLETED
         task.completed_at = time.time()
 
+    def _start_process_pool(self):
+        # Spawn rather than fork: this process already runs threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker_process,
+        )
+
+    def _run_in_process(self, filepath, cancel=None, progress=None):
+        """Run a task in the process pool and wait for its result"""
+        # The worker process sees cancellation through the marker file and
+        # reports progress through the progress file
+        executor = self.executor
+        try:
+            return executor.submit(
+                _run_in_worker_process,
+                filepath,
+                cancel.marker_path if cancel is not None else None,
+                progress.path if progress is not None else None,
+                progress.estimated_seconds if progress is not None else None,
+            ).result()
+        except BrokenProcessPool:
+            # A worker process died (e.g. killed for memory); replace the pool
+            # once, however many tasks were waiting on it
+            with self.lock:
+                if self.executor is executor:
+                    logger.error("A task worker process died; restarting the pool")
+                    executor.shutdown(wait=False)
+                    self._start_process_pool()
+            raise
+
+    def _run_janitor(self):
+        """Janitor thread function evicting finished tasks periodically"""
+        while True:
+            time.sleep(self.janitor_interval)
+            try:
+                self.evict_tasks()
+                self.evict_results()
+                self.evict_task_files()
+            except Exception as e:
+                logger.exception(f"Task janitor failed: {str(e)}")
+
+    def evict_tasks(self) -> int:
+        """
+        Drop finished tasks from memory once their hot window has passed.
+
+        Their state stays in the task store, so status lookups keep working
+        until the results expire. Returns the number of tasks evicted.
+        """
+        now = time.time()
+
+        with self.lock:
+            finished = sorted(
+                (task.completed_at, task_id)
+                for task_id, task in self.tasks.items()
+                if task.status
+                in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+            )
+            over_limit = len(finished) - self.max_hot_tasks
+
+            evicted = set()
+            for i, (completed_at, task_id) in enumerate(finished):
+                if i >= over_limit and now - completed_at <= self.hot_seconds:
+                    break
+                del self.tasks[task_id]
+                self.saved_states.pop(task_id, None)
+                evicted.add(task_id)
+
+            if evicted:
+                self.dedup_index = {
+                    key: task_id
+                    for key, task_id in self.dedup_index.items()
+                    if task_id not in evicted
+                }
+
+        if evicted:
+            metrics.increment("tasks.evicted_from_memory", len(evicted))
+            logger.info(f"Evicted {len(evicted)} finished tasks from memory")
+        return len(evicted)
+
+    def evict_results(self) -> int:
+        """
+        Delete expired stored tasks, then the oldest ones over the bounds.
+
+        The state of tasks that are still pending or processing is never
+        deleted. Returns the number of tasks removed.
+        """
+        with self.lock:
+            live = [
+                task_id
+                for task_id, task in self.tasks.items()
+                if task.status in (TaskStatus.PENDING, TaskStatus.PROCESSING)
+            ]
+
+        expired, evicted, count, total = self.store.evict(
+            self.results_ttl, self.max_results, self.max_result_bytes, keep=live
+        )
+
+        self.result_files, self.result_bytes = count, total
+        metrics.increment("task_results.expired", expired)
+        metrics.increment("task_results.evicted", evicted)
+        if expired or evicted:
+            logger.info(f"Removed {expired} expired and {evicted} evicted task results")
+        return expired + evicted
+
+    def evict_task_files(self) -> int:
+        """
+        Remove cancellation markers and progress files older than the
+        results TTL.
+
+        Both are removed when their task stops; this catches markers
+        written as their task was finishing and files left by a process
+        that died. Returns the number removed.
+        """
+        removed = 0
+        for directory in (self.cancel_dir, self.progress_dir):
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                try:
+                    if time.time() - os.path.getmtime(path) > self.results_ttl:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
     def _save_task_metadata(self, task: Task):
-        """Save task metadata to a file"""
-        metadata_path = os.path.join(self.results_dir, f"{task.id}.json")
-        with open(metadata_path, "w") as f:
-            json.dump(task.to_dict(), f)
+        """Save task metadata to the task store and wake its watchers"""
+        with self.changed:
+            task.version += 1
+            data = task.to_dict()
+            self.saved_states[task.id] = data
+            self._change_count += 1
+            self.changed.notify_all()
+        self.store.save(data)
+
+
+# Analysis service of a task worker process (process backend)
+_worker_service = None
+
+
+def _init_worker_process():
+    """Load the models once in a task worker process"""
+    global _worker_service
+    from config import Config
+    from services.analysis_service import PostureAnalysisService
+
+    logging.basicConfig(
+        level=Config.LOG_LEVEL,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    _worker_service = PostureAnalysisService()
+
+
+def _run_in_worker_process(
+    filepath: str,
+    marker_path: Optional[str] = None,
+    progress_path: Optional[str] = None,
+    estimated_seconds: Optional[float] = None,
+):
+    """Analyze the posture in one video in a task worker process"""
+    return _worker_service.analyze_posture_file(
+        filepath,
+        CancellationToken(marker_path),
+        TaskProgress(progress_path, estimated_seconds),
+    )
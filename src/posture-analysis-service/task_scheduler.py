@@ -0,0 +1,178 @@
+import heapq
+import itertools
+import threading
+import time
+from queue import Queue
+from typing import Optional
+
+# Assumed length of a video whose duration could not be probed
+DEFAULT_VIDEO_SECONDS = 300.0
+
+# Decoding and per-frame detection scale with the pixel count above this
+REFERENCE_PIXELS = 1280 * 720
+
+
+def video_cost_units(duration: float, width: int, height: int) -> float:
+    """
+    Amount of work in a video, in seconds of 720p (or smaller) video.
+
+    Args:
+        duration (float): Video duration in seconds
+        width (int): Frame width in pixels
+        height (int): Frame height in pixels
+
+    Returns:
+        float: Cost units
+    """
+    return duration * max(1.0, width * height / REFERENCE_PIXELS)
+
+
+class CostModel:
+    """
+    Estimates processing time from cost units.
+
+    Keeps an exponentially weighted moving average of the processing
+    seconds per cost unit observed for completed tasks, so estimates
+    follow the speed of the host and the current load.
+    """
+
+    def __init__(self, initial_rate: float = 1.0, alpha: float = 0.2):
+        """
+        Args:
+            initial_rate (float): Seconds per cost unit before any task
+                has completed
+            alpha (float): Weight of each new observation
+        """
+        self.rate = initial_rate
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def estimate(self, units: Optional[float]) -> float:
+        """Estimated processing seconds for a task of ``units`` cost units"""
+        if units is None:
+            units = DEFAULT_VIDEO_SECONDS
+        return units * self.rate
+
+    def observe(self, units: Optional[float], seconds: float):
+        """Record the processing time of a completed task"""
+        if not units or units <= 0:
+            return
+        with self._lock:
+            self.rate += self.alpha * (seconds / units - self.rate)
+
+
+class CostScheduler(Queue):
+    """
+    Shortest-estimated-job-first task queue with aging and fair share.
+
+    Items are ``(task_id, estimated_seconds, client)`` tuples and ``get``
+    returns the task ID. A task's priority is its estimated cost minus
+    ``aging`` times the seconds it has waited, so a long task is overtaken
+    by short ones at first but runs once it has waited (cost difference /
+    ``aging``) seconds and cannot starve. Since every queued task ages at
+    the same rate, the order only depends on
+    ``estimated_seconds + aging * enqueued_at``, which a heap keeps.
+
+    With ``fair_share``, every client has its own heap and the next task is
+    taken from the client that has been served the fewest estimated
+    seconds, so one client uploading many videos does not hold up others.
+    A client that becomes active starts level with the active clients
+    rather than with credit for the time it was idle.
+
+    ``remove`` takes a queued task off the queue; its heap entry is
+    skipped when it surfaces.
+    """
+
+    def __init__(self, aging: float = 1.0, fair_share: bool = False, clock=None):
+        """
+        Args:
+            aging (float): Seconds of estimated cost a task gains in
+                priority per second waited; 0 is pure shortest-job-first
+            fair_share (bool): Alternate between clients
+            clock (callable): Time source, ``time.monotonic`` by default
+        """
+        self.aging = aging
+        self.fair_share = fair_share
+        self.clock = clock or time.monotonic
+        super().__init__()
+
+    def _init(self, maxsize):
+        self._heaps = {}
+        self._served = {}
+        self._count = 0
+        self._queued_seconds = 0.0
+        self._sequence = itertools.count()
+        # Sequence number and estimate of each queued task, by task ID
+        self._entries = {}
+        self._removed = set()
+
+    def _qsize(self):
+        return self._count
+
+    def queued_seconds(self) -> float:
+        """Total estimated seconds of the queued tasks"""
+        with self.mutex:
+            return max(0.0, self._queued_seconds) if self._count else 0.0
+
+    def remove(self, task_id) -> bool:
+        """
+        Take a task off the queue.
+
+        Args:
+            task_id (str): ID of a queued task
+
+        Returns:
+            bool: Whether the task was queued
+        """
+        with self.mutex:
+            entry = self._entries.pop(task_id, None)
+            if entry is None:
+                return False
+            sequence, estimated_seconds = entry
+            self._removed.add(sequence)
+            self._count -= 1
+            self._queued_seconds -= estimated_seconds
+
+            # The task will never be got, so account for it as done
+            self.unfinished_tasks -= 1
+            if not self.unfinished_tasks:
+                self.all_tasks_done.notify_all()
+            return True
+
+    def _put(self, item):
+        task_id, estimated_seconds, client = item
+        client = client if self.fair_share else None
+
+        heap = self._heaps.get(client)
+        if heap is None:
+            heap = self._heaps[client] = []
+            self._served[client] = min(self._served.values(), default=0.0)
+
+        key = estimated_seconds + self.aging * self.clock()
+        sequence = next(self._sequence)
+        heapq.heappush(heap, (key, sequence, task_id, estimated_seconds))
+        self._entries[task_id] = (sequence, estimated_seconds)
+        self._count += 1
+        self._queued_seconds += estimated_seconds
+
+    def _get(self):
+        while True:
+            client = min(self._heaps, key=self._served.get)
+            heap = self._heaps[client]
+            _, sequence, task_id, estimated_seconds = heapq.heappop(heap)
+            removed = sequence in self._removed
+            if removed:
+                self._removed.discard(sequence)
+            else:
+                self._served[client] += estimated_seconds
+
+            if not heap:
+                del self._heaps[client]
+                del self._served[client]
+            if not removed:
+                break
+
+        del self._entries[task_id]
+        self._count -= 1
+        self._queued_seconds -= estimated_seconds
+        return task_id
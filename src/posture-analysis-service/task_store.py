@@ -0,0 +1,719 @@
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.metrics import metrics
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# Tasks in these states are not reused for a duplicate upload
+DISCARDED_STATUSES = ("failed", "cancelled")
+
+
+def dedup_key(content_hash: Optional[str], options: Optional[Dict[str, Any]]):
+    """Key under which uploads of the same content and options are shared"""
+    if content_hash is None:
+        return None
+    return f"{content_hash}:{json.dumps(options or {}, sort_keys=True)}"
+
+
+class GroupCommit:
+    """
+    Batches writes from many threads into one commit.
+
+    ``submit`` hands records to a background thread and blocks until they
+    are durable. Records submitted while a commit is in progress are all
+    written by the next one, so state transitions of all task workers
+    share one ``write_batch`` call, i.e. one transaction or one append and
+    fsync, without delaying a lone write. ``max_delay`` additionally holds
+    each batch open for more records. The thread is started on first use
+    in each process, so a store created before a server forks is safe to
+    use.
+    """
+
+    def __init__(self, write_batch, max_delay: float = 0.0):
+        """
+        Args:
+            write_batch (callable): Durably writes a list of records
+            max_delay (float): Seconds a batch stays open for more records
+        """
+        self.write_batch = write_batch
+        self.max_delay = max_delay
+        self._cond = None
+        self._pending = []
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._cond = threading.Condition()
+            self._pending = []
+            threading.Thread(target=self._run, daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, records: List[Any]):
+        """Write records with the next batch and wait until it is committed"""
+        self._ensure_started()
+        entry = [records, threading.Event(), None]
+        with self._cond:
+            self._pending.append(entry)
+            self._cond.notify()
+
+        entry[1].wait()
+        if entry[2] is not None:
+            raise entry[2]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+            if self.max_delay > 0:
+                time.sleep(self.max_delay)
+
+            with self._cond:
+                batch, self._pending = self._pending, []
+
+            error = None
+            try:
+                self.write_batch([record for entry in batch for record in entry[0]])
+            except Exception as e:
+                logger.exception(f"Failed to commit {len(batch)} task updates: {e}")
+                error = e
+
+            metrics.increment("task_store.commits")
+            metrics.observe("task_store.commit_batch_size", len(batch))
+            for entry in batch:
+                entry[2] = error
+                entry[1].set()
+
+
+class JsonTaskStore:
+    """
+    One JSON metadata file per task in the results directory.
+
+    Files are replaced atomically, but a lookup costs a file open and a
+    full parse, and finding a task by its upload needs a directory scan,
+    so de-duplication across processes is not supported.
+    """
+
+    def __init__(self, results_dir: str):
+        self.results_dir = results_dir
+        os.makedirs(results_dir, exist_ok=True)
+
+    def save(self, task: Dict[str, Any]):
+        """Write a task's current state"""
+        metadata_path = os.path.join(self.results_dir, f"{task['id']}.json")
+        # Write atomically; other server processes may be reading the file
+        tmp_path = f"{metadata_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(task, f)
+        os.replace(tmp_path, metadata_path)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Load a task's last saved state, or None if unknown"""
+        metadata_path = os.path.join(self.results_dir, f"{task_id}.json")
+        try:
+            with open(metadata_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Latest reusable task for a de-duplication key; not supported"""
+        return None
+
+    def iter_unfinished(self):
+        """Yield the saved state of every pending or processing task"""
+        for name in os.listdir(self.results_dir):
+            if name.endswith(".json"):
+                task = self.get(name[: -len(".json")])
+                if task is not None and task["status"] not in FINISHED_STATUSES:
+                    yield task
+
+    def evict(
+        self, ttl: float, max_entries: int, max_bytes: int, keep: Iterable[str] = ()
+    ) -> Tuple[int, int, int, int]:
+        """
+        Delete expired task files, then the oldest ones over the bounds.
+
+        Args:
+            ttl (float): Seconds after its last update a task expires
+            max_entries (int): Maximum number of task files
+            max_bytes (int): Maximum total size of the task files
+            keep (Iterable[str]): IDs of tasks that must not be deleted
+
+        Returns:
+            tuple[int, int, int, int]: Expired and evicted task counts, and
+            number and total bytes of the remaining files
+        """
+        now = time.time()
+        keep = {f"{task_id}.json" for task_id in keep}
+
+        entries = []
+        for name in os.listdir(self.results_dir):
+            path = os.path.join(self.results_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith(".tmp"):
+                # Left behind by a process that died mid-write
+                if now - stat.st_mtime > ttl:
+                    self._remove(path)
+                continue
+            if name.endswith(".json"):
+                entries.append((stat.st_mtime, stat.st_size, name, path))
+
+        count = len(entries)
+        total = sum(size for _, size, _, _ in entries)
+        expired = evicted = 0
+
+        for mtime, size, name, path in sorted(entries):
+            is_expired = now - mtime > ttl
+            over_bounds = count > max_entries or total > max_bytes
+            if not is_expired and not over_bounds:
+                break
+            if name in keep:
+                continue
+            self._remove(path)
+            count -= 1
+            total -= size
+            if is_expired:
+                expired += 1
+            else:
+                evicted += 1
+
+        return expired, evicted, count, total
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SqliteTaskStore:
+    """
+    Task states in a WAL-mode SQLite database.
+
+    Every server process opens the same database, so a status poll finds
+    the task whichever gunicorn worker accepted it, and uploads are
+    de-duplicated across workers. Each save is one atomic row replace;
+    readers never see a partially written task. Rows are indexed by ID,
+    status, creation time and de-duplication key. Saves from concurrent
+    workers are group-committed, one transaction per batch.
+    """
+
+    def __init__(self, db_path: str, commit_delay: float = 0.0):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._commits = GroupCommit(self._write_rows, commit_delay)
+
+        conn = self._connection()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                dedup_key TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+            CREATE INDEX IF NOT EXISTS tasks_created_at ON tasks (created_at);
+            CREATE INDEX IF NOT EXISTS tasks_dedup_key ON tasks (dedup_key);
+            """
+        )
+        conn.commit()
+
+    def _connection(self):
+        """
+        Connection for the current process.
+
+        SQLite connections must not be used across ``fork``, so a store
+        opened before a server forks reconnects in each worker process.
+        """
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.db_path, timeout=30, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def save(self, task: Dict[str, Any]):
+        """Write a task's current state"""
+        row = (
+            task["id"],
+            task["status"],
+            task["created_at"],
+            time.time(),
+            dedup_key(task.get("content_hash"), task.get("options")),
+            json.dumps(task),
+        )
+        self._commits.submit([row])
+
+    def _write_rows(self, rows):
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Load a task's last saved state, or None if unknown"""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT data FROM tasks WHERE id = ?", (task_id,))
+                .fetchone()
+            )
+        return json.loads(row[0]) if row else None
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Latest reusable task for a de-duplication key, or None"""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT data FROM tasks WHERE dedup_key = ? "
+                    "AND status NOT IN (?, ?) ORDER BY created_at DESC LIMIT 1",
+                    (key, *DISCARDED_STATUSES),
+                )
+                .fetchone()
+            )
+        return json.loads(row[0]) if row else None
+
+    def iter_unfinished(self):
+        """Yield the saved state of every pending or processing task"""
+        finished = ", ".join(f"'{status}'" for status in FINISHED_STATUSES)
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(f"SELECT data FROM tasks WHERE status NOT IN ({finished})")
+                .fetchall()
+            )
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def evict(
+        self, ttl: float, max_entries: int, max_bytes: int, keep: Iterable[str] = ()
+    ) -> Tuple[int, int, int, int]:
+        """
+        Delete expired finished tasks, then the oldest ones over the bounds.
+
+        Pending and processing tasks are never deleted, whichever process
+        owns them, so ``keep`` is not needed.
+
+        Returns:
+            tuple[int, int, int, int]: Expired and evicted task counts, and
+            number and total bytes of the remaining tasks
+        """
+        finished = ", ".join(f"'{status}'" for status in FINISHED_STATUSES)
+
+        with self._lock:
+            conn = self._connection()
+            expired = conn.execute(
+                f"DELETE FROM tasks WHERE updated_at < ? AND status IN ({finished})",
+                (time.time() - ttl,),
+            ).rowcount
+
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM tasks"
+            ).fetchone()
+
+            evict_ids = []
+            if count > max_entries or total > max_bytes:
+                rows = conn.execute(
+                    f"SELECT id, LENGTH(data) FROM tasks WHERE status IN ({finished}) "
+                    "ORDER BY updated_at"
+                )
+                for task_id, size in rows:
+                    if count <= max_entries and total <= max_bytes:
+                        break
+                    evict_ids.append((task_id,))
+                    count -= 1
+                    total -= size
+                conn.executemany("DELETE FROM tasks WHERE id = ?", evict_ids)
+
+            conn.commit()
+
+        return expired, len(evict_ids), count, total
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn, self._pid = None, None
+
+
+class _JournalEntry(NamedTuple):
+    """Where the latest state of a task is, and what is needed to find it"""
+
+    updated_at: float
+    # Length of the record's line, and the file and offset it starts at
+    size: int
+    in_snapshot: bool
+    offset: int
+    status: str
+    created_at: float
+    dedup_key: Optional[str]
+
+
+class JournalTaskStore:
+    """
+    Append-only journal of task states with periodic compaction.
+
+    Every save appends one JSON line to ``tasks.journal``; saves from all
+    workers are group-committed, one append per batch, instead of
+    rewriting a whole file per transition. Compaction copies the live
+    records into ``tasks.snapshot``, written to a temporary file and
+    renamed into place, and starts a new journal.
+
+    Only an index is kept in memory: each task's status, creation time,
+    de-duplication key and the position of its latest record. The record
+    itself, with the result, is read from the file when asked for, so
+    finished tasks evicted from the task queue do not stay resident here.
+    The files the index points into are held open, so a compaction by
+    another process never moves a record from under a reader.
+
+    Readers replay only the bytes appended since their last read and only
+    complete lines, so they never see a torn write. Several server
+    processes can share the directory; appends and compaction are
+    serialized with a lock file, which readers only take to switch to the
+    files of a new compaction.
+
+    Appends reach the operating system before ``save`` returns, so they
+    survive a crash of the server. With ``fsync`` each batch is also
+    flushed to disk, which survives a power loss but costs one disk flush
+    per commit; this is the durability SQLite's ``synchronous=NORMAL``
+    gives up as well.
+    """
+
+    SNAPSHOT = "tasks.snapshot"
+    JOURNAL = "tasks.journal"
+    LOCK = "tasks.lock"
+
+    def __init__(
+        self,
+        results_dir: str,
+        commit_delay: float = 0.0,
+        compact_ratio: int = 4,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            results_dir (str): Directory of the journal and snapshot
+            commit_delay (float): Seconds a commit batch stays open
+            compact_ratio (int): Compact once the journal holds this many
+                records per live task
+            fsync (bool): Flush every commit to disk
+        """
+        self.results_dir = results_dir
+        self.snapshot_path = os.path.join(results_dir, self.SNAPSHOT)
+        self.journal_path = os.path.join(results_dir, self.JOURNAL)
+        self.lock_path = os.path.join(results_dir, self.LOCK)
+        self.compact_ratio = compact_ratio
+        self.fsync = fsync
+        os.makedirs(results_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, _JournalEntry] = {}
+        self._journal_file = None
+        self._snapshot_file = None
+        self._journal_ino = None
+        self._offset = 0
+        self._journal_records = 0
+        self._commits = GroupCommit(self._append, commit_delay)
+
+    @contextmanager
+    def _file_lock(self, operation):
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def save(self, task: Dict[str, Any]):
+        """Append a task's current state to the journal"""
+        record = {"updated_at": time.time(), "task": task}
+        self._commits.submit([json.dumps(record)])
+        self._catch_up()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Latest journaled state of a task, or None if unknown"""
+        self._catch_up()
+        with self._lock:
+            entry = self._index.get(task_id)
+            return self._read(entry) if entry else None
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        """Latest reusable task for a de-duplication key, or None"""
+        self._catch_up()
+        with self._lock:
+            matches = [
+                entry
+                for entry in self._index.values()
+                if entry.dedup_key == key and entry.status not in DISCARDED_STATUSES
+            ]
+            if not matches:
+                return None
+            return self._read(max(matches, key=lambda entry: entry.created_at))
+
+    def iter_unfinished(self):
+        """Yield the saved state of every pending or processing task"""
+        self._catch_up()
+        with self._lock:
+            tasks = [
+                self._read(entry)
+                for entry in self._index.values()
+                if entry.status not in FINISHED_STATUSES
+            ]
+        yield from tasks
+
+    def evict(
+        self, ttl: float, max_entries: int, max_bytes: int, keep: Iterable[str] = ()
+    ) -> Tuple[int, int, int, int]:
+        """
+        Journal deletions of expired finished tasks, then of the oldest ones
+        over the bounds, and compact the journal once it has grown.
+
+        Returns:
+            tuple[int, int, int, int]: Expired and evicted task counts, and
+            number and approximate bytes of the remaining tasks
+        """
+        self._catch_up()
+        now = time.time()
+
+        with self._lock:
+            count = len(self._index)
+            total = sum(entry.size for entry in self._index.values())
+            finished = sorted(
+                (entry.updated_at, entry.size, task_id)
+                for task_id, entry in self._index.items()
+                if entry.status in FINISHED_STATUSES
+            )
+
+        deleted, expired = [], 0
+        for updated_at, size, task_id in finished:
+            is_expired = now - updated_at > ttl
+            if not is_expired and count <= max_entries and total <= max_bytes:
+                break
+            deleted.append(task_id)
+            expired += is_expired
+            count -= 1
+            total -= size
+
+        if deleted:
+            records = [{"updated_at": now, "deleted": task_id} for task_id in deleted]
+            self._commits.submit([json.dumps(record) for record in records])
+            self._catch_up()
+
+        if self._journal_records > self.compact_ratio * max(count, 1):
+            self.compact()
+
+        return expired, len(deleted) - expired, count, total
+
+    def compact(self):
+        """Copy the live records into a new snapshot and start an empty journal"""
+        with self._file_lock(fcntl.LOCK_EX):
+            self._catch_up(locked=True)
+            tmp_path = f"{self.snapshot_path}.{uuid.uuid4().hex}.tmp"
+            with self._lock, open(tmp_path, "wb") as f:
+                f.write(json.dumps({"compacted_at": time.time()}).encode() + b"\n")
+                for entry in self._index.values():
+                    f.write(self._read_line(entry) + b"\n")
+                tasks = len(self._index)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self._write_atomic(self.journal_path, "")
+            self._switch_files()
+
+        metrics.increment("task_store.compactions")
+        logger.info(f"Compacted task journal to {tasks} tasks")
+
+    def close(self):
+        with self._lock:
+            for f in (self._journal_file, self._snapshot_file):
+                if f is not None:
+                    f.close()
+            self._journal_file = self._snapshot_file = None
+            self._journal_ino = None
+            self._index = {}
+
+    def _read_line(self, entry: _JournalEntry) -> bytes:
+        f = self._snapshot_file if entry.in_snapshot else self._journal_file
+        return os.pread(f.fileno(), entry.size, entry.offset)
+
+    def _read(self, entry: _JournalEntry) -> Dict[str, Any]:
+        return json.loads(self._read_line(entry))["task"]
+
+    def _apply(self, line: bytes, in_snapshot: bool, offset: int):
+        """Index one record unless a newer state of its task is already known"""
+        try:
+            record = json.loads(line)
+        except ValueError:
+            logger.warning(f"Skipping unreadable task journal record at {offset}")
+            return
+        task = record.get("task")
+        task_id = task["id"] if task is not None else record["deleted"]
+        current = self._index.get(task_id)
+        if current is not None and current.updated_at > record["updated_at"]:
+            return
+        if task is None:
+            self._index.pop(task_id, None)
+            return
+        self._index[task_id] = _JournalEntry(
+            updated_at=record["updated_at"],
+            size=len(line),
+            in_snapshot=in_snapshot,
+            offset=offset,
+            status=task["status"],
+            created_at=task["created_at"],
+            dedup_key=dedup_key(task.get("content_hash"), task.get("options")),
+        )
+
+    def _append(self, lines: List[str]):
+        data = "".join(f"{line}\n" for line in lines).encode()
+        with self._file_lock(fcntl.LOCK_EX):
+            f = open(self.journal_path, "a+b")
+            try:
+                # Never continue a partial line left by a crashed process
+                end = os.fstat(f.fileno()).st_size
+                if end and os.pread(f.fileno(), 1, end - 1) != b"\n":
+                    data = b"\n" + data
+                f.write(data)
+                f.flush()
+            except BaseException:
+                f.close()
+                raise
+        # Flush outside the lock, so appends of other processes and readers
+        # switching files are not held up by the disk
+        with f:
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _catch_up(self, locked: bool = False):
+        """Index journal records appended (by any process) since last read"""
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return
+
+        with self._lock:
+            if stat.st_ino == self._journal_ino:
+                if stat.st_size > self._offset:
+                    self._replay_journal()
+                return
+
+        # A new journal after a compaction: switch to it and its snapshot
+        # while no other compaction can replace them
+        if locked:
+            self._switch_files()
+        else:
+            with self._file_lock(fcntl.LOCK_SH):
+                self._switch_files()
+
+    def _switch_files(self):
+        """Index the current snapshot and journal; the file lock must be held"""
+        journal_file = open(self.journal_path, "rb")
+        try:
+            snapshot_file = open(self.snapshot_path, "rb")
+        except FileNotFoundError:
+            snapshot_file = None
+
+        with self._lock:
+            for f in (self._journal_file, self._snapshot_file):
+                if f is not None:
+                    f.close()
+            self._journal_file, self._snapshot_file = journal_file, snapshot_file
+            self._journal_ino = os.fstat(journal_file.fileno()).st_ino
+            self._offset = 0
+            self._journal_records = 0
+            self._index = {}
+
+            if snapshot_file is not None:
+                # The first line holds the compaction time
+                offset = len(snapshot_file.readline())
+                for line in snapshot_file:
+                    self._apply(line.rstrip(b"\n"), True, offset)
+                    offset += len(line)
+            self._replay_journal()
+
+    def _replay_journal(self):
+        """Index complete lines past the offset; ``_lock`` must be held"""
+        self._journal_file.seek(self._offset)
+        for line in self._journal_file:
+            if not line.endswith(b"\n"):
+                # A partial line is read once it is complete
+                break
+            if line != b"\n":
+                self._apply(line[:-1], False, self._offset)
+                self._journal_records += 1
+            self._offset += len(line)
+
+    @staticmethod
+    def _write_atomic(path: str, data: str):
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def create_task_store(
+    backend: str,
+    results_dir: str,
+    db_path: Optional[str] = None,
+    commit_delay: float = 0.0,
+    fsync: bool = False,
+):
+    """
+    Create the configured task store.
+
+    Args:
+        backend (str): "sqlite", "journal" or "json"
+        results_dir (str): Directory of the journal or JSON task files
+        db_path (str): SQLite database path; defaults to ``tasks.sqlite3``
+            in ``results_dir``
+        commit_delay (float): Seconds a group commit batch stays open
+        fsync (bool): Flush every journal commit to disk
+
+    Returns:
+        SqliteTaskStore | JournalTaskStore | JsonTaskStore: The task store
+    """
+    if backend == "sqlite":
+        return SqliteTaskStore(
+            db_path or os.path.join(results_dir, "tasks.sqlite3"), commit_delay
+        )
+    if backend == "journal":
+        return JournalTaskStore(results_dir, commit_delay, fsync=fsync)
+    if backend == "json":
+        return JsonTaskStore(results_dir)
+    raise ValueError(f"Invalid task store backend: {backend}")
@@ -0,0 +1,81 @@
+import logging
+import math
+import os
+import shutil
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Shortest Retry-After sent with a rejection, in seconds
+MIN_RETRY_AFTER = 5
+
+
+class AdmissionRejected(Exception):
+    """
+    An upload was turned away before its body was read.
+
+    Attributes:
+        status_code (int): HTTP status to respond with
+        retry_after (int): Seconds the client should wait before retrying
+    """
+
+    def __init__(self, message, status_code, retry_after):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def check_admission(task_queue, content_length, spool_dir, max_wait, min_free_bytes):
+    """
+    Decide whether to accept an upload, before reading its body.
+
+    An upload is rejected with 429 while tasks enqueued now would wait more
+    than ``max_wait`` seconds to start, with a Retry-After of the time the
+    workers need to bring the wait back under it. It is rejected with 503
+    if saving ``content_length`` bytes would leave less than
+    ``min_free_bytes`` free in ``spool_dir``; space is freed as queued
+    uploads are processed, so Retry-After is the estimated wait.
+
+    Args:
+        task_queue (TaskQueue): Queue the upload would be enqueued on
+        content_length (int): Request body size, or the maximum allowed
+            size if the client did not send it
+        spool_dir (str): Directory uploads are saved in
+        max_wait (float): Longest accepted estimated wait in seconds;
+            0 disables the check
+        min_free_bytes (int): Space to keep free in ``spool_dir``
+
+    Raises:
+        AdmissionRejected: If the upload should not be accepted
+    """
+    wait = task_queue.estimated_wait()
+
+    if max_wait and wait > max_wait:
+        metrics.increment("admission.rejected_backlog")
+        retry_after = max(MIN_RETRY_AFTER, math.ceil(wait - max_wait))
+        logger.warning(
+            f"Rejecting upload: estimated wait {wait:.0f}s exceeds {max_wait}s"
+        )
+        raise AdmissionRejected(
+            "Too many videos are queued for analysis; please retry later",
+            429,
+            retry_after,
+        )
+
+    os.makedirs(spool_dir, exist_ok=True)
+    free = shutil.disk_usage(spool_dir).free
+    if free - (content_length or 0) < min_free_bytes:
+        metrics.increment("admission.rejected_disk")
+        retry_after = max(MIN_RETRY_AFTER, math.ceil(wait))
+        logger.warning(
+            f"Rejecting upload of {content_length} bytes: "
+            f"only {free} bytes free in {spool_dir}"
+        )
+        raise AdmissionRejected(
+            "Not enough space to store the video; please retry later",
+            503,
+            retry_after,
+        )
+
+    metrics.increment("admission.accepted")
@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+
+# Seconds between checks of the cancellation marker file
+MARKER_CHECK_INTERVAL = 0.5
+
+
+class TaskCancelled(Exception):
+    """Raised at a cancellation checkpoint of a cancelled task"""
+
+
+class CancellationToken:
+    """
+    Cancellation signal checked by a running task at its checkpoints.
+
+    A token is cancelled in-process with ``cancel``, or from any process by
+    creating its marker file, which is how tasks running in worker
+    processes, or owned by another server process, are reached. The marker
+    is looked up at most every ``MARKER_CHECK_INTERVAL`` seconds, so
+    checkpoints are cheap enough for per-frame loops.
+    """
+
+    def __init__(self, marker_path=None):
+        """
+        Args:
+            marker_path (str): File whose existence cancels the task
+        """
+        self.marker_path = marker_path
+        self._event = threading.Event()
+        self._next_marker_check = 0.0
+
+    def cancel(self):
+        """Cancel the task"""
+        self._event.set()
+
+    def cancelled(self):
+        """
+        Whether the task has been cancelled.
+
+        Returns:
+            bool: True once ``cancel`` was called or the marker file exists
+        """
+        if self._event.is_set():
+            return True
+
+        if self.marker_path is not None:
+            now = time.monotonic()
+            if now >= self._next_marker_check:
+                self._next_marker_check = now + MARKER_CHECK_INTERVAL
+                if os.path.exists(self.marker_path):
+                    self._event.set()
+                    return True
+
+        return False
+
+    def check(self):
+        """
+        Cancellation checkpoint.
+
+        Raises:
+            TaskCancelled: If the task has been cancelled
+        """
+        if self.cancelled():
+            raise TaskCancelled("Task was cancelled")
+
+
+def checkpoint(cancel):
+    """Raise ``TaskCancelled`` if the optional token ``cancel`` is cancelled"""
+    if cancel is not None:
+        cancel.check()
@@ -0,0 +1,177 @@
+import json
+import os
+import time
+import uuid
+
+# Seconds between writes of the progress file while frames are processed
+PUBLISH_INTERVAL = 1.0
+
+
+class TaskProgress:
+    """
+    Progress of a running task: its stage and frames processed.
+
+    The analysis reports with plain attribute updates, cheap enough for
+    per-frame loops. A snapshot is written to ``path`` on every stage
+    change and at most every ``PUBLISH_INTERVAL`` seconds in between, for
+    status requests served by other processes; the task's metadata is
+    never rewritten for progress. Each write increments ``sequence`` and
+    calls ``on_publish``, so watchers of the task see at most one progress
+    change per interval.
+
+    The remaining time is extrapolated from the throughput so far: the
+    fraction done counts completed stages plus the frame fraction of the
+    current stage, with stages reused from an earlier attempt left out.
+    Until anything has completed, the scheduler's estimate is used.
+    """
+
+    def __init__(self, path=None, estimated_seconds=None, on_publish=None):
+        """
+        Args:
+            path (str): File to publish snapshots to
+            estimated_seconds (float): Estimated processing time of the task
+            on_publish (callable): Called after every publish
+        """
+        self.path = path
+        self.estimated_seconds = estimated_seconds
+        self.on_publish = on_publish
+        self.sequence = 0
+        # Snapshot of the last publish
+        self.published = None
+        self.started_at = time.time()
+        self.stages = ()
+        self.stage = None
+        self.completed = set()
+        self.skipped = set()
+        self.frames_processed = 0
+        self.frames_total = None
+        self._next_publish = 0.0
+
+    def plan(self, stages):
+        """Set the stages the task runs through"""
+        self.stages = tuple(stages)
+
+    def skip(self, stage):
+        """Mark a stage as already completed by an earlier attempt"""
+        self.skipped.add(stage)
+        self.completed.add(stage)
+
+    def start_stage(self, stage, frames_total=None):
+        """Enter ``stage``, which processes ``frames_total`` frames if known"""
+        self.stage = stage
+        self.frames_processed = 0
+        self.frames_total = frames_total
+        self.publish()
+
+    def finish_stage(self, stage):
+        """Mark ``stage`` as completed"""
+        self.completed.add(stage)
+        if self.stage == stage:
+            self.stage = None
+            self.frames_processed = 0
+            self.frames_total = None
+        self.publish()
+
+    def set_frames_total(self, frames_total):
+        """Set the number of frames the current stage processes"""
+        self.frames_total = frames_total
+
+    def advance(self, frames=1):
+        """Count processed frames of the current stage"""
+        self.frames_processed += frames
+        if self.path is not None and time.monotonic() >= self._next_publish:
+            self.publish()
+
+    def fraction(self):
+        """Fraction of this attempt's work done, between 0 and 1"""
+        stages = [stage for stage in self.stages if stage not in self.skipped]
+        if not stages:
+            return 0.0
+
+        done = len(self.completed - self.skipped)
+        if self.stage is not None and self.stage not in self.completed:
+            if self.frames_total:
+                done += min(1.0, self.frames_processed / self.frames_total)
+        return min(1.0, done / len(stages))
+
+    def snapshot(self):
+        """
+        Current progress.
+
+        Returns:
+            dict: Stage, stage and frame counts, percent done and estimated
+            seconds remaining (None if unknown)
+        """
+        fraction = self.fraction()
+        elapsed = time.time() - self.started_at
+
+        if fraction > 0:
+            eta = elapsed * (1 - fraction) / fraction
+        elif self.estimated_seconds is not None:
+            eta = max(0.0, self.estimated_seconds - elapsed)
+        else:
+            eta = None
+
+        return {
+            "stage": self.stage,
+            "stages_completed": len(self.completed),
+            "stages_total": len(self.stages),
+            "frames_processed": self.frames_processed,
+            "frames_total": self.frames_total,
+            "percent": round(100 * fraction, 1),
+            "eta_seconds": None if eta is None else round(eta, 1),
+            "sequence": self.sequence,
+            "updated_at": time.time(),
+        }
+
+    def publish(self):
+        """Write the current snapshot to the progress file"""
+        if self.path is None:
+            return
+        self._next_publish = time.monotonic() + PUBLISH_INTERVAL
+        self.sequence += 1
+        self.published = self.snapshot()
+
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.published, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # Progress is informational; never fail the task over it
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        if self.on_publish is not None:
+            self.on_publish()
+
+    def remove(self):
+        """Delete the progress file once the task has stopped"""
+        if self.path is not None and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def read_progress(path):
+    """
+    Read a progress snapshot published by another process.
+
+    Args:
+        path (str): Progress file
+
+    Returns:
+        dict | None: The snapshot, with its estimated seconds remaining
+        reduced by its age, or None if there is none
+    """
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("eta_seconds") is not None:
+        age = max(0.0, time.time() - snapshot["updated_at"])
+        snapshot["eta_seconds"] = round(max(0.0, snapshot["eta_seconds"] - age), 1)
+    return snapshot
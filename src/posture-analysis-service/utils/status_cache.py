@@ -0,0 +1,129 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from utils.metrics import metrics
+
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
+
+class StatusBody:
+    """
+    Task status response body, serialized once.
+
+    The ETag is the status revision followed by a digest of the body, so it
+    changes whenever the body does, including estimates that move without
+    a new revision. The gzipped body is built on the first request that
+    accepts it and kept with the body.
+    """
+
+    def __init__(self, payload, revision):
+        """
+        Args:
+            payload (dict): Response body
+            revision (str): Revision of the task status the body shows
+        """
+        self.data = json.dumps(payload).encode("utf-8")
+        digest = hashlib.blake2b(self.data, digest_size=8).hexdigest()
+        self.etag = f"{revision}-{digest}"
+        self._gzipped = None
+
+    def gzipped(self):
+        """
+        The body compressed with gzip.
+
+        Returns:
+            bytes: Compressed body
+        """
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.data, compresslevel=6)
+        return self._gzipped
+
+    def size(self):
+        """Bytes held by the body and its compressed form"""
+        return len(self.data) + len(self._gzipped or b"")
+
+
+class StatusBodyCache:
+    """
+    In-memory LRU cache of the status bodies of finished tasks.
+
+    A finished task's status never changes again, so its body is built
+    and compressed once and served until it expires or is pushed out by
+    newer ones; the result is not read, copied or serialized again per
+    request. Entries expire after ``ttl`` seconds, so results deleted from
+    the task store stop being served soon after.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        """
+        Args:
+            max_bytes (int): Maximum total size of the cached bodies
+            ttl (float): Seconds a body is served from the cache
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        metrics.register_gauge(
+            "status_cache.hit_rate",
+            lambda: metrics.ratio("status_cache.hits", "status_cache.misses"),
+        )
+
+    def get(self, task_id):
+        """
+        Look up the body of a finished task.
+
+        Args:
+            task_id (str): ID of the task
+
+        Returns:
+            StatusBody | None: Cached body, or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(task_id)
+            if entry is not None and time.monotonic() > entry[0]:
+                self._remove(task_id)
+                entry = None
+            if entry is not None:
+                self.entries.move_to_end(task_id)
+
+        if entry is None:
+            metrics.increment("status_cache.misses")
+            return None
+        metrics.increment("status_cache.hits")
+        return entry[1]
+
+    def put(self, task_id, body):
+        """
+        Cache the body of a finished task.
+
+        Args:
+            task_id (str): ID of the task
+            body (StatusBody): Its status body
+        """
+        # Compress now, once, so the size of the entry is known
+        if len(body.data) >= GZIP_MIN_BYTES:
+            body.gzipped()
+        size = body.size()
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if task_id in self.entries:
+                self._remove(task_id)
+            self.entries[task_id] = (time.monotonic() + self.ttl, body, size)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, task_id):
+        _, _, size = self.entries.pop(task_id)
+        self.total_bytes -= size
@@ -0,0 +1,95 @@
+import json
+import time
+
+from task_store import FINISHED_STATUSES
+
+# Seconds between comment lines keeping an idle event stream open
+KEEPALIVE_INTERVAL = 15.0
+
+# Milliseconds an EventSource waits before reconnecting to a closed stream,
+# and to one closed at once because the server had no thread to spare
+RECONNECT_MILLISECONDS = 1000
+BUSY_RECONNECT_MILLISECONDS = 5000
+
+
+def format_event(data, event="status", event_id=None):
+    """
+    Format one Server-Sent Event.
+
+    Args:
+        data (dict): Event payload, sent as JSON
+        event (str): Event type
+        event_id (str): Event ID, sent back as ``Last-Event-ID`` when the
+            client reconnects
+
+    Returns:
+        str: The event, terminated by a blank line
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_task_status(
+    task_queue, task_id, revision, render, not_found, max_seconds, on_close=None
+):
+    """
+    Yield Server-Sent Events with the status of a task as it changes.
+
+    An event is sent for the current status unless it is ``revision``, the
+    last one the client saw, then one for every state or progress change.
+    The stream ends with the event of the finished task, or after
+    ``max_seconds``, when the client reconnects with ``Last-Event-ID``;
+    with ``max_seconds`` 0 it only sends the current status.
+    Between changes the waiting thread sleeps in
+    ``TaskQueue.wait_for_change``.
+
+    Args:
+        task_queue (TaskQueue): Queue of the task
+        task_id (str): ID of the task
+        revision (str): Revision the client already has, or None
+        render (callable): Builds the event payload from ``task_id`` and a
+            task status
+        not_found (dict): Payload of the error event for an unknown task
+        max_seconds (float): Lifetime of the stream
+        on_close (callable): Called when the stream ends or the client
+            disconnects
+
+    Yields:
+        str: Events and keepalive comments
+    """
+    deadline = time.monotonic() + max_seconds
+
+    try:
+        if max_seconds > 0:
+            yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+        else:
+            yield f"retry: {BUSY_RECONNECT_MILLISECONDS}\n\n"
+
+        while True:
+            timeout = max(0.0, min(KEEPALIVE_INTERVAL, deadline - time.monotonic()))
+            task_info = task_queue.wait_for_change(task_id, revision, timeout)
+
+            if task_info is None:
+                yield format_event(not_found, event="error")
+                return
+
+            # A finished task is always sent, so a client that reconnects
+            # after the last event learns that it can stop
+            finished = task_info["status"] in FINISHED_STATUSES
+            if task_info["revision"] != revision or finished:
+                revision = task_info["revision"]
+                yield format_event(render(task_id, task_info), event_id=revision)
+                if finished:
+                    return
+            else:
+                yield ": keepalive\n\n"
+
+            if time.monotonic() >= deadline:
+                return
+
+    finally:
+        if on_close is not None:
+            on_close()